@@ -0,0 +1,2109 @@
+#define _CFFI_
+
+/* We try to define Py_LIMITED_API before including Python.h.
+
+   Mess: we can only define it if Py_DEBUG, Py_TRACE_REFS and
+   Py_REF_DEBUG are not defined.  This is a best-effort approximation:
+   we can learn about Py_DEBUG from pyconfig.h, but it is unclear if
+   the same works for the other two macros.  Py_DEBUG implies them,
+   but not the other way around.
+
+   The implementation is messy (issue #350): on Windows, with _MSC_VER,
+   we have to define Py_LIMITED_API even before including pyconfig.h.
+   In that case, we guess what pyconfig.h will do to the macros above,
+   and check our guess after the #include.
+
+   Note that on Windows, with CPython 3.x, you need >= 3.5 and virtualenv
+   version >= 16.0.0.  With older versions of either, you don't get a
+   copy of PYTHON3.DLL in the virtualenv.  We can't check the version of
+   CPython *before* we even include pyconfig.h.  ffi.set_source() puts
+   a ``#define _CFFI_NO_LIMITED_API'' at the start of this file if it is
+   running on Windows < 3.5, as an attempt at fixing it, but that's
+   arguably wrong because it may not be the target version of Python.
+   Still better than nothing I guess.  As another workaround, you can
+   remove the definition of Py_LIMITED_API here.
+
+   See also 'py_limited_api' in cffi/setuptools_ext.py.
+*/
+#if !defined(_CFFI_USE_EMBEDDING) && !defined(Py_LIMITED_API)
+#  ifdef _MSC_VER
+#    if !defined(_DEBUG) && !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+
+#    include <pyconfig.h>
+     /* sanity-check: Py_LIMITED_API will cause crashes if any of these
+        are also defined.  Normally, the Python file PC/pyconfig.h does not
+        cause any of these to be defined, with the exception that _DEBUG
+        causes Py_DEBUG.  Double-check that. */
+#    ifdef Py_LIMITED_API
+#      if defined(Py_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_TRACE_REFS)
+#        error "pyconfig.h unexpectedly defines Py_TRACE_REFS, but Py_LIMITED_API is set"
+#      endif
+#      if defined(Py_REF_DEBUG)
+#        error "pyconfig.h unexpectedly defines Py_REF_DEBUG, but Py_LIMITED_API is set"
+#      endif
+#    endif
+#  else
+#    include <pyconfig.h>
+#    if !defined(Py_DEBUG) && !defined(Py_TRACE_REFS) && !defined(Py_REF_DEBUG) && !defined(_CFFI_NO_LIMITED_API)
+#      if !defined(Py_GIL_DISABLED)
+#        define Py_LIMITED_API
+#      else
+#        define Py_LIMITED_API 0x030f0000
+#      endif
+#    endif
+#  endif
+#endif
+
+#include <Python.h>
+#ifdef __cplusplus
+extern "C" {
+#endif
+#include <stddef.h>
+#include <stdlib.h>
+#include <string.h>
+
+
+/* This part is from file 'cffi/parse_c_type.h'.  It is copied at the
+   beginning of C sources generated by CFFI's ffi.set_source(). */
+
+typedef void *_cffi_opcode_t;
+
+#define _CFFI_OP(opcode, arg)   (_cffi_opcode_t)(opcode | (((uintptr_t)(arg)) << 8))
+#define _CFFI_GETOP(cffi_opcode)    ((unsigned char)(uintptr_t)cffi_opcode)
+#define _CFFI_GETARG(cffi_opcode)   (((intptr_t)cffi_opcode) >> 8)
+
+#define _CFFI_OP_PRIMITIVE       1
+#define _CFFI_OP_POINTER         3
+#define _CFFI_OP_ARRAY           5
+#define _CFFI_OP_OPEN_ARRAY      7
+#define _CFFI_OP_STRUCT_UNION    9
+#define _CFFI_OP_ENUM           11
+#define _CFFI_OP_FUNCTION       13
+#define _CFFI_OP_FUNCTION_END   15
+#define _CFFI_OP_NOOP           17
+#define _CFFI_OP_BITFIELD       19
+#define _CFFI_OP_TYPENAME       21
+#define _CFFI_OP_CPYTHON_BLTN_V 23   // varargs
+#define _CFFI_OP_CPYTHON_BLTN_N 25   // noargs
+#define _CFFI_OP_CPYTHON_BLTN_O 27   // O  (i.e. a single arg)
+#define _CFFI_OP_CONSTANT       29
+#define _CFFI_OP_CONSTANT_INT   31
+#define _CFFI_OP_GLOBAL_VAR     33
+#define _CFFI_OP_DLOPEN_FUNC    35
+#define _CFFI_OP_DLOPEN_CONST   37
+#define _CFFI_OP_GLOBAL_VAR_F   39
+#define _CFFI_OP_EXTERN_PYTHON  41
+
+#define _CFFI_PRIM_VOID          0
+#define _CFFI_PRIM_BOOL          1
+#define _CFFI_PRIM_CHAR          2
+#define _CFFI_PRIM_SCHAR         3
+#define _CFFI_PRIM_UCHAR         4
+#define _CFFI_PRIM_SHORT         5
+#define _CFFI_PRIM_USHORT        6
+#define _CFFI_PRIM_INT           7
+#define _CFFI_PRIM_UINT          8
+#define _CFFI_PRIM_LONG          9
+#define _CFFI_PRIM_ULONG        10
+#define _CFFI_PRIM_LONGLONG     11
+#define _CFFI_PRIM_ULONGLONG    12
+#define _CFFI_PRIM_FLOAT        13
+#define _CFFI_PRIM_DOUBLE       14
+#define _CFFI_PRIM_LONGDOUBLE   15
+
+#define _CFFI_PRIM_WCHAR        16
+#define _CFFI_PRIM_INT8         17
+#define _CFFI_PRIM_UINT8        18
+#define _CFFI_PRIM_INT16        19
+#define _CFFI_PRIM_UINT16       20
+#define _CFFI_PRIM_INT32        21
+#define _CFFI_PRIM_UINT32       22
+#define _CFFI_PRIM_INT64        23
+#define _CFFI_PRIM_UINT64       24
+#define _CFFI_PRIM_INTPTR       25
+#define _CFFI_PRIM_UINTPTR      26
+#define _CFFI_PRIM_PTRDIFF      27
+#define _CFFI_PRIM_SIZE         28
+#define _CFFI_PRIM_SSIZE        29
+#define _CFFI_PRIM_INT_LEAST8   30
+#define _CFFI_PRIM_UINT_LEAST8  31
+#define _CFFI_PRIM_INT_LEAST16  32
+#define _CFFI_PRIM_UINT_LEAST16 33
+#define _CFFI_PRIM_INT_LEAST32  34
+#define _CFFI_PRIM_UINT_LEAST32 35
+#define _CFFI_PRIM_INT_LEAST64  36
+#define _CFFI_PRIM_UINT_LEAST64 37
+#define _CFFI_PRIM_INT_FAST8    38
+#define _CFFI_PRIM_UINT_FAST8   39
+#define _CFFI_PRIM_INT_FAST16   40
+#define _CFFI_PRIM_UINT_FAST16  41
+#define _CFFI_PRIM_INT_FAST32   42
+#define _CFFI_PRIM_UINT_FAST32  43
+#define _CFFI_PRIM_INT_FAST64   44
+#define _CFFI_PRIM_UINT_FAST64  45
+#define _CFFI_PRIM_INTMAX       46
+#define _CFFI_PRIM_UINTMAX      47
+#define _CFFI_PRIM_FLOATCOMPLEX 48
+#define _CFFI_PRIM_DOUBLECOMPLEX 49
+#define _CFFI_PRIM_CHAR16       50
+#define _CFFI_PRIM_CHAR32       51
+
+#define _CFFI__NUM_PRIM         52
+#define _CFFI__UNKNOWN_PRIM           (-1)
+#define _CFFI__UNKNOWN_FLOAT_PRIM     (-2)
+#define _CFFI__UNKNOWN_LONG_DOUBLE    (-3)
+
+#define _CFFI__IO_FILE_STRUCT         (-1)
+
+
+struct _cffi_global_s {
+    const char *name;
+    void *address;
+    _cffi_opcode_t type_op;
+    void *size_or_direct_fn;  // OP_GLOBAL_VAR: size, or 0 if unknown
+                              // OP_CPYTHON_BLTN_*: addr of direct function
+};
+
+struct _cffi_getconst_s {
+    unsigned long long value;
+    const struct _cffi_type_context_s *ctx;
+    int gindex;
+};
+
+struct _cffi_struct_union_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_STRUCT_UNION
+    int flags;               // _CFFI_F_* flags below
+    size_t size;
+    int alignment;
+    int first_field_index;   // -> _cffi_fields array
+    int num_fields;
+};
+#define _CFFI_F_UNION         0x01   // is a union, not a struct
+#define _CFFI_F_CHECK_FIELDS  0x02   // complain if fields are not in the
+                                     // "standard layout" or if some are missing
+#define _CFFI_F_PACKED        0x04   // for CHECK_FIELDS, assume a packed struct
+#define _CFFI_F_EXTERNAL      0x08   // in some other ffi.include()
+#define _CFFI_F_OPAQUE        0x10   // opaque
+
+struct _cffi_field_s {
+    const char *name;
+    size_t field_offset;
+    size_t field_size;
+    _cffi_opcode_t field_type_op;
+};
+
+struct _cffi_enum_s {
+    const char *name;
+    int type_index;          // -> _cffi_types, on a OP_ENUM
+    int type_prim;           // _CFFI_PRIM_xxx
+    const char *enumerators; // comma-delimited string
+};
+
+struct _cffi_typename_s {
+    const char *name;
+    int type_index;   /* if opaque, points to a possibly artificial
+                         OP_STRUCT which is itself opaque */
+};
+
+struct _cffi_type_context_s {
+    _cffi_opcode_t *types;
+    const struct _cffi_global_s *globals;
+    const struct _cffi_field_s *fields;
+    const struct _cffi_struct_union_s *struct_unions;
+    const struct _cffi_enum_s *enums;
+    const struct _cffi_typename_s *typenames;
+    int num_globals;
+    int num_struct_unions;
+    int num_enums;
+    int num_typenames;
+    const char *const *includes;
+    int num_types;
+    int flags;      /* future extension */
+};
+
+struct _cffi_parse_info_s {
+    const struct _cffi_type_context_s *ctx;
+    _cffi_opcode_t *output;
+    unsigned int output_size;
+    size_t error_location;
+    const char *error_message;
+};
+
+struct _cffi_externpy_s {
+    const char *name;
+    size_t size_of_result;
+    void *reserved1, *reserved2;
+};
+
+#ifdef _CFFI_INTERNAL
+static int parse_c_type(struct _cffi_parse_info_s *info, const char *input);
+static int search_in_globals(const struct _cffi_type_context_s *ctx,
+                             const char *search, size_t search_len);
+static int search_in_struct_unions(const struct _cffi_type_context_s *ctx,
+                                   const char *search, size_t search_len);
+#endif
+
+/* this block of #ifs should be kept exactly identical between
+   c/_cffi_backend.c, cffi/vengine_cpy.py, cffi/vengine_gen.py
+   and cffi/_cffi_include.h */
+#if defined(_MSC_VER)
+# include <malloc.h>   /* for alloca() */
+# if _MSC_VER < 1600   /* MSVC < 2010 */
+   typedef __int8 int8_t;
+   typedef __int16 int16_t;
+   typedef __int32 int32_t;
+   typedef __int64 int64_t;
+   typedef unsigned __int8 uint8_t;
+   typedef unsigned __int16 uint16_t;
+   typedef unsigned __int32 uint32_t;
+   typedef unsigned __int64 uint64_t;
+   typedef __int8 int_least8_t;
+   typedef __int16 int_least16_t;
+   typedef __int32 int_least32_t;
+   typedef __int64 int_least64_t;
+   typedef unsigned __int8 uint_least8_t;
+   typedef unsigned __int16 uint_least16_t;
+   typedef unsigned __int32 uint_least32_t;
+   typedef unsigned __int64 uint_least64_t;
+   typedef __int8 int_fast8_t;
+   typedef __int16 int_fast16_t;
+   typedef __int32 int_fast32_t;
+   typedef __int64 int_fast64_t;
+   typedef unsigned __int8 uint_fast8_t;
+   typedef unsigned __int16 uint_fast16_t;
+   typedef unsigned __int32 uint_fast32_t;
+   typedef unsigned __int64 uint_fast64_t;
+   typedef __int64 intmax_t;
+   typedef unsigned __int64 uintmax_t;
+# else
+#  include <stdint.h>
+# endif
+# if _MSC_VER < 1800   /* MSVC < 2013 */
+#  ifndef __cplusplus
+    typedef unsigned char _Bool;
+#  endif
+# endif
+# define _cffi_float_complex_t   _Fcomplex    /* include <complex.h> for it */
+# define _cffi_double_complex_t  _Dcomplex    /* include <complex.h> for it */
+#else
+# include <stdint.h>
+# if (defined (__SVR4) && defined (__sun)) || defined(_AIX) || defined(__hpux)
+#  include <alloca.h>
+# endif
+# define _cffi_float_complex_t   float _Complex
+# define _cffi_double_complex_t  double _Complex
+#endif
+
+#ifdef __GNUC__
+# define _CFFI_UNUSED_FN  __attribute__((unused))
+#else
+# define _CFFI_UNUSED_FN  /* nothing */
+#endif
+
+#ifdef __cplusplus
+# ifndef _Bool
+   typedef bool _Bool;   /* semi-hackish: C++ has no _Bool; bool is builtin */
+# endif
+#endif
+
+/**********  CPython-specific section  **********/
+#ifndef PYPY_VERSION
+
+
+#define _cffi_from_c_double PyFloat_FromDouble
+#define _cffi_from_c_float PyFloat_FromDouble
+#define _cffi_from_c_long PyLong_FromLong
+#define _cffi_from_c_ulong PyLong_FromUnsignedLong
+#define _cffi_from_c_longlong PyLong_FromLongLong
+#define _cffi_from_c_ulonglong PyLong_FromUnsignedLongLong
+#define _cffi_from_c__Bool PyBool_FromLong
+
+#define _cffi_to_c_double PyFloat_AsDouble
+#define _cffi_to_c_float PyFloat_AsDouble
+
+#define _cffi_from_c_int(x, type)                                        \
+    (((type)-1) > 0 ? /* unsigned */                                     \
+        (sizeof(type) < sizeof(long) ?                                   \
+            PyLong_FromLong((long)x) :                                   \
+         sizeof(type) == sizeof(long) ?                                  \
+            PyLong_FromUnsignedLong((unsigned long)x) :                  \
+            PyLong_FromUnsignedLongLong((unsigned long long)x)) :        \
+        (sizeof(type) <= sizeof(long) ?                                  \
+            PyLong_FromLong((long)x) :                                   \
+            PyLong_FromLongLong((long long)x)))
+
+#define _cffi_to_c_int(o, type)                                          \
+    ((type)(                                                             \
+     sizeof(type) == 1 ? (((type)-1) > 0 ? (type)_cffi_to_c_u8(o)        \
+                                         : (type)_cffi_to_c_i8(o)) :     \
+     sizeof(type) == 2 ? (((type)-1) > 0 ? (type)_cffi_to_c_u16(o)       \
+                                         : (type)_cffi_to_c_i16(o)) :    \
+     sizeof(type) == 4 ? (((type)-1) > 0 ? (type)_cffi_to_c_u32(o)       \
+                                         : (type)_cffi_to_c_i32(o)) :    \
+     sizeof(type) == 8 ? (((type)-1) > 0 ? (type)_cffi_to_c_u64(o)       \
+                                         : (type)_cffi_to_c_i64(o)) :    \
+     (Py_FatalError("unsupported size for type " #type), (type)0)))
+
+#define _cffi_to_c_i8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[1])
+#define _cffi_to_c_u8                                                    \
+                 ((int(*)(PyObject *))_cffi_exports[2])
+#define _cffi_to_c_i16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[3])
+#define _cffi_to_c_u16                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[4])
+#define _cffi_to_c_i32                                                   \
+                 ((int(*)(PyObject *))_cffi_exports[5])
+#define _cffi_to_c_u32                                                   \
+                 ((unsigned int(*)(PyObject *))_cffi_exports[6])
+#define _cffi_to_c_i64                                                   \
+                 ((long long(*)(PyObject *))_cffi_exports[7])
+#define _cffi_to_c_u64                                                   \
+                 ((unsigned long long(*)(PyObject *))_cffi_exports[8])
+#define _cffi_to_c_char                                                  \
+                 ((int(*)(PyObject *))_cffi_exports[9])
+#define _cffi_from_c_pointer                                             \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[10])
+#define _cffi_to_c_pointer                                               \
+    ((char *(*)(PyObject *, struct _cffi_ctypedescr *))_cffi_exports[11])
+#define _cffi_get_struct_layout                                          \
+    not used any more
+#define _cffi_restore_errno                                              \
+    ((void(*)(void))_cffi_exports[13])
+#define _cffi_save_errno                                                 \
+    ((void(*)(void))_cffi_exports[14])
+#define _cffi_from_c_char                                                \
+    ((PyObject *(*)(char))_cffi_exports[15])
+#define _cffi_from_c_deref                                               \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[16])
+#define _cffi_to_c                                                       \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[17])
+#define _cffi_from_c_struct                                              \
+    ((PyObject *(*)(char *, struct _cffi_ctypedescr *))_cffi_exports[18])
+#define _cffi_to_c_wchar_t                                               \
+    ((_cffi_wchar_t(*)(PyObject *))_cffi_exports[19])
+#define _cffi_from_c_wchar_t                                             \
+    ((PyObject *(*)(_cffi_wchar_t))_cffi_exports[20])
+#define _cffi_to_c_long_double                                           \
+    ((long double(*)(PyObject *))_cffi_exports[21])
+#define _cffi_to_c__Bool                                                 \
+    ((_Bool(*)(PyObject *))_cffi_exports[22])
+#define _cffi_prepare_pointer_call_argument                              \
+    ((Py_ssize_t(*)(struct _cffi_ctypedescr *,                           \
+                    PyObject *, char **))_cffi_exports[23])
+#define _cffi_convert_array_from_object                                  \
+    ((int(*)(char *, struct _cffi_ctypedescr *, PyObject *))_cffi_exports[24])
+#define _CFFI_CPIDX  25
+#define _cffi_call_python                                                \
+    ((void(*)(struct _cffi_externpy_s *, char *))_cffi_exports[_CFFI_CPIDX])
+#define _cffi_to_c_wchar3216_t                                           \
+    ((int(*)(PyObject *))_cffi_exports[26])
+#define _cffi_from_c_wchar3216_t                                         \
+    ((PyObject *(*)(int))_cffi_exports[27])
+#define _CFFI_NUM_EXPORTS 28
+
+struct _cffi_ctypedescr;
+
+static void *_cffi_exports[_CFFI_NUM_EXPORTS];
+
+#define _cffi_type(index)   (                           \
+    assert((((uintptr_t)_cffi_types[index]) & 1) == 0), \
+    (struct _cffi_ctypedescr *)_cffi_types[index])
+
+static PyObject *_cffi_init(const char *module_name, Py_ssize_t version,
+                            const struct _cffi_type_context_s *ctx)
+{
+    PyObject *module, *o_arg, *new_module;
+    void *raw[] = {
+        (void *)module_name,
+        (void *)version,
+        (void *)_cffi_exports,
+        (void *)ctx,
+    };
+
+    module = PyImport_ImportModule("_cffi_backend");
+    if (module == NULL)
+        goto failure;
+
+    o_arg = PyLong_FromVoidPtr((void *)raw);
+    if (o_arg == NULL)
+        goto failure;
+
+    new_module = PyObject_CallMethod(
+        module, (char *)"_init_cffi_1_0_external_module", (char *)"O", o_arg);
+
+    Py_DECREF(o_arg);
+    Py_DECREF(module);
+    return new_module;
+
+  failure:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+#ifdef HAVE_WCHAR_H
+typedef wchar_t _cffi_wchar_t;
+#else
+typedef uint16_t _cffi_wchar_t;   /* same random pick as _cffi_backend.c */
+#endif
+
+_CFFI_UNUSED_FN static uint16_t _cffi_to_c_char16_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return (uint16_t)_cffi_to_c_wchar_t(o);
+    else
+        return (uint16_t)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char16_t(uint16_t x)
+{
+    if (sizeof(_cffi_wchar_t) == 2)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+_CFFI_UNUSED_FN static int _cffi_to_c_char32_t(PyObject *o)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return (int)_cffi_to_c_wchar_t(o);
+    else
+        return (int)_cffi_to_c_wchar3216_t(o);
+}
+
+_CFFI_UNUSED_FN static PyObject *_cffi_from_c_char32_t(unsigned int x)
+{
+    if (sizeof(_cffi_wchar_t) == 4)
+        return _cffi_from_c_wchar_t((_cffi_wchar_t)x);
+    else
+        return _cffi_from_c_wchar3216_t((int)x);
+}
+
+union _cffi_union_alignment_u {
+    unsigned char m_char;
+    unsigned short m_short;
+    unsigned int m_int;
+    unsigned long m_long;
+    unsigned long long m_longlong;
+    float m_float;
+    double m_double;
+    long double m_longdouble;
+};
+
+struct _cffi_freeme_s {
+    struct _cffi_freeme_s *next;
+    union _cffi_union_alignment_u alignment;
+};
+
+_CFFI_UNUSED_FN static int
+_cffi_convert_array_argument(struct _cffi_ctypedescr *ctptr, PyObject *arg,
+                             char **output_data, Py_ssize_t datasize,
+                             struct _cffi_freeme_s **freeme)
+{
+    char *p;
+    if (datasize < 0)
+        return -1;
+
+    p = *output_data;
+    if (p == NULL) {
+        struct _cffi_freeme_s *fp = (struct _cffi_freeme_s *)PyObject_Malloc(
+            offsetof(struct _cffi_freeme_s, alignment) + (size_t)datasize);
+        if (fp == NULL)
+            return -1;
+        fp->next = *freeme;
+        *freeme = fp;
+        p = *output_data = (char *)&fp->alignment;
+    }
+    memset((void *)p, 0, (size_t)datasize);
+    return _cffi_convert_array_from_object(p, ctptr, arg);
+}
+
+_CFFI_UNUSED_FN static void
+_cffi_free_array_arguments(struct _cffi_freeme_s *freeme)
+{
+    do {
+        void *p = (void *)freeme;
+        freeme = freeme->next;
+        PyObject_Free(p);
+    } while (freeme != NULL);
+}
+
+/**********  end CPython-specific section  **********/
+#else
+_CFFI_UNUSED_FN
+static void (*_cffi_call_python_org)(struct _cffi_externpy_s *, char *);
+# define _cffi_call_python  _cffi_call_python_org
+#endif
+
+
+#define _cffi_array_len(array)   (sizeof(array) / sizeof((array)[0]))
+
+#define _cffi_prim_int(size, sign)                                      \
+    ((size) == 1 ? ((sign) ? _CFFI_PRIM_INT8  : _CFFI_PRIM_UINT8)  :    \
+     (size) == 2 ? ((sign) ? _CFFI_PRIM_INT16 : _CFFI_PRIM_UINT16) :    \
+     (size) == 4 ? ((sign) ? _CFFI_PRIM_INT32 : _CFFI_PRIM_UINT32) :    \
+     (size) == 8 ? ((sign) ? _CFFI_PRIM_INT64 : _CFFI_PRIM_UINT64) :    \
+     _CFFI__UNKNOWN_PRIM)
+
+#define _cffi_prim_float(size)                                          \
+    ((size) == sizeof(float) ? _CFFI_PRIM_FLOAT :                       \
+     (size) == sizeof(double) ? _CFFI_PRIM_DOUBLE :                     \
+     (size) == sizeof(long double) ? _CFFI__UNKNOWN_LONG_DOUBLE :       \
+     _CFFI__UNKNOWN_FLOAT_PRIM)
+
+#define _cffi_check_int(got, got_nonpos, expected)      \
+    ((got_nonpos) == (expected <= 0) &&                 \
+     (got) == (unsigned long long)expected)
+
+#ifdef MS_WIN32
+# define _cffi_stdcall  __stdcall
+#else
+# define _cffi_stdcall  /* nothing */
+#endif
+
+#ifdef __cplusplus
+}
+#endif
+
+/************************************************************/
+
+#include <stdbool.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "meta_read.h"
+
+#define ERR_PARSER 2
+#define ERR_MEMORY 3
+
+/* Growable byte buffer, always NUL-terminated. */
+struct buffer
+{
+    char*  data;
+    size_t size;
+    size_t capacity;
+};
+
+static void buffer_init(struct buffer* buf)
+{
+    buf->data = NULL;
+    buf->size = 0;
+    buf->capacity = 0;
+}
+
+static bool buffer_append(struct buffer* buf, void const* data, size_t size)
+{
+    size_t needed = buf->size + size + 1;
+    if (needed > buf->capacity) {
+        size_t capacity = buf->capacity ? buf->capacity : 256;
+        while (capacity < needed)
+            capacity *= 2;
+        char* tmp = realloc(buf->data, capacity);
+        if (!tmp)
+            return false;
+        buf->data = tmp;
+        buf->capacity = capacity;
+    }
+    memcpy(buf->data + buf->size, data, size);
+    buf->size += size;
+    buf->data[buf->size] = '\0';
+    return true;
+}
+
+static inline bool meta_is_space(char c)
+{
+    return c == ' ' || c == '\t' || c == '\r' || c == '\n';
+}
+
+/* Header line key, like "NAME" or "STATS LOCAL MSV", and its values. */
+struct field
+{
+    char*  key;
+    size_t key_size;
+    bool   required;
+    bool   found;
+    /* Value of the current record. */
+    struct buffer value;
+    /* Values of the collected records, each one followed by a newline. A
+     * missing optional value is an empty line. */
+    struct buffer column;
+};
+
+struct meta_scanner
+{
+    /* Line split across fed blocks. */
+    struct buffer line;
+    struct field* fields;
+    unsigned      nfields;
+    struct buffer starts;
+    struct buffer ends;
+    size_t        nrows;
+    size_t        line_num;
+    long long     offset;
+    long long     start;
+    bool          ended;
+    int           err;
+    char          errmsg[128];
+};
+
+struct meta_scanner* meta_scanner_new(char const* const* keys, bool const* required,
+                                      unsigned nfields)
+{
+    struct meta_scanner* scanner = malloc(sizeof(*scanner));
+    if (!scanner)
+        return NULL;
+
+    scanner->fields = calloc(nfields, sizeof(*scanner->fields));
+    scanner->nfields = nfields;
+    if (!scanner->fields) {
+        free(scanner);
+        return NULL;
+    }
+
+    /* Everything meta_scanner_del frees is set before any key allocation. */
+    buffer_init(&scanner->line);
+    buffer_init(&scanner->starts);
+    buffer_init(&scanner->ends);
+    scanner->nrows = 0;
+    scanner->line_num = 0;
+    scanner->offset = 0;
+    scanner->start = 0;
+    scanner->ended = false;
+    scanner->err = 0;
+    scanner->errmsg[0] = '\0';
+
+    for (unsigned i = 0; i < nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        field->key_size = strlen(keys[i]);
+        field->required = required[i];
+        field->found = false;
+        buffer_init(&field->value);
+        buffer_init(&field->column);
+        field->key = malloc(field->key_size + 1);
+        if (!field->key) {
+            meta_scanner_del(scanner);
+            return NULL;
+        }
+        memcpy(field->key, keys[i], field->key_size + 1);
+    }
+    return scanner;
+}
+
+void meta_scanner_del(struct meta_scanner* scanner)
+{
+    free(scanner->line.data);
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        free(scanner->fields[i].key);
+        free(scanner->fields[i].value.data);
+        free(scanner->fields[i].column.data);
+    }
+    free(scanner->fields);
+    free(scanner->starts.data);
+    free(scanner->ends.data);
+    free(scanner);
+}
+
+static int scanner_error(struct meta_scanner* scanner, int err, char const* msg)
+{
+    if (err == ERR_PARSER && scanner->line_num > 0)
+        snprintf(scanner->errmsg, sizeof(scanner->errmsg), "%s at line %zu", msg,
+                 scanner->line_num);
+    else
+        snprintf(scanner->errmsg, sizeof(scanner->errmsg), "%s", msg);
+    return scanner->err = err;
+}
+
+static int scanner_commit(struct meta_scanner* scanner, long long end)
+{
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        if (scanner->fields[i].required && !scanner->fields[i].found)
+            return scanner_error(scanner, ERR_PARSER, "some metadata is missing");
+    }
+
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        if (!buffer_append(&field->column, field->value.data, field->value.size) ||
+            !buffer_append(&field->column, "\n", 1))
+            return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+        field->value.size = 0;
+        field->found = false;
+    }
+
+    if (!buffer_append(&scanner->starts, &scanner->start, sizeof(scanner->start)) ||
+        !buffer_append(&scanner->ends, &end, sizeof(end)))
+        return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+
+    ++scanner->nrows;
+    scanner->start = end;
+    return 0;
+}
+
+/* Process a whole line, its newline included if any. */
+static int scanner_line(struct meta_scanner* scanner, char const* line, size_t size)
+{
+    char const* end = line + size;
+    long long   line_end = scanner->offset + (long long)size;
+    ++scanner->line_num;
+
+    char const* tok = line;
+    while (tok < end && meta_is_space(*tok))
+        ++tok;
+
+    if (tok == end) {
+        /* Blank lines carry no information and do not start a record. */
+        if (scanner->start == scanner->offset)
+            scanner->start = line_end;
+        scanner->offset = line_end;
+        return 0;
+    }
+
+    scanner->ended = end - tok >= 2 && tok[0] == '/' && tok[1] == '/';
+    if (scanner->ended) {
+        scanner->offset = line_end;
+        return scanner_commit(scanner, line_end);
+    }
+
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        if ((size_t)(end - tok) <= field->key_size ||
+            memcmp(tok, field->key, field->key_size) || !meta_is_space(tok[field->key_size]))
+            continue;
+
+        char const* val = tok + field->key_size;
+        while (val < end && meta_is_space(*val))
+            ++val;
+        char const* val_end = end;
+        while (val_end > val && meta_is_space(val_end[-1]))
+            --val_end;
+        if (val == val_end)
+            return scanner_error(scanner, ERR_PARSER, "could not parse line");
+
+        field->value.size = 0;
+        if (!buffer_append(&field->value, val, val_end - val))
+            return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+        field->found = true;
+    }
+
+    scanner->offset = line_end;
+    return 0;
+}
+
+int meta_scanner_feed(struct meta_scanner* scanner, char const* data, size_t size)
+{
+    char const* end = data + size;
+
+    if (scanner->err)
+        return scanner->err;
+
+    while (data < end) {
+        char const* eol = memchr(data, '\n', end - data);
+        if (!eol) {
+            if (!buffer_append(&scanner->line, data, end - data))
+                return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+            break;
+        }
+
+        size_t n = eol + 1 - data;
+        if (scanner->line.size == 0) {
+            if (scanner_line(scanner, data, n))
+                return scanner->err;
+        } else {
+            if (!buffer_append(&scanner->line, data, n))
+                return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+            if (scanner_line(scanner, scanner->line.data, scanner->line.size))
+                return scanner->err;
+            scanner->line.size = 0;
+        }
+        data += n;
+    }
+    return 0;
+}
+
+int meta_scanner_finish(struct meta_scanner* scanner)
+{
+    if (scanner->err)
+        return scanner->err;
+
+    if (scanner->line.size > 0) {
+        if (scanner_line(scanner, scanner->line.data, scanner->line.size))
+            return scanner->err;
+        scanner->line.size = 0;
+    }
+
+    if (!scanner->ended)
+        return scanner_error(scanner, ERR_PARSER, "ending token is missing");
+    return 0;
+}
+
+char const* meta_scanner_error(struct meta_scanner const* scanner) { return scanner->errmsg; }
+
+size_t meta_scanner_nrows(struct meta_scanner const* scanner) { return scanner->nrows; }
+
+char const* meta_scanner_column(struct meta_scanner const* scanner, unsigned field,
+                                size_t* size)
+{
+    *size = scanner->fields[field].column.size;
+    return scanner->fields[field].column.data;
+}
+
+long long const* meta_scanner_starts(struct meta_scanner const* scanner)
+{
+    return (long long const*)scanner->starts.data;
+}
+
+long long const* meta_scanner_ends(struct meta_scanner const* scanner)
+{
+    return (long long const*)scanner->ends.data;
+}
+
+void meta_scanner_clear(struct meta_scanner* scanner)
+{
+    for (unsigned i = 0; i < scanner->nfields; ++i)
+        scanner->fields[i].column.size = 0;
+    scanner->starts.size = 0;
+    scanner->ends.size = 0;
+    scanner->nrows = 0;
+}
+
+#include <math.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "model_read.h"
+
+#ifndef ERR_PARSER
+#define ERR_PARSER 2
+#endif
+
+#define MODEL_NTRANS 7
+
+struct cursor
+{
+    char const* pos;
+    char const* end;
+    char const* line;
+    char const* eol;
+    size_t      line_num;
+};
+
+static inline char const* line_end(char const* pos, char const* end)
+{
+    char const* eol = memchr(pos, '\n', end - pos);
+    return eol ? eol + 1 : end;
+}
+
+static inline bool is_space(char c) { return c == ' ' || c == '\t' || c == '\r'; }
+
+static inline char const* skip_spaces(char const* pos, char const* eol)
+{
+    while (pos < eol && is_space(*pos))
+        ++pos;
+    return pos;
+}
+
+static inline bool cursor_next_line(struct cursor* cur)
+{
+    if (cur->pos >= cur->end)
+        return false;
+    cur->line = cur->pos;
+    cur->eol = line_end(cur->pos, cur->end);
+    cur->pos = cur->eol;
+    ++cur->line_num;
+    return true;
+}
+
+static inline bool token_is(char const* tok, char const* eol, char const* str, size_t size)
+{
+    return (size_t)(eol - tok) >= size && memcmp(tok, str, size) == 0 &&
+           (tok + size == eol || is_space(tok[size]) || tok[size] == '\n');
+}
+
+static double const POW10[] = {1e0,  1e1,  1e2,  1e3,  1e4,  1e5,  1e6,  1e7,
+                               1e8,  1e9,  1e10, 1e11, 1e12, 1e13, 1e14, 1e15,
+                               1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22};
+
+/* Parse a decimal number within [pos, eol) without reading past eol. */
+static bool parse_double(char const* pos, char const* eol, double* value, char const** stop)
+{
+    char const* p = pos;
+    bool        neg = false;
+    uint64_t    mant = 0;
+    unsigned    ndigits = 0;
+    unsigned    nfrac = 0;
+
+    if (p < eol && (*p == '-' || *p == '+'))
+        neg = *p++ == '-';
+
+    while (p < eol && *p >= '0' && *p <= '9') {
+        mant = mant * 10 + (uint64_t)(*p++ - '0');
+        ++ndigits;
+    }
+    if (p < eol && *p == '.') {
+        ++p;
+        while (p < eol && *p >= '0' && *p <= '9') {
+            mant = mant * 10 + (uint64_t)(*p++ - '0');
+            ++ndigits;
+            ++nfrac;
+        }
+    }
+    if (ndigits == 0)
+        return false;
+
+    bool has_exp = p < eol && (*p == 'e' || *p == 'E');
+    if (!has_exp && ndigits <= 15 && nfrac <= 22) {
+        /* Both operands are exact, so the division is correctly rounded. */
+        double v = (double)mant / POW10[nfrac];
+        *value = neg ? -v : v;
+        *stop = p;
+        return true;
+    }
+
+    char   buf[64];
+    size_t n = 0;
+    while (pos + n < eol && n < sizeof(buf) - 1 && !is_space(pos[n]) && pos[n] != '\n')
+        ++n;
+    memcpy(buf, pos, n);
+    buf[n] = '\0';
+
+    char* end = NULL;
+    *value = strtod(buf, &end);
+    if (end == buf)
+        return false;
+    *stop = pos + (end - buf);
+    return true;
+}
+
+static bool read_number(char const** pos, char const* eol, double* value)
+{
+    char const* p = skip_spaces(*pos, eol);
+    if (p == eol || *p == '\n')
+        return false;
+
+    char const* stop = p + 1;
+    if (*p == '*') {
+        *value = -INFINITY;
+    } else if (parse_double(p, eol, value, &stop)) {
+        /* HMMER stores negated natural logarithms. */
+        *value = -*value;
+    } else {
+        return false;
+    }
+
+    if (stop < eol && !is_space(*stop) && *stop != '\n')
+        return false;
+
+    *pos = stop;
+    return true;
+}
+
+static bool read_numbers(char const** pos, char const* eol, unsigned n, double* values)
+{
+    for (unsigned i = 0; i < n; ++i) {
+        if (!read_number(pos, eol, values + i))
+            return false;
+    }
+    return true;
+}
+
+static bool skip_token(char const** pos, char const* eol)
+{
+    char const* p = skip_spaces(*pos, eol);
+    if (p == eol || *p == '\n')
+        return false;
+    while (p < eol && !is_space(*p) && *p != '\n')
+        ++p;
+    *pos = p;
+    return true;
+}
+
+static size_t count_lines(char const* pos, char const* end)
+{
+    size_t n = 0;
+    while ((pos = memchr(pos, '\n', end - pos)) != NULL) {
+        ++pos;
+        ++n;
+    }
+    return n;
+}
+
+int model_layout(char const* data, size_t size, struct model_layout* layout)
+{
+    char const* end = data + size;
+    char const* line = data;
+
+    /* Skip blank lines before the header. */
+    while (line < end && skip_spaces(line, end) < end && *skip_spaces(line, end) == '\n')
+        line = skip_spaces(line, end) + 1;
+    line = line_end(line, end);
+
+    layout->header_end = line - data;
+    layout->meta_end = size;
+    layout->alph_end = size;
+    layout->body_start = size;
+    layout->body_lines = 0;
+
+    while (line < end) {
+        char const* eol = line_end(line, end);
+        char const* tok = skip_spaces(line, eol);
+        if (token_is(tok, eol, "HMM", 3) && tok + 3 < eol && is_space(tok[3])) {
+            layout->meta_end = line - data;
+            layout->alph_end = eol - data;
+            /* The line after the alphabet names the transitions. */
+            layout->body_start = line_end(eol, end) - data;
+            layout->body_lines = count_lines(data + layout->body_start, end);
+            return 0;
+        }
+        line = eol;
+    }
+
+    return ERR_PARSER;
+}
+
+int model_read(char const* data, size_t size, unsigned K, size_t max_nodes, double* compo,
+               double* match, double* insert, double* trans, size_t* nnodes, size_t* line_num)
+{
+    struct cursor cur = {data, data + size, data, data, 0};
+    char const*   p = NULL;
+    size_t        k = 0;
+
+    *nnodes = 0;
+    /* No room for the begin node, or no symbol to emit. */
+    if (max_nodes == 0 || K == 0)
+        goto err;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = skip_spaces(cur.line, cur.eol);
+    if (!token_is(p, cur.eol, "COMPO", 5))
+        goto err;
+    p += 5;
+    if (!read_numbers(&p, cur.eol, K, compo))
+        goto err;
+
+    for (unsigned i = 0; i < K; ++i)
+        match[i] = -INFINITY;
+    match[0] = 0.0;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = cur.line;
+    if (!read_numbers(&p, cur.eol, K, insert))
+        goto err;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = cur.line;
+    if (!read_numbers(&p, cur.eol, MODEL_NTRANS, trans))
+        goto err;
+
+    while (cursor_next_line(&cur)) {
+        p = skip_spaces(cur.line, cur.eol);
+        if (token_is(p, cur.eol, "//", 2)) {
+            *nnodes = k + 1;
+            *line_num = cur.line_num;
+            return 0;
+        }
+
+        if (++k >= max_nodes)
+            goto err;
+
+        if (!skip_token(&p, cur.eol))
+            goto err;
+        if (!read_numbers(&p, cur.eol, K, match + k * K))
+            goto err;
+
+        if (!cursor_next_line(&cur))
+            goto err;
+        p = cur.line;
+        if (!read_numbers(&p, cur.eol, K, insert + k * K))
+            goto err;
+
+        if (!cursor_next_line(&cur))
+            goto err;
+        p = cur.line;
+        if (!read_numbers(&p, cur.eol, MODEL_NTRANS, trans + k * MODEL_NTRANS))
+            goto err;
+    }
+
+err:
+    *line_num = cur.line_num;
+    return ERR_PARSER;
+}
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <string.h>
+
+#include "record_count.h"
+
+void record_counter_init(struct record_counter* counter, bool line_start)
+{
+    counter->count = 0;
+    counter->line_start = line_start;
+    counter->pending = false;
+}
+
+/* Count the lines starting with "//". Slashes are rare in HMMER files, so
+ * looking for them is much faster than going through every line. */
+void record_counter_feed(struct record_counter* counter, char const* data, size_t size)
+{
+    if (size == 0)
+        return;
+
+    if (counter->pending && data[0] == '/')
+        ++counter->count;
+    counter->pending = false;
+
+    char const* end = data + size;
+    char const* pos = data;
+    while ((pos = memchr(pos, '/', end - pos)) != NULL) {
+        bool line_start = pos == data ? counter->line_start : pos[-1] == '\n';
+        if (line_start) {
+            if (pos + 1 == end) {
+                counter->pending = true;
+                break;
+            }
+            if (pos[1] == '/') {
+                ++counter->count;
+                ++pos;
+            }
+        }
+        ++pos;
+    }
+
+    counter->line_start = end[-1] == '\n';
+}
+
+
+/************************************************************/
+
+static void *_cffi_types[] = {
+/*  0 */ _CFFI_OP(_CFFI_OP_FUNCTION, 9), // char const *()(struct meta_scanner const *)
+/*  1 */ _CFFI_OP(_CFFI_OP_POINTER, 61), // struct meta_scanner const *
+/*  2 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  3 */ _CFFI_OP(_CFFI_OP_FUNCTION, 9), // char const *()(struct meta_scanner const *, unsigned int, size_t *)
+/*  4 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/*  5 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8), // unsigned int
+/*  6 */ _CFFI_OP(_CFFI_OP_POINTER, 10), // size_t *
+/*  7 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/*  8 */ _CFFI_OP(_CFFI_OP_FUNCTION, 58), // int()(char const *, size_t, struct model_layout *)
+/*  9 */ _CFFI_OP(_CFFI_OP_POINTER, 56), // char const *
+/* 10 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28), // size_t
+/* 11 */ _CFFI_OP(_CFFI_OP_POINTER, 62), // struct model_layout *
+/* 12 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 13 */ _CFFI_OP(_CFFI_OP_FUNCTION, 58), // int()(char const *, size_t, unsigned int, size_t, double *, double *, double *, double *, size_t *, size_t *)
+/* 14 */ _CFFI_OP(_CFFI_OP_NOOP, 9),
+/* 15 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 16 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 17 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 18 */ _CFFI_OP(_CFFI_OP_POINTER, 57), // double *
+/* 19 */ _CFFI_OP(_CFFI_OP_NOOP, 18),
+/* 20 */ _CFFI_OP(_CFFI_OP_NOOP, 18),
+/* 21 */ _CFFI_OP(_CFFI_OP_NOOP, 18),
+/* 22 */ _CFFI_OP(_CFFI_OP_NOOP, 6),
+/* 23 */ _CFFI_OP(_CFFI_OP_NOOP, 6),
+/* 24 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 25 */ _CFFI_OP(_CFFI_OP_FUNCTION, 58), // int()(struct meta_scanner *)
+/* 26 */ _CFFI_OP(_CFFI_OP_POINTER, 61), // struct meta_scanner *
+/* 27 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 28 */ _CFFI_OP(_CFFI_OP_FUNCTION, 58), // int()(struct meta_scanner *, char const *, size_t)
+/* 29 */ _CFFI_OP(_CFFI_OP_NOOP, 26),
+/* 30 */ _CFFI_OP(_CFFI_OP_NOOP, 9),
+/* 31 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 32 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 33 */ _CFFI_OP(_CFFI_OP_FUNCTION, 59), // long long const *()(struct meta_scanner const *)
+/* 34 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 35 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 36 */ _CFFI_OP(_CFFI_OP_FUNCTION, 10), // size_t()(struct meta_scanner const *)
+/* 37 */ _CFFI_OP(_CFFI_OP_NOOP, 1),
+/* 38 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 39 */ _CFFI_OP(_CFFI_OP_FUNCTION, 26), // struct meta_scanner *()(char const * const *, _Bool const *, unsigned int)
+/* 40 */ _CFFI_OP(_CFFI_OP_POINTER, 9), // char const * const *
+/* 41 */ _CFFI_OP(_CFFI_OP_POINTER, 49), // _Bool const *
+/* 42 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 8),
+/* 43 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 44 */ _CFFI_OP(_CFFI_OP_FUNCTION, 65), // void()(struct meta_scanner *)
+/* 45 */ _CFFI_OP(_CFFI_OP_NOOP, 26),
+/* 46 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 47 */ _CFFI_OP(_CFFI_OP_FUNCTION, 65), // void()(struct record_counter *, _Bool)
+/* 48 */ _CFFI_OP(_CFFI_OP_POINTER, 63), // struct record_counter *
+/* 49 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 1), // _Bool
+/* 50 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 51 */ _CFFI_OP(_CFFI_OP_FUNCTION, 65), // void()(struct record_counter *, char const *, size_t)
+/* 52 */ _CFFI_OP(_CFFI_OP_NOOP, 48),
+/* 53 */ _CFFI_OP(_CFFI_OP_NOOP, 9),
+/* 54 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 28),
+/* 55 */ _CFFI_OP(_CFFI_OP_FUNCTION_END, 0),
+/* 56 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 2), // char
+/* 57 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 14), // double
+/* 58 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 7), // int
+/* 59 */ _CFFI_OP(_CFFI_OP_POINTER, 60), // long long const *
+/* 60 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 11), // long long
+/* 61 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 0), // struct meta_scanner
+/* 62 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 1), // struct model_layout
+/* 63 */ _CFFI_OP(_CFFI_OP_STRUCT_UNION, 2), // struct record_counter
+/* 64 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 12), // unsigned long long
+/* 65 */ _CFFI_OP(_CFFI_OP_PRIMITIVE, 0), // void
+};
+
+static void _cffi_d_meta_scanner_clear(struct meta_scanner * x0)
+{
+  meta_scanner_clear(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_clear(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { meta_scanner_clear(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_meta_scanner_clear _cffi_d_meta_scanner_clear
+#endif
+
+static char const * _cffi_d_meta_scanner_column(struct meta_scanner const * x0, unsigned int x1, size_t * x2)
+{
+  return meta_scanner_column(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_column(PyObject *self, PyObject *args)
+{
+  struct meta_scanner const * x0;
+  unsigned int x1;
+  size_t * x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  char const * result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "meta_scanner_column", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, unsigned int);
+  if (x1 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (size_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_column(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(9));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_column _cffi_d_meta_scanner_column
+#endif
+
+static void _cffi_d_meta_scanner_del(struct meta_scanner * x0)
+{
+  meta_scanner_del(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_del(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { meta_scanner_del(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_meta_scanner_del _cffi_d_meta_scanner_del
+#endif
+
+static long long const * _cffi_d_meta_scanner_ends(struct meta_scanner const * x0)
+{
+  return meta_scanner_ends(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_ends(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  long long const * result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_ends(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(59));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_ends _cffi_d_meta_scanner_ends
+#endif
+
+static char const * _cffi_d_meta_scanner_error(struct meta_scanner const * x0)
+{
+  return meta_scanner_error(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_error(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  char const * result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_error(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(9));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_error _cffi_d_meta_scanner_error
+#endif
+
+static int _cffi_d_meta_scanner_feed(struct meta_scanner * x0, char const * x1, size_t x2)
+{
+  return meta_scanner_feed(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_feed(PyObject *self, PyObject *args)
+{
+  struct meta_scanner * x0;
+  char const * x1;
+  size_t x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "meta_scanner_feed", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(9), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(9), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_feed(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_feed _cffi_d_meta_scanner_feed
+#endif
+
+static int _cffi_d_meta_scanner_finish(struct meta_scanner * x0)
+{
+  return meta_scanner_finish(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_finish(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(26), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(26), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_finish(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_finish _cffi_d_meta_scanner_finish
+#endif
+
+static struct meta_scanner * _cffi_d_meta_scanner_new(char const * const * x0, _Bool const * x1, unsigned int x2)
+{
+  return meta_scanner_new(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_new(PyObject *self, PyObject *args)
+{
+  char const * const * x0;
+  _Bool const * x1;
+  unsigned int x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  struct meta_scanner * result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "meta_scanner_new", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(40), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const * const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(40), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(41), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (_Bool const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(41), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, unsigned int);
+  if (x2 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_new(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(26));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_new _cffi_d_meta_scanner_new
+#endif
+
+static size_t _cffi_d_meta_scanner_nrows(struct meta_scanner const * x0)
+{
+  return meta_scanner_nrows(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_nrows(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  size_t result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_nrows(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, size_t);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_nrows _cffi_d_meta_scanner_nrows
+#endif
+
+static long long const * _cffi_d_meta_scanner_starts(struct meta_scanner const * x0)
+{
+  return meta_scanner_starts(x0);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_meta_scanner_starts(PyObject *self, PyObject *arg0)
+{
+  struct meta_scanner const * x0;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  long long const * result;
+  PyObject *pyresult;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(1), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct meta_scanner const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(1), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = meta_scanner_starts(x0); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_pointer((char *)result, _cffi_type(59));
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_meta_scanner_starts _cffi_d_meta_scanner_starts
+#endif
+
+static int _cffi_d_model_layout(char const * x0, size_t x1, struct model_layout * x2)
+{
+  return model_layout(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_model_layout(PyObject *self, PyObject *args)
+{
+  char const * x0;
+  size_t x1;
+  struct model_layout * x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "model_layout", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(9), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(9), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(11), arg2, (char **)&x2);
+  if (datasize != 0) {
+    x2 = ((size_t)datasize) <= 640 ? (struct model_layout *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(11), arg2, (char **)&x2,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = model_layout(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_model_layout _cffi_d_model_layout
+#endif
+
+static int _cffi_d_model_read(char const * x0, size_t x1, unsigned int x2, size_t x3, double * x4, double * x5, double * x6, double * x7, size_t * x8, size_t * x9)
+{
+  return model_read(x0, x1, x2, x3, x4, x5, x6, x7, x8, x9);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_model_read(PyObject *self, PyObject *args)
+{
+  char const * x0;
+  size_t x1;
+  unsigned int x2;
+  size_t x3;
+  double * x4;
+  double * x5;
+  double * x6;
+  double * x7;
+  size_t * x8;
+  size_t * x9;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  int result;
+  PyObject *pyresult;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+  PyObject *arg3;
+  PyObject *arg4;
+  PyObject *arg5;
+  PyObject *arg6;
+  PyObject *arg7;
+  PyObject *arg8;
+  PyObject *arg9;
+
+  if (!PyArg_UnpackTuple(args, "model_read", 10, 10, &arg0, &arg1, &arg2, &arg3, &arg4, &arg5, &arg6, &arg7, &arg8, &arg9))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(9), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(9), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = _cffi_to_c_int(arg1, size_t);
+  if (x1 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  x2 = _cffi_to_c_int(arg2, unsigned int);
+  if (x2 == (unsigned int)-1 && PyErr_Occurred())
+    return NULL;
+
+  x3 = _cffi_to_c_int(arg3, size_t);
+  if (x3 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(18), arg4, (char **)&x4);
+  if (datasize != 0) {
+    x4 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(18), arg4, (char **)&x4,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(18), arg5, (char **)&x5);
+  if (datasize != 0) {
+    x5 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(18), arg5, (char **)&x5,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(18), arg6, (char **)&x6);
+  if (datasize != 0) {
+    x6 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(18), arg6, (char **)&x6,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(18), arg7, (char **)&x7);
+  if (datasize != 0) {
+    x7 = ((size_t)datasize) <= 640 ? (double *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(18), arg7, (char **)&x7,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg8, (char **)&x8);
+  if (datasize != 0) {
+    x8 = ((size_t)datasize) <= 640 ? (size_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg8, (char **)&x8,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(6), arg9, (char **)&x9);
+  if (datasize != 0) {
+    x9 = ((size_t)datasize) <= 640 ? (size_t *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(6), arg9, (char **)&x9,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { result = model_read(x0, x1, x2, x3, x4, x5, x6, x7, x8, x9); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  pyresult = _cffi_from_c_int(result, int);
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  return pyresult;
+}
+#else
+#  define _cffi_f_model_read _cffi_d_model_read
+#endif
+
+static void _cffi_d_record_counter_feed(struct record_counter * x0, char const * x1, size_t x2)
+{
+  record_counter_feed(x0, x1, x2);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_record_counter_feed(PyObject *self, PyObject *args)
+{
+  struct record_counter * x0;
+  char const * x1;
+  size_t x2;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+  PyObject *arg2;
+
+  if (!PyArg_UnpackTuple(args, "record_counter_feed", 3, 3, &arg0, &arg1, &arg2))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(48), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct record_counter *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(48), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(9), arg1, (char **)&x1);
+  if (datasize != 0) {
+    x1 = ((size_t)datasize) <= 640 ? (char const *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(9), arg1, (char **)&x1,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x2 = _cffi_to_c_int(arg2, size_t);
+  if (x2 == (size_t)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { record_counter_feed(x0, x1, x2); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_record_counter_feed _cffi_d_record_counter_feed
+#endif
+
+static void _cffi_d_record_counter_init(struct record_counter * x0, _Bool x1)
+{
+  record_counter_init(x0, x1);
+}
+#ifndef PYPY_VERSION
+static PyObject *
+_cffi_f_record_counter_init(PyObject *self, PyObject *args)
+{
+  struct record_counter * x0;
+  _Bool x1;
+  Py_ssize_t datasize;
+  struct _cffi_freeme_s *large_args_free = NULL;
+  PyObject *arg0;
+  PyObject *arg1;
+
+  if (!PyArg_UnpackTuple(args, "record_counter_init", 2, 2, &arg0, &arg1))
+    return NULL;
+
+  datasize = _cffi_prepare_pointer_call_argument(
+      _cffi_type(48), arg0, (char **)&x0);
+  if (datasize != 0) {
+    x0 = ((size_t)datasize) <= 640 ? (struct record_counter *)alloca((size_t)datasize) : NULL;
+    if (_cffi_convert_array_argument(_cffi_type(48), arg0, (char **)&x0,
+            datasize, &large_args_free) < 0)
+      return NULL;
+  }
+
+  x1 = (_Bool)_cffi_to_c__Bool(arg1);
+  if (x1 == (_Bool)-1 && PyErr_Occurred())
+    return NULL;
+
+  Py_BEGIN_ALLOW_THREADS
+  _cffi_restore_errno();
+  { record_counter_init(x0, x1); }
+  _cffi_save_errno();
+  Py_END_ALLOW_THREADS
+
+  (void)self; /* unused */
+  if (large_args_free != NULL) _cffi_free_array_arguments(large_args_free);
+  Py_INCREF(Py_None);
+  return Py_None;
+}
+#else
+#  define _cffi_f_record_counter_init _cffi_d_record_counter_init
+#endif
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_model_layout(struct model_layout *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->header_end) | 0);  /* check that 'struct model_layout.header_end' is an integer */
+  (void)((p->meta_end) | 0);  /* check that 'struct model_layout.meta_end' is an integer */
+  (void)((p->alph_end) | 0);  /* check that 'struct model_layout.alph_end' is an integer */
+  (void)((p->body_start) | 0);  /* check that 'struct model_layout.body_start' is an integer */
+  (void)((p->body_lines) | 0);  /* check that 'struct model_layout.body_lines' is an integer */
+}
+struct _cffi_align_struct_model_layout { char x; struct model_layout y; };
+
+_CFFI_UNUSED_FN
+static void _cffi_checkfld_struct_record_counter(struct record_counter *p)
+{
+  /* only to generate compile-time warnings or errors */
+  (void)p;
+  (void)((p->count) | 0);  /* check that 'struct record_counter.count' is an integer */
+  (void)((p->line_start) | 0);  /* check that 'struct record_counter.line_start' is an integer */
+  (void)((p->pending) | 0);  /* check that 'struct record_counter.pending' is an integer */
+}
+struct _cffi_align_struct_record_counter { char x; struct record_counter y; };
+
+static const struct _cffi_global_s _cffi_globals[] = {
+  { "meta_scanner_clear", (void *)_cffi_f_meta_scanner_clear, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 44), (void *)_cffi_d_meta_scanner_clear },
+  { "meta_scanner_column", (void *)_cffi_f_meta_scanner_column, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 3), (void *)_cffi_d_meta_scanner_column },
+  { "meta_scanner_del", (void *)_cffi_f_meta_scanner_del, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 44), (void *)_cffi_d_meta_scanner_del },
+  { "meta_scanner_ends", (void *)_cffi_f_meta_scanner_ends, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 33), (void *)_cffi_d_meta_scanner_ends },
+  { "meta_scanner_error", (void *)_cffi_f_meta_scanner_error, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 0), (void *)_cffi_d_meta_scanner_error },
+  { "meta_scanner_feed", (void *)_cffi_f_meta_scanner_feed, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 28), (void *)_cffi_d_meta_scanner_feed },
+  { "meta_scanner_finish", (void *)_cffi_f_meta_scanner_finish, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 25), (void *)_cffi_d_meta_scanner_finish },
+  { "meta_scanner_new", (void *)_cffi_f_meta_scanner_new, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 39), (void *)_cffi_d_meta_scanner_new },
+  { "meta_scanner_nrows", (void *)_cffi_f_meta_scanner_nrows, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 36), (void *)_cffi_d_meta_scanner_nrows },
+  { "meta_scanner_starts", (void *)_cffi_f_meta_scanner_starts, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_O, 33), (void *)_cffi_d_meta_scanner_starts },
+  { "model_layout", (void *)_cffi_f_model_layout, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 8), (void *)_cffi_d_model_layout },
+  { "model_read", (void *)_cffi_f_model_read, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 13), (void *)_cffi_d_model_read },
+  { "record_counter_feed", (void *)_cffi_f_record_counter_feed, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 51), (void *)_cffi_d_record_counter_feed },
+  { "record_counter_init", (void *)_cffi_f_record_counter_init, _CFFI_OP(_CFFI_OP_CPYTHON_BLTN_V, 47), (void *)_cffi_d_record_counter_init },
+};
+
+static const struct _cffi_field_s _cffi_fields[] = {
+  { "header_end", offsetof(struct model_layout, header_end),
+                  sizeof(((struct model_layout *)0)->header_end),
+                  _CFFI_OP(_CFFI_OP_NOOP, 10) },
+  { "meta_end", offsetof(struct model_layout, meta_end),
+                sizeof(((struct model_layout *)0)->meta_end),
+                _CFFI_OP(_CFFI_OP_NOOP, 10) },
+  { "alph_end", offsetof(struct model_layout, alph_end),
+                sizeof(((struct model_layout *)0)->alph_end),
+                _CFFI_OP(_CFFI_OP_NOOP, 10) },
+  { "body_start", offsetof(struct model_layout, body_start),
+                  sizeof(((struct model_layout *)0)->body_start),
+                  _CFFI_OP(_CFFI_OP_NOOP, 10) },
+  { "body_lines", offsetof(struct model_layout, body_lines),
+                  sizeof(((struct model_layout *)0)->body_lines),
+                  _CFFI_OP(_CFFI_OP_NOOP, 10) },
+  { "count", offsetof(struct record_counter, count),
+             sizeof(((struct record_counter *)0)->count),
+             _CFFI_OP(_CFFI_OP_NOOP, 64) },
+  { "line_start", offsetof(struct record_counter, line_start),
+                  sizeof(((struct record_counter *)0)->line_start),
+                  _CFFI_OP(_CFFI_OP_NOOP, 49) },
+  { "pending", offsetof(struct record_counter, pending),
+               sizeof(((struct record_counter *)0)->pending),
+               _CFFI_OP(_CFFI_OP_NOOP, 49) },
+};
+
+static const struct _cffi_struct_union_s _cffi_struct_unions[] = {
+  { "meta_scanner", 61, _CFFI_F_OPAQUE,
+    (size_t)-1, -1, -1, 0 /* opaque */ },
+  { "model_layout", 62, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct model_layout), offsetof(struct _cffi_align_struct_model_layout, y), 0, 5 },
+  { "record_counter", 63, _CFFI_F_CHECK_FIELDS,
+    sizeof(struct record_counter), offsetof(struct _cffi_align_struct_record_counter, y), 5, 3 },
+};
+
+static const struct _cffi_type_context_s _cffi_type_context = {
+  _cffi_types,
+  _cffi_globals,
+  _cffi_fields,
+  _cffi_struct_unions,
+  NULL,  /* no enums */
+  NULL,  /* no typenames */
+  14,  /* num_globals */
+  3,  /* num_struct_unions */
+  0,  /* num_enums */
+  0,  /* num_typenames */
+  NULL,  /* no includes */
+  66,  /* num_types */
+  0,  /* flags */
+};
+
+#ifdef __GNUC__
+#  pragma GCC visibility push(default)  /* for -fvisibility= */
+#endif
+
+#ifdef PYPY_VERSION
+PyMODINIT_FUNC
+_cffi_pypyinit__ffi(const void *p[])
+{
+    p[0] = (const void *)0x2601;
+    p[1] = &_cffi_type_context;
+    return NULL;
+}
+#  ifdef _MSC_VER
+     PyMODINIT_FUNC
+     PyInit__ffi(void) { return NULL; }
+#  endif
+#else
+PyMODINIT_FUNC
+PyInit__ffi(void)
+{
+  return _cffi_init("hmmer_reader._ffi", 0x2601, &_cffi_type_context);
+}
+#endif
+
+#ifdef __GNUC__
+#  pragma GCC visibility pop
+#endif
@@ -6,18 +6,21 @@ from cffi import FFI
 ffibuilder = FFI()
 
 folder = os.path.dirname(os.path.abspath(__file__))
+modules = ["meta_read", "model_read", "record_count"]
 
-with open(join(folder, "hmmer_reader", "meta_read.h"), "r") as f:
-    ffibuilder.cdef(f.read())
+for mod in modules:
+    with open(join(folder, "hmmer_reader", f"{mod}.h"), "r") as f:
+        ffibuilder.cdef(f.read())
 
-with open(join(folder, "hmmer_reader", "meta_read.c"), "r") as f:
-    read_metadata_c = f.read()
+sources = []
+for mod in modules:
+    with open(join(folder, "hmmer_reader", f"{mod}.c"), "r") as f:
+        sources.append(f.read())
 
 ffibuilder.set_source(
     "hmmer_reader._ffi",
-    fr"""
-    {read_metadata_c}
-    """,
+    "\n".join(sources),
+    include_dirs=[join(folder, "hmmer_reader")],
     language="c",
 )
 
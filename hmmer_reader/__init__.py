@@ -1,9 +1,17 @@
 from importlib import import_module as _import_module
 
 from . import data
-from ._cli import cli
-from ._misc import fetch_metadata, num_models
+from ._async import AsyncHMMERParser, open_hmmer_async
+from ._bench import bench, synthetic_hmm
+from ._cli import cli, cli_bench, cli_dump, cli_export
+from ._export import dump_table, export_models
+from ._index import build_index, fetch_index
+from ._misc import fetch_metadata, fetch_metadata_many, iter_metadata, num_models
+from ._parallel import parallel_read_models
 from ._reader import HMMERModel, HMMERParser, ParsingError, open_hmmer
+from ._score import encode_sequences, ungapped_scores, viterbi_scores
+from ._shared import SharedModelStore
+from ._stats import ParseStats
 from ._testit import test
 
 try:
@@ -24,14 +32,33 @@ except ModuleNotFoundError:
     __version__ = "x.x.x"
 
 __all__ = [
+    "AsyncHMMERParser",
     "HMMERModel",
     "HMMERParser",
+    "ParseStats",
     "ParsingError",
+    "SharedModelStore",
     "__version__",
+    "bench",
+    "build_index",
     "cli",
+    "cli_bench",
+    "cli_dump",
+    "cli_export",
     "data",
+    "dump_table",
+    "encode_sequences",
+    "export_models",
+    "fetch_index",
     "fetch_metadata",
+    "fetch_metadata_many",
+    "iter_metadata",
     "num_models",
     "open_hmmer",
+    "open_hmmer_async",
+    "parallel_read_models",
+    "synthetic_hmm",
     "test",
+    "ungapped_scores",
+    "viterbi_scores",
 ]
@@ -0,0 +1,194 @@
+import asyncio
+import pathlib
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from functools import partial
+from typing import IO, Optional, Union
+
+import numpy as np
+
+from ._reader import HMMERModel, HMMERParser
+
+__all__ = ["AsyncHMMERParser", "open_hmmer_async"]
+
+
+class AsyncHMMERParser:
+    """
+    HMMER file parser for asyncio.
+
+    Reading and parsing run in an executor, so the event loop is not blocked.
+    The next models are read ahead of time, up to ``prefetch`` of them.
+
+    Parameters
+    ----------
+    file
+        File path or stream.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    prefetch
+        Number of models read ahead. Defaults to ``2``.
+    executor
+        Executor running the reads, ``None`` meaning the default executor of
+        the event loop. The reads of a parser never overlap, whatever the
+        number of threads of the executor. Defaults to ``None``.
+    memory_map
+        See :class:`hmmer_reader.HMMERParser`. Defaults to ``False``.
+    lazy
+        See :class:`hmmer_reader.HMMERParser`. Defaults to ``False``.
+    cache
+        See :class:`hmmer_reader.HMMERParser`. Defaults to ``False``.
+    """
+
+    def __init__(
+        self,
+        file: Union[str, pathlib.Path, IO[str]],
+        dtype=np.float64,
+        prefetch: int = 2,
+        executor: Optional[Executor] = None,
+        memory_map: bool = False,
+        lazy: bool = False,
+        cache: Union[bool, str, pathlib.Path] = False,
+    ):
+        self._open = partial(HMMERParser, file, dtype, 1, memory_map, lazy, cache)
+        self._parser: Optional[HMMERParser] = None
+        self._prefetch = max(prefetch, 1)
+        self._executor = executor
+        self._lock = threading.Lock()
+        # Pending reads, and their results in file order.
+        self._reads: deque = deque()
+        self._results: deque = deque()
+
+    async def open(self):
+        """
+        Open the file, if not done yet.
+        """
+        if self._parser is None:
+            self._parser = await self._run(self._open)
+
+    async def read_model(self) -> HMMERModel:
+        """
+        Get the next model.
+
+        Raises
+        ------
+        StopAsyncIteration
+            At the end of the file.
+        """
+        await self.open()
+
+        while len(self._reads) < self._prefetch:
+            self._reads.append(self._submit(self._read))
+
+        await self._reads.popleft()
+        # Reads complete in any order but store their results in file order.
+        result = self._results.popleft()
+
+        if isinstance(result, BaseException):
+            raise result
+        if result is None:
+            raise StopAsyncIteration
+        return result
+
+    async def get(self, acc: str) -> HMMERModel:
+        """
+        Get a model by its accession. See :meth:`hmmer_reader.HMMERParser.get`.
+        """
+        await self.open()
+        return await self._run(self._locked, self._parser.get, acc)
+
+    async def get_by_name(self, name: str) -> HMMERModel:
+        """
+        Get a model by its name.
+        """
+        await self.open()
+        return await self._run(self._locked, self._parser.get_by_name, name)
+
+    async def close(self):
+        """
+        Wait for the pending reads and close the file.
+        """
+        while len(self._reads) > 0:
+            await self._reads.popleft()
+        self._results.clear()
+
+        if self._parser is not None:
+            await self._run(self._locked, self._parser.close)
+            self._parser = None
+
+    def _read(self):
+        with self._lock:
+            try:
+                self._results.append(self._parser.read_model())
+            except StopIteration:
+                self._results.append(None)
+            except Exception as e:
+                self._results.append(e)
+
+    def _locked(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def _submit(self, func, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def _run(self, func, *args):
+        return await self._submit(func, *args)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> HMMERModel:
+        return await self.read_model()
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        await self.close()
+
+
+def open_hmmer_async(
+    file: Union[str, pathlib.Path, IO[str]],
+    dtype=np.float64,
+    prefetch: int = 2,
+    executor: Optional[Executor] = None,
+    memory_map: bool = False,
+    lazy: bool = False,
+    cache: Union[bool, str, pathlib.Path] = False,
+) -> AsyncHMMERParser:
+    """
+    Open a HMMER file for asyncio.
+
+    Use it as ``async with open_hmmer_async(filepath) as parser`` and iterate
+    over the models with ``async for``.
+
+    Parameters
+    ----------
+    file
+        File path or IO stream.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    prefetch
+        Number of models read ahead. Defaults to ``2``.
+    executor
+        Executor running the reads, ``None`` meaning the default executor of
+        the event loop. Defaults to ``None``.
+    memory_map
+        See :func:`hmmer_reader.open_hmmer`. Defaults to ``False``.
+    lazy
+        See :func:`hmmer_reader.open_hmmer`. Defaults to ``False``.
+    cache
+        See :func:`hmmer_reader.open_hmmer`. Defaults to ``False``.
+
+    Returns
+    -------
+    parser
+        Asynchronous HMMER parser.
+    """
+    return AsyncHMMERParser(file, dtype, prefetch, executor, memory_map, lazy, cache)
@@ -0,0 +1,318 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+__all__ = ["bench", "synthetic_hmm"]
+
+SYMBOLS = {"amino": "ACDEFGHIKLMNPQRSTVWY", "DNA": "ACGT"}
+
+CASES = [
+    "parse",
+    "fetch_metadata",
+    "num_models",
+    "match_access",
+    "cli_length",
+    "cli_select",
+]
+
+
+def synthetic_hmm(
+    filepath: Path,
+    nmodels: int = 1000,
+    M: int = 200,
+    alphabet: str = "amino",
+    seed: int = 0,
+) -> Path:
+    """
+    Write a HMMER3 ASCII file of random models.
+
+    Emission and transition probabilities are drawn from flat Dirichlet
+    distributions. Models are named ``SYNTH<i>`` with accessions ``SY<i>.1``.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    nmodels
+        Number of models. Defaults to ``1000``.
+    M
+        Length of every model. Defaults to ``200``.
+    alphabet
+        ``"amino"`` or ``"DNA"``. Defaults to ``"amino"``.
+    seed
+        Random seed. Defaults to ``0``.
+
+    Returns
+    -------
+    filepath
+        File path.
+    """
+    if alphabet not in SYMBOLS:
+        raise ValueError(f"Unknown alphabet {alphabet}.")
+
+    filepath = Path(filepath)
+    rng = np.random.default_rng(seed)
+    with open(filepath, "w") as file:
+        for i in range(nmodels):
+            file.write(_synthetic_model(rng, i, M, alphabet))
+    return filepath
+
+
+def _synthetic_model(rng: np.random.Generator, i: int, M: int, alphabet: str) -> str:
+    symbols = SYMBOLS[alphabet]
+    K = len(symbols)
+    lines = [
+        "HMMER3/f [3.1b2 | February 2015]",
+        f"NAME  SYNTH{i}",
+        f"ACC   SY{i}.1",
+        f"DESC  Synthetic model {i}",
+        f"LENG  {M}",
+        f"ALPH  {alphabet}",
+        "RF    no",
+        "MM    no",
+        "CONS  yes",
+        "CS    no",
+        "MAP   yes",
+        "DATE  Thu Jan  1 00:00:00 2015",
+        f"NSEQ  {10 + i % 90}",
+        "EFFN  10.000000",
+        f"CKSUM {rng.integers(2 ** 32)}",
+        "GA    25.00 25.00;",
+        "TC    25.00 25.00;",
+        "NC    24.00 24.00;",
+        "STATS LOCAL MSV       -9.9559  0.70785",
+        "STATS LOCAL VITERBI  -10.7765  0.70785",
+        "STATS LOCAL FORWARD   -4.2017  0.70785",
+        "HMM     " + "".join(f"     {a}   " for a in symbols),
+        "            m->m     m->i     m->d     i->m     i->i     d->m     d->d",
+    ]
+
+    match = -np.log(rng.dirichlet(np.ones(K), M + 1))
+    insert = -np.log(rng.dirichlet(np.ones(K), M + 1))
+    trans = np.empty((M + 1, 7), dtype=object)
+    trans[:, :3] = -np.log(rng.dirichlet(np.ones(3), M + 1))
+    trans[:, 3:5] = -np.log(rng.dirichlet(np.ones(2), M + 1))
+    trans[:, 5:] = -np.log(rng.dirichlet(np.ones(2), M + 1))
+    # No delete state at the begin node, and no next node after the last one.
+    trans[0, 5:] = [0.0, "*"]
+    trans[M, :2] = -np.log(rng.dirichlet(np.ones(2)))
+    trans[M, 2] = "*"
+    trans[M, 5:] = [0.0, "*"]
+
+    values = " %8.5f" * K
+    lines.append("  COMPO " + values % tuple(match[0]))
+    for k in range(M + 1):
+        if k > 0:
+            cons = symbols[match[k].argmin()]
+            lines.append(
+                f" {k:6d} " + values % tuple(match[k]) + f" {k:6d} {cons} - - -"
+            )
+        lines.append(" " * 8 + values % tuple(insert[k]))
+        lines.append(" " * 8 + "".join(_trans_value(v) for v in trans[k]))
+    lines.append("//")
+    return "\n".join(lines) + "\n"
+
+
+def _trans_value(v) -> str:
+    return f" {v:>8s}" if isinstance(v, str) else f" {v:8.5f}"
+
+
+def bench(
+    filepath: Optional[Path] = None,
+    nmodels: int = 1000,
+    M: int = 200,
+    alphabet: str = "amino",
+    cases: Optional[List[str]] = None,
+    repeat: int = 3,
+    baseline: Optional[Path] = None,
+    save: Optional[Path] = None,
+) -> List[Dict]:
+    """
+    Time parsing, metadata scanning and access patterns.
+
+    The cases are ``"parse"`` (iteration over :class:`hmmer_reader.HMMERParser`),
+    ``"fetch_metadata"``, ``"num_models"``, ``"match_access"`` (``match(i)``
+    of every node of every parsed model), ``"cli_length"`` (``hmmer-show
+    --length``) and ``"cli_select"`` (``hmmer-show --name <last model>
+    --match 1``, the file index being built beforehand, next to a copy of
+    ``filepath`` if given). Each case runs in a new process, so that its peak
+    resident memory is its own. The best time of ``repeat`` runs is kept.
+
+    Parameters
+    ----------
+    filepath
+        HMMER file to run on. Defaults to a synthetic file written by
+        :func:`synthetic_hmm` in a temporary directory.
+    nmodels
+        Number of models of the synthetic file. Defaults to ``1000``.
+    M
+        Model length of the synthetic file. Defaults to ``200``.
+    alphabet
+        Alphabet of the synthetic file. Defaults to ``"amino"``.
+    cases
+        Cases to run. Defaults to all of them.
+    repeat
+        Number of runs of each case. Defaults to ``3``.
+    baseline
+        Results file saved by a previous run. Each result then has the ratio
+        of its time to the baseline time.
+    save
+        Save the results to this file, to be used as a baseline.
+
+    Returns
+    -------
+    results
+        One dictionary per case with its ``name``, ``seconds``, ``mb_s``
+        (megabytes of HMMER file per second), ``models_s`` (models per
+        second), ``peak_rss_mb`` (``None`` where not available) and, given a
+        baseline, ``ratio``.
+    """
+    if cases is None:
+        cases = CASES
+    for case in cases:
+        if case not in CASES:
+            raise ValueError(f"Unknown benchmark case {case}.")
+
+    params = OrderedDict(nmodels=nmodels, M=M, alphabet=alphabet)
+    if filepath is not None:
+        params = OrderedDict(file=Path(filepath).name)
+
+    base = None
+    if baseline is not None:
+        with open(baseline, "r") as file:
+            base = json.load(file)
+        if base["params"] != params:
+            raise ValueError("The baseline was run with other parameters.")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if filepath is None:
+            filepath = synthetic_hmm(
+                Path(tmpdir) / "synthetic.hmm", nmodels, M, alphabet
+            )
+        elif "cli_select" in cases:
+            # The index file of cli_select is written next to a copy.
+            filepath = Path(shutil.copy(filepath, tmpdir))
+
+        results = []
+        for case in cases:
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                result = executor.submit(
+                    _run_case, case, str(filepath), repeat
+                ).result()
+            if base is not None and case in base["results"]:
+                result["ratio"] = result["seconds"] / base["results"][case]["seconds"]
+            results.append(result)
+
+    if save is not None:
+        data = {"params": params, "results": {r["name"]: r for r in results}}
+        with open(save, "w") as file:
+            json.dump(data, file, indent=2)
+
+    return results
+
+
+def _run_case(case: str, filepath: str, repeat: int) -> Dict:
+    run = globals()[f"_case_{case}"]
+    size = os.stat(filepath).st_size
+
+    seconds = np.inf
+    for _ in range(max(repeat, 1)):
+        elapsed, nmodels = run(Path(filepath))
+        seconds = min(seconds, elapsed)
+
+    seconds = max(seconds, 1e-9)
+    return OrderedDict(
+        name=case,
+        seconds=seconds,
+        mb_s=size / seconds / 1e6,
+        models_s=nmodels / seconds,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Kilobytes, but bytes on macOS.
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _case_parse(filepath: Path) -> Tuple[float, int]:
+    from ._reader import open_hmmer
+
+    start = time.perf_counter()
+    with open_hmmer(filepath) as hmmfile:
+        nmodels = sum(1 for _ in hmmfile)
+    return time.perf_counter() - start, nmodels
+
+
+def _case_fetch_metadata(filepath: Path) -> Tuple[float, int]:
+    from ._misc import fetch_metadata
+
+    start = time.perf_counter()
+    nmodels = len(fetch_metadata(filepath))
+    return time.perf_counter() - start, nmodels
+
+
+def _case_num_models(filepath: Path) -> Tuple[float, int]:
+    from ._misc import num_models
+
+    start = time.perf_counter()
+    nmodels = num_models(filepath)
+    return time.perf_counter() - start, nmodels
+
+
+def _case_match_access(filepath: Path) -> Tuple[float, int]:
+    from ._reader import open_hmmer
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = list(hmmfile)
+
+    start = time.perf_counter()
+    for hmm in hmms:
+        for i in range(hmm.M + 1):
+            hmm.match(i)
+    return time.perf_counter() - start, len(hmms)
+
+
+def _case_cli_length(filepath: Path) -> Tuple[float, int]:
+    from ._misc import num_models
+
+    nmodels = num_models(filepath)
+    start = time.perf_counter()
+    _show(filepath, "--length")
+    return time.perf_counter() - start, nmodels
+
+
+def _case_cli_select(filepath: Path) -> Tuple[float, int]:
+    from ._index import fetch_index
+
+    name = fetch_index(filepath)["NAME"].iloc[-1]
+    start = time.perf_counter()
+    _show(filepath, "--name", name, "--match", "1")
+    return time.perf_counter() - start, 1
+
+
+def _show(filepath: Path, *args: str):
+    cmd = [sys.executable, "-c", "import hmmer_reader; hmmer_reader.cli()"]
+    subprocess.run(
+        cmd + [str(filepath)] + list(args), check=True, stdout=subprocess.DEVNULL
+    )
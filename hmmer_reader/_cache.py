@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import IO, List, Optional, Union
+
+import numpy as np
+
+from ._io import BLOCK_SIZE
+from ._reader import TRANS_DEF, HMMERModel, open_hmmer
+
+__all__ = ["cache_filepath", "cached_models"]
+
+CACHE_SUFFIX = ".cache"
+CACHE_MAGIC = b"HMMRCACHE\x01"
+CACHE_DTYPE = np.dtype("<f8")
+
+
+def cache_filepath(filepath: Path, cache_dir: Optional[Path] = None) -> Path:
+    """
+    Cache file path of a HMMER file.
+
+    The cache file sits next to the HMMER file unless a cache directory is
+    given, in which case its name also carries a digest of the absolute HMMER
+    file path so that files of the same name do not collide.
+    """
+    filepath = Path(filepath)
+    if cache_dir is None:
+        return filepath.with_name(filepath.name + CACHE_SUFFIX)
+
+    key = hashlib.blake2b(str(filepath.resolve()).encode(), digest_size=8)
+    return Path(cache_dir) / f"{filepath.name}.{key.hexdigest()}{CACHE_SUFFIX}"
+
+
+def cached_models(
+    filepath: Path,
+    cache: Union[bool, str, Path] = True,
+    dtype=np.float64,
+    workers: Optional[int] = 1,
+) -> List[HMMERModel]:
+    """
+    Models of a HMMER file, read from its binary cache when it is up to date.
+
+    The cache is up to date when it records the size of the HMMER file and
+    either its modification time or, failing that, its content hash, in which
+    case the new modification time is recorded. Otherwise the HMMER file is
+    parsed and the cache written again, if possible.
+
+    The cache file starts with ``CACHE_MAGIC``, followed by the little-endian
+    64-bit length of a JSON header holding the file key and the header,
+    metadata, alphabet and length of each model. The model matrices follow as
+    a single array of little-endian doubles, aligned to 8 bytes: for each
+    model, its composition, match, insert and transition matrices.
+
+    Parameters
+    ----------
+    filepath
+        HMMER file path.
+    cache
+        ``True`` to keep the cache next to the HMMER file, or the cache
+        directory. Defaults to ``True``.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    workers
+        Number of processes used to parse a HMMER file that is not cached.
+        Defaults to ``1``.
+
+    Returns
+    -------
+    models
+        Fully parsed models, in file order.
+    """
+    filepath = Path(filepath)
+    cachepath = cache_filepath(filepath, None if cache is True else Path(cache))
+    key = _file_key(filepath)
+
+    loaded = _read_cache(cachepath, filepath, key)
+    if loaded is not None:
+        return _unpack(*loaded, dtype)
+
+    header, data = _build_cache(filepath, key, workers)
+    try:
+        _write_cache(cachepath, header, data)
+    except OSError:
+        pass
+    return _unpack(header, data, dtype)
+
+
+def _file_key(filepath: Path) -> dict:
+    stat = filepath.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": None}
+
+
+def _build_cache(filepath: Path, key: dict, workers: Optional[int]):
+    with open_hmmer(filepath, workers=workers) as hmmfile:
+        header, data = _pack(list(hmmfile))
+
+    if key["hash"] is None:
+        key["hash"] = _file_hash(filepath)
+    header.update(key)
+    return header, data
+
+
+def _pack(models: List[HMMERModel]):
+    descs = []
+    arrays = []
+    for hmm in models:
+        descs.append([hmm.header, hmm.metadata, hmm.alphabet, hmm.M])
+        arrays += [
+            hmm.compo_vector,
+            hmm.match_matrix.ravel(),
+            hmm.insert_matrix.ravel(),
+            hmm.trans_matrix.ravel(),
+        ]
+    data = np.concatenate(arrays + [np.empty(0)]).astype(CACHE_DTYPE, copy=False)
+    return {"models": descs}, data
+
+
+def _unpack(header: dict, data: np.ndarray, dtype) -> List[HMMERModel]:
+    data = data.astype(dtype, copy=False)
+    T = len(TRANS_DEF)
+
+    models = []
+    offset = 0
+    for hdr, metadata, alphabet, M in header["models"]:
+        K = len(alphabet)
+        sizes = [K, (M + 1) * K, (M + 1) * K, (M + 1) * T]
+        ends = np.cumsum(sizes) + offset
+        compo, match, insert, trans = np.split(
+            data[offset : ends[-1]], ends[:-1] - offset
+        )
+        offset = ends[-1]
+
+        metadata = [(k, v) for k, v in metadata]
+        hmm = HMMERModel._from_arrays(
+            hdr,
+            metadata,
+            alphabet,
+            compo,
+            match.reshape(M + 1, K),
+            insert.reshape(M + 1, K),
+            trans.reshape(M + 1, T),
+        )
+        models.append(hmm)
+
+    return models
+
+
+def _read_cache(cachepath: Path, filepath: Path, key: dict):
+    checked = _check_cache(cachepath, filepath, key)
+    if checked is None:
+        return None
+
+    header, offset = checked
+    try:
+        with open(cachepath, "rb") as file:
+            file.seek(offset)
+            data = np.fromfile(file, dtype=CACHE_DTYPE)
+    except (OSError, ValueError):
+        return None
+
+    if data.shape[0] != _model_sizes(header).sum():
+        return None
+    return header, data
+
+
+def _check_cache(cachepath: Path, filepath: Path, key: dict):
+    """
+    Header and data offset of a cache file, if up to date.
+    """
+    try:
+        with open(cachepath, "rb") as file:
+            header = _read_header(file)
+            if header is None or header["size"] != key["size"]:
+                return None
+
+            touched = header["mtime_ns"] != key["mtime_ns"]
+            if touched:
+                # Touched or copied: still valid if the content is the same.
+                key["hash"] = _file_hash(filepath)
+                if header["hash"] != key["hash"]:
+                    return None
+
+            end = file.tell()
+            offset = _align(end)
+            size = os.fstat(file.fileno()).st_size
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if size - offset != _model_sizes(header).sum() * CACHE_DTYPE.itemsize:
+        return None
+
+    if touched:
+        # Record the new modification time, so that the file is not hashed again.
+        header["mtime_ns"] = key["mtime_ns"]
+        _rewrite_header(cachepath, header, end)
+    return header, offset
+
+
+def _model_sizes(header: dict) -> np.ndarray:
+    """
+    Number of values of each model.
+    """
+    sizes = [
+        len(alphabet) * (2 * M + 3) + len(TRANS_DEF) * (M + 1)
+        for _, _, alphabet, M in header["models"]
+    ]
+    return np.array(sizes, dtype=np.int64)
+
+
+def _read_header(file: IO[bytes]) -> Optional[dict]:
+    if file.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+        return None
+    size = file.read(8)
+    if len(size) != 8:
+        return None
+    return json.loads(file.read(struct.unpack("<Q", size)[0]).decode())
+
+
+def _rewrite_header(cachepath: Path, header: dict, end: int):
+    """
+    Rewrite the JSON header of a cache file in place, if it fits.
+
+    The header is padded with spaces up to its former ``end`` offset.
+    """
+    start = len(CACHE_MAGIC) + 8
+    content = json.dumps(header).encode()
+    if len(content) > end - start:
+        return
+    try:
+        with open(cachepath, "r+b") as file:
+            file.seek(start)
+            file.write(content.ljust(end - start))
+    except OSError:
+        pass
+
+
+def _write_cache(cachepath: Path, header: dict, data: np.ndarray):
+    content = json.dumps(header).encode()
+    prefix = CACHE_MAGIC + struct.pack("<Q", len(content)) + content
+    prefix += b"\0" * (_align(len(prefix)) - len(prefix))
+
+    cachepath.parent.mkdir(parents=True, exist_ok=True)
+    tmppath = cachepath.with_name(cachepath.name + ".tmp")
+    with open(tmppath, "wb") as file:
+        file.write(prefix)
+        data.tofile(file)
+    os.replace(tmppath, cachepath)
+
+
+def _file_hash(filepath: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
@@ -1,14 +1,27 @@
+import sys
+
 import click
 
 from ._click import command
 
+# Symbols of the HMMER alphabet types, in file order.
+ALPHABETS = {
+    "amino": "ACDEFGHIKLMNPQRSTVWY",
+    "DNA": "ACGT",
+    "RNA": "ACGU",
+    "coins": "HT",
+    "dice": "123456",
+}
+
 
 @click.command(
-    cls=command(either=[("alphabet", "length", "match", "insert")]),
+    cls=command(either=[("alphabet", "length", "match", "insert"), ("name", "acc")]),
     context_settings=dict(help_option_names=["-h", "--help"]),
 )
 @click.version_option()
 @click.argument("filepath", type=click.Path(exists=True, dir_okay=False))
+@click.option("--name", help="Select the model of the given name.", default=None)
+@click.option("--acc", help="Select the model of the given accession.", default=None)
 @click.option("--alphabet", help="Show the alphabet.", is_flag=True, default=None)
 @click.option("--length", help="Show the model length.", is_flag=True, default=None)
 @click.option(
@@ -21,40 +34,247 @@ from ._click import command
 @click.option(
     "--log/--no-log", help="Show probabilities in log space: log(p).", default=False
 )
-def cli(filepath, alphabet, length, match, insert, sort, log):
+@click.option(
+    "--stats",
+    help="Show model parse statistics on the standard error.",
+    is_flag=True,
+)
+def cli(filepath, name, acc, alphabet, length, match, insert, sort, log, stats):
     """
     Show information about HMMER files.
+
+    The alphabet and length are read from the model headers only. A model
+    selected by --name or --acc is located through the file index, so only
+    its record is read.
     """
     from ._reader import open_hmmer
 
-    with open_hmmer(filepath) as hmmfile:
-        for hmmprof in hmmfile:
-            if all([not alphabet, not length, match is None, insert is None]):
-                print(hmmprof)
-            elif alphabet:
-                print(hmmprof.alphabet)
-            elif length:
-                print(hmmprof.M)
-            elif match is not None:
-                show(hmmprof.alphabet, hmmprof.match, match, sort, log)
+    if alphabet or length:
+        if stats:
+            # Nothing is parsed: the header lines are only scanned.
+            raise click.UsageError(
+                "--stats cannot be used with --alphabet or --length."
+            )
+
+        for row in _metadata(filepath, name, acc).itertuples():
+            if alphabet:
+                print(_symbols(row.ALPH))
+            else:
+                print(row.LENG)
+            print()
+        return
+
+    with open_hmmer(filepath, lazy=True, stats=stats) as hmmfile:
+        if name is None and acc is None:
+            hmmprofs = iter(hmmfile)
+        else:
+            hmmprofs = [_select(hmmfile, name, acc)]
+
+        for hmmprof in hmmprofs:
+            if match is not None:
+                show(hmmprof, "match", match, sort, log)
             elif insert is not None:
-                show(hmmprof.alphabet, hmmprof.insert, insert, sort, log)
+                show(hmmprof, "insert", insert, sort, log)
+            else:
+                print(hmmprof)
             print()
 
+        if stats:
+            click.echo(str(hmmfile.stats), err=True)
+
 
-def show(alphabet, node, idx, sort, log_space):
-    from math import exp
+def _metadata(filepath, name, acc):
+    from ._reader import ParsingError
 
     try:
-        values = [(a, node(idx)[a]) for a in alphabet]
+        if name is None and acc is None:
+            from ._misc import fetch_metadata
+
+            return fetch_metadata(filepath, ["LENG", "ALPH"])
+
+        from ._index import _find_model, _model_lookup, fetch_index
+
+        df = fetch_index(filepath)
+    except ParsingError as e:
+        raise click.ClickException(str(e))
+
+    # The same lookup as HMMERParser.get and get_by_name.
+    lookup = _model_lookup(df["NAME"].tolist(), df["ACC"].tolist())
+    try:
+        return df.iloc[[_find_model(lookup, name, acc)]]
+    except KeyError:
+        raise click.ClickException(f"Model {name or acc} not found.")
+
+
+def _select(hmmfile, name, acc):
+    from ._reader import ParsingError
+
+    try:
+        if name is not None:
+            return hmmfile.get_by_name(name)
+        return hmmfile.get(acc)
+    except KeyError:
+        raise click.ClickException(f"Model {name or acc} not found.")
+    except ParsingError as e:
+        raise click.ClickException(str(e))
+
+
+def _symbols(alph: str) -> str:
+    try:
+        return ALPHABETS[alph]
+    except KeyError:
+        raise click.ClickException(f"Unknown alphabet {alph}.")
+
+
+def show(hmmprof, name, idx, sort, log_space):
+    if log_space:
+        matrix = getattr(hmmprof, f"{name}_matrix")
+    else:
+        matrix = hmmprof.prob_matrix(name)
+
+    try:
+        values = list(zip(hmmprof.alphabet, matrix[idx].tolist()))
     except IndexError:
         raise click.ClickException(f"Index {idx} is higher than the model length.")
 
-    if not log_space:
-        values = [(v[0], exp(v[1])) for v in values]
-
     if sort:
         values = sorted(values, key=lambda x: x[1], reverse=not log_space)
 
     for a, b in values:
         print(f"{a} {b:.18f}")
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option()
+@click.argument("filepath", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path(file_okay=False))
+@click.option(
+    "--format",
+    help="Output format.",
+    type=click.Choice(["parquet", "arrow", "npz"]),
+    default="parquet",
+)
+@click.option("--workers", help="Number of parsing processes.", type=int, default=1)
+def cli_export(filepath, output, format, workers):
+    """
+    Export all models of a HMMER file to columnar tables.
+    """
+    from ._export import export_models
+
+    try:
+        export_models(filepath, output, format, workers)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option()
+@click.argument("filepath", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output", type=click.Path(dir_okay=False, allow_dash=True), default="-")
+@click.option(
+    "--table",
+    help="Table to dump.",
+    type=click.Choice(["match", "insert", "trans", "metadata"]),
+    default="match",
+)
+@click.option(
+    "--format",
+    help="Output format.",
+    type=click.Choice(["tsv", "csv", "npy", "parquet"]),
+    default="tsv",
+)
+@click.option("--name", help="Select the model of the given name.", multiple=True)
+@click.option("--acc", help="Select the model of the given accession.", multiple=True)
+@click.option(
+    "--log/--no-log", help="Show probabilities in log space: log(p).", default=False
+)
+def cli_dump(filepath, output, table, format, name, acc, log):
+    """
+    Dump a whole table of the models of a HMMER file.
+
+    OUTPUT defaults to the standard output for TSV and CSV.
+    """
+    from ._export import dump_table
+
+    if output == "-":
+        if format not in ("tsv", "csv"):
+            raise click.ClickException(f"Writing {format} files requires a file path.")
+        output = sys.stdout
+
+    try:
+        dump_table(filepath, output, table, format, name, acc, log)
+    except KeyError as e:
+        raise click.ClickException(f"Model {e.args[0]} not found.")
+    except (RuntimeError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+
+@click.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.version_option()
+@click.option(
+    "--file",
+    "filepath",
+    help="HMMER file to run on instead of a synthetic one.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option("--models", help="Number of synthetic models.", type=int, default=1000)
+@click.option("--length", help="Length of the synthetic models.", type=int, default=200)
+@click.option(
+    "--alphabet",
+    help="Alphabet of the synthetic models.",
+    type=click.Choice(["amino", "DNA"]),
+    default="amino",
+)
+@click.option("--case", help="Benchmark case to run.", multiple=True)
+@click.option("--repeat", help="Number of runs of each case.", type=int, default=3)
+@click.option(
+    "--baseline",
+    help="Compare to the results saved by a previous run.",
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option("--save", help="Save the results.", type=click.Path(dir_okay=False))
+@click.option(
+    "--max-ratio",
+    help="Fail if a case is slower than the baseline by more than this factor.",
+    type=float,
+)
+def cli_bench(
+    filepath, models, length, alphabet, case, repeat, baseline, save, max_ratio
+):
+    """
+    Benchmark parsing, metadata scanning and access patterns.
+    """
+    from ._bench import bench
+
+    try:
+        results = bench(
+            filepath,
+            models,
+            length,
+            alphabet,
+            list(case) if case else None,
+            repeat,
+            baseline,
+            save,
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    print(
+        f"{'case':<16}{'seconds':>10}{'MB/s':>10}{'models/s':>12}{'RSS MB':>9}", end=""
+    )
+    print(f"{'ratio':>8}" if baseline else "")
+    for r in results:
+        rss = "-" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:.1f}"
+        print(
+            f"{r['name']:<16}{r['seconds']:>10.4f}{r['mb_s']:>10.1f}"
+            f"{r['models_s']:>12.1f}{rss:>9}",
+            end="",
+        )
+        print(f"{r['ratio']:>8.2f}" if "ratio" in r else "")
+
+    if max_ratio is None:
+        return
+    slower = [r["name"] for r in results if r.get("ratio", 0) > max_ratio]
+    if len(slower) > 0:
+        raise click.ClickException(f"Slower than the baseline: {', '.join(slower)}.")
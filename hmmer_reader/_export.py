@@ -0,0 +1,474 @@
+import re
+from itertools import chain
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from pandas import DataFrame
+
+from ._reader import TRANS_DEF, HMMERModel, open_hmmer
+
+__all__ = ["dump_table", "export_models"]
+
+FORMATS = ("parquet", "arrow", "npz")
+
+DUMP_TABLES = ("match", "insert", "trans", "metadata")
+
+DUMP_FORMATS = ("tsv", "csv", "npy", "parquet")
+
+# Format of text values, enough for the five decimals of the HMMER files.
+FLOAT_FORMAT = "%.9g"
+
+MODEL_FIELDS = ["NAME", "ACC", "DESC", "ALPH"]
+
+
+def export_models(
+    filepath: Path,
+    output: Path,
+    format: str = "parquet",
+    workers: Optional[int] = 1,
+    batch_size: int = 256,
+):
+    """
+    Export all models of a HMMER file to a columnar format.
+
+    Two tables are written to the output directory, ``models.<format>`` and
+    ``nodes.<format>``. The models table has one row per model with the
+    columns MODEL, NAME, ACC, DESC, ALPH, ALPHABET, M and the [NODE_START,
+    NODE_END) row range of its nodes. The nodes table has one row per node
+    (node 0 being the begin node) with the columns MODEL, NODE, MATCH and
+    INSERT (lists of log-probabilities in alphabet order) and one column per
+    transition, MM to DD.
+
+    Parquet and Arrow IPC files are written in batches of models and require
+    the ``pyarrow`` package. NumPy archives cannot hold list columns: MATCH
+    and INSERT are stored flattened, node ``i`` spanning the values
+    ``OFFSET[i]`` to ``OFFSET[i + 1]``.
+
+    Parameters
+    ----------
+    filepath
+        HMMER file path.
+    output
+        Output directory, created if needed.
+    format
+        ``"parquet"``, ``"arrow"`` or ``"npz"``. Defaults to ``"parquet"``.
+    workers
+        Number of processes used to parse the models. Defaults to ``1``.
+    batch_size
+        Number of models per written batch. Defaults to ``256``.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format}.")
+
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    if format == "npz":
+        writer = _NpzWriter(output)
+    else:
+        writer = _ArrowWriter(output, format)
+
+    nmodels = 0
+    nnodes = 0
+    with open_hmmer(filepath, workers=workers) as hmmfile:
+        batch: List[HMMERModel] = []
+        for hmm in hmmfile:
+            batch.append(hmm)
+            if len(batch) == batch_size:
+                writer.write(*model_tables(batch, nmodels, nnodes))
+                nmodels += len(batch)
+                nnodes += sum(hmm.M + 1 for hmm in batch)
+                batch = []
+
+        if len(batch) > 0 or nmodels == 0:
+            writer.write(*model_tables(batch, nmodels, nnodes))
+
+    writer.close()
+
+
+def model_tables(models: List[HMMERModel], first_model: int = 0, first_node: int = 0):
+    """
+    Columns of the models and nodes tables for a list of models.
+
+    MATCH and INSERT are returned flattened, with the OFFSET column holding
+    the position of each node within them (starting at zero).
+
+    Parameters
+    ----------
+    models
+        Models.
+    first_model
+        Index of the first model. Defaults to ``0``.
+    first_node
+        Row of the first node in the whole nodes table. Defaults to ``0``.
+
+    Returns
+    -------
+    models
+        Dictionary of models table columns.
+    nodes
+        Dictionary of nodes table columns.
+    """
+    nrows = np.array([hmm.M + 1 for hmm in models], np.int64)
+    node_end = first_node + np.cumsum(nrows)
+
+    mtable: Dict[str, np.ndarray] = {}
+    mtable["MODEL"] = np.arange(first_model, first_model + len(models), dtype=np.int64)
+    for field in MODEL_FIELDS:
+        mtable[field] = np.array(
+            [dict(hmm.metadata).get(field, "") for hmm in models], dtype=object
+        )
+    mtable["ALPHABET"] = np.array([hmm.alphabet for hmm in models], dtype=object)
+    mtable["M"] = nrows - 1
+    mtable["NODE_START"] = node_end - nrows
+    mtable["NODE_END"] = node_end
+
+    sizes = np.repeat([len(hmm.alphabet) for hmm in models], nrows).astype(np.int64)
+    ntable: Dict[str, np.ndarray] = {}
+    ntable["MODEL"] = np.repeat(mtable["MODEL"], nrows)
+    ntable["NODE"] = np.concatenate(
+        [np.arange(n, dtype=np.int32) for n in nrows] + [np.empty(0, np.int32)]
+    )
+    ntable["OFFSET"] = np.concatenate([[0], np.cumsum(sizes)])
+    ntable["MATCH"] = _concat([hmm.match_matrix.ravel() for hmm in models])
+    ntable["INSERT"] = _concat([hmm.insert_matrix.ravel() for hmm in models])
+    trans = np.concatenate(
+        [hmm.trans_matrix for hmm in models] + [np.empty((0, len(TRANS_DEF)))]
+    )
+    for i, name in enumerate(TRANS_DEF):
+        ntable[name] = np.ascontiguousarray(trans[:, i], dtype=np.float64)
+
+    return mtable, ntable
+
+
+def _concat(arrays: List[np.ndarray]) -> np.ndarray:
+    return np.concatenate(arrays + [np.empty(0)]).astype(np.float64, copy=False)
+
+
+class _NpzWriter:
+    def __init__(self, output: Path):
+        self._output = output
+        self._models: List[Dict[str, np.ndarray]] = []
+        self._nodes: List[Dict[str, np.ndarray]] = []
+
+    def write(self, models: Dict[str, np.ndarray], nodes: Dict[str, np.ndarray]):
+        self._models.append(models)
+        self._nodes.append(nodes)
+
+    def close(self):
+        models = {
+            k: np.concatenate([t[k] for t in self._models]) for k in self._models[0]
+        }
+        for field in MODEL_FIELDS + ["ALPHABET"]:
+            models[field] = models[field].astype(str)
+        np.savez(self._output / "models.npz", **models)
+
+        nodes = {}
+        for k in self._nodes[0]:
+            if k == "OFFSET":
+                shift = np.cumsum([0] + [t["OFFSET"][-1] for t in self._nodes[:-1]])
+                offsets = [t["OFFSET"][1:] + s for t, s in zip(self._nodes, shift)]
+                nodes[k] = np.concatenate([[0]] + offsets).astype(np.int64)
+            else:
+                nodes[k] = np.concatenate([t[k] for t in self._nodes])
+        np.savez(self._output / "nodes.npz", **nodes)
+
+
+class _ArrowWriter:
+    def __init__(self, output: Path, format: str):
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError(f"Writing {format} files requires the pyarrow package.")
+
+        self._pa = pyarrow
+        self._output = output
+        self._format = format
+        self._writers = {}
+
+    def write(self, models: Dict[str, np.ndarray], nodes: Dict[str, np.ndarray]):
+        pa = self._pa
+
+        mtable = {}
+        for k, v in models.items():
+            dtype = pa.string() if v.dtype == object else None
+            mtable[k] = pa.array(v, type=dtype)
+
+        ntable = {}
+        offsets = pa.array(nodes["OFFSET"], pa.int64())
+        for k, v in nodes.items():
+            if k == "OFFSET":
+                continue
+            if k in ("MATCH", "INSERT"):
+                ntable[k] = pa.LargeListArray.from_arrays(offsets, pa.array(v))
+            else:
+                ntable[k] = pa.array(v)
+
+        self._write("models", pa.table(mtable))
+        self._write("nodes", pa.table(ntable))
+
+    def _write(self, name: str, table):
+        if name not in self._writers:
+            filepath = str(self._output / f"{name}.{self._format}")
+            if self._format == "parquet":
+                import pyarrow.parquet as pq
+
+                writer = pq.ParquetWriter(filepath, table.schema)
+            else:
+                writer = self._pa.ipc.new_file(filepath, table.schema)
+            self._writers[name] = writer
+        self._writers[name].write_table(table)
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+
+
+def dump_table(
+    filepath: Path,
+    output: Union[Path, IO[str]],
+    table: str = "match",
+    format: str = "tsv",
+    names: Optional[Iterable[str]] = None,
+    accs: Optional[Iterable[str]] = None,
+    log_space: bool = False,
+    batch_size: int = 256,
+):
+    """
+    Dump a whole table of the models of a HMMER file.
+
+    Matrix tables have one row per node (node 0 being the begin node) with
+    the columns NAME, ACC, NODE and one column per alphabet symbol, or per
+    transition MM to DD for the ``"trans"`` table. Emission matrices of
+    models with different alphabets cannot be dumped together. The
+    ``"metadata"`` table has one row per model with every field of
+    :func:`hmmer_reader.fetch_metadata`, read from the model headers only.
+
+    Models are parsed and written in batches. TSV and CSV values have nine
+    significant digits and are formatted a whole batch at a time. A NumPy
+    file holds the matrix
+    values only, the rows of the models being stacked in order, each model
+    spanning ``LENG + 1`` rows. Parquet files require the ``pyarrow``
+    package.
+
+    Parameters
+    ----------
+    filepath
+        HMMER file path.
+    output
+        Output file path, or text stream for TSV and CSV.
+    table
+        ``"match"``, ``"insert"``, ``"trans"`` or ``"metadata"``. Defaults to
+        ``"match"``.
+    format
+        ``"tsv"``, ``"csv"``, ``"npy"`` or ``"parquet"``. Defaults to
+        ``"tsv"``.
+    names
+        Select the models of these names, in this order.
+    accs
+        Select the models of these accessions, in this order, after the ones
+        selected by name. An accession without version is also accepted.
+    log_space
+        Write probabilities in log space. Defaults to ``False``.
+    batch_size
+        Number of models per written batch. Defaults to ``256``.
+    """
+    if table not in DUMP_TABLES:
+        raise ValueError(f"Unknown table {table}.")
+    if format not in DUMP_FORMATS:
+        raise ValueError(f"Unknown format {format}.")
+    if format == "npy" and table == "metadata":
+        raise ValueError("NumPy files hold matrix tables only.")
+
+    names = [] if names is None else list(names)
+    accs = [] if accs is None else list(accs)
+    selected = len(names) + len(accs) > 0
+
+    writer = _table_writer(output, format)
+    try:
+        if table == "metadata":
+            writer.write(_metadata_table(filepath, names, accs, selected))
+            return
+
+        with open_hmmer(filepath, lazy=selected) as hmmfile:
+            if selected:
+                models = [hmmfile.get_by_name(name) for name in names]
+                models += [hmmfile.get(acc) for acc in accs]
+            else:
+                models = hmmfile
+
+            alphabet = None
+            batch: List[HMMERModel] = []
+            for hmm in models:
+                if table != "trans":
+                    if alphabet is None:
+                        alphabet = hmm.alphabet
+                    elif hmm.alphabet != alphabet:
+                        raise ValueError("Models have different alphabets.")
+                batch.append(hmm)
+                if len(batch) == batch_size:
+                    writer.write(_matrix_table(batch, table, log_space))
+                    batch = []
+
+            if len(batch) > 0:
+                writer.write(_matrix_table(batch, table, log_space))
+    finally:
+        writer.close()
+
+
+def _metadata_table(
+    filepath: Path, names: List[str], accs: List[str], selected: bool
+) -> DataFrame:
+    from ._index import _find_model, _model_lookup
+    from ._misc import METADATA_FIELDS, fetch_metadata
+
+    df = fetch_metadata(filepath, list(METADATA_FIELDS))
+    if not selected:
+        return df
+
+    lookup = _model_lookup(df["NAME"].tolist(), df["ACC"].tolist())
+    rows = [_find_model(lookup, name=key) for key in names]
+    rows += [_find_model(lookup, acc=key) for key in accs]
+    return df.iloc[rows].reset_index(drop=True)
+
+
+def _matrix_table(models: List[HMMERModel], table: str, log_space: bool) -> DataFrame:
+    matrices = [getattr(hmm, f"{table}_matrix") for hmm in models]
+    nrows = [m.shape[0] for m in matrices]
+    values = np.concatenate(matrices).astype(np.float64, copy=False)
+    if not log_space:
+        values = np.exp(values)
+
+    data = {}
+    meta = [dict(hmm.metadata) for hmm in models]
+    data["NAME"] = np.repeat(np.array([m.get("NAME") for m in meta], object), nrows)
+    data["ACC"] = np.repeat(np.array([m.get("ACC") for m in meta], object), nrows)
+    data["NODE"] = np.concatenate([np.arange(n, dtype=np.int32) for n in nrows])
+    columns = TRANS_DEF if table == "trans" else list(models[0].alphabet)
+    for i, name in enumerate(columns):
+        data[name] = values[:, i]
+    return DataFrame(data)
+
+
+def _table_writer(output: Union[Path, IO[str]], format: str):
+    if format in ("tsv", "csv"):
+        return _TextWriter(output, "\t" if format == "tsv" else ",")
+
+    if not isinstance(output, (str, Path)):
+        raise ValueError(f"Writing {format} files requires a file path.")
+    if format == "npy":
+        return _NpyWriter(Path(output))
+    return _ParquetWriter(Path(output))
+
+
+class _TextWriter:
+    def __init__(self, output: Union[Path, IO[str]], sep: str):
+        self._own = isinstance(output, (str, Path))
+        self._stream = open(output, "w", newline="") if self._own else output
+        self._sep = sep
+        self._header = True
+
+    def write(self, df: DataFrame):
+        text = _format_rows(df, self._sep)
+        if text is None:
+            df.to_csv(
+                self._stream,
+                sep=self._sep,
+                header=self._header,
+                index=False,
+                float_format=FLOAT_FORMAT,
+            )
+        else:
+            if self._header:
+                self._stream.write(self._sep.join(df.columns) + "\n")
+            self._stream.write(text)
+        self._header = False
+
+    def close(self):
+        if self._own:
+            self._stream.close()
+
+
+def _format_rows(df: DataFrame, sep: str) -> Optional[str]:
+    """
+    Rows of a table formatted with a single string formatting operation, or
+    ``None`` when some values are missing or would need quoting.
+    """
+    if df.isna().to_numpy().any():
+        return None
+
+    special = re.compile(f'[{re.escape(sep)}"\n]')
+    formats = []
+    for name, dtype in df.dtypes.items():
+        if dtype.kind == "f":
+            formats.append(FLOAT_FORMAT)
+        elif dtype.kind in "iu":
+            formats.append("%d")
+        elif any(special.search(v) for v in set(df[name].astype(str))):
+            return None
+        else:
+            formats.append("%s")
+
+    template = (sep.join(formats) + "\n") * len(df)
+    columns = [df[name].tolist() for name in df.columns]
+    return template % tuple(chain.from_iterable(zip(*columns)))
+
+
+class _NpyWriter:
+    """
+    Stream the value columns of tables into a float64 NumPy file, its shape
+    being written in the header once known.
+    """
+
+    # Room for the NumPy 1.0 header of any two-dimensional float64 array.
+    HEADER_SIZE = 128
+
+    def __init__(self, output: Path):
+        self._file = open(output, "wb")
+        self._file.write(self._header((0, 0)))
+        self._shape = (0, 0)
+
+    def write(self, df: DataFrame):
+        values = df.iloc[:, 3:].to_numpy(dtype="<f8")
+        self._file.write(np.ascontiguousarray(values).tobytes())
+        self._shape = (self._shape[0] + values.shape[0], values.shape[1])
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(self._header(self._shape))
+        self._file.close()
+
+    def _header(self, shape) -> bytes:
+        desc = f"{{'descr': '<f8', 'fortran_order': False, 'shape': {shape}, }}"
+        size = self.HEADER_SIZE - 10
+        return (
+            b"\x93NUMPY\x01\x00"
+            + size.to_bytes(2, "little")
+            + (desc.ljust(size - 1) + "\n").encode("latin1")
+        )
+
+
+class _ParquetWriter:
+    def __init__(self, output: Path):
+        try:
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("Writing parquet files requires the pyarrow package.")
+
+        self._pa = pyarrow
+        self._output = output
+        self._writer = None
+
+    def write(self, df: DataFrame):
+        import pyarrow.parquet as pq
+
+        table = self._pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self._output), table.schema)
+        # Pandas metadata differs between batches.
+        self._writer.write_table(table.cast(self._writer.schema))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
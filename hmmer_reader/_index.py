@@ -0,0 +1,242 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from numpy import int32, int64
+from pandas import DataFrame, concat, read_csv
+
+from ._io import BLOCK_SIZE, compression
+
+__all__ = ["build_index", "fetch_index"]
+
+INDEX_SUFFIX = ".idx"
+
+INDEX_COLUMNS = OrderedDict(
+    [
+        ("NAME", str),
+        ("ACC", str),
+        ("LENG", int32),
+        ("ALPH", str),
+        ("START", int64),
+        ("END", int64),
+    ]
+)
+
+# First line of an index file, followed by the indexed size and prefix checksum.
+INDEX_MAGIC = "#hmmer-index"
+
+
+def index_filepath(filepath: Path) -> Path:
+    """
+    Sidecar index file path of a HMMER3 ASCII file.
+    """
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + INDEX_SUFFIX)
+
+
+def build_index(filepath: Path, save: bool = True) -> DataFrame:
+    """
+    Index the models of a HMMER3 ASCII file.
+
+    Each model is recorded with its NAME, ACC, LENG and ALPH fields and the
+    byte range [START, END) of its record, so that it can be read without
+    parsing the rest of the file. A missing ACC is ``None``.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    save
+        Write the index to a sidecar file (see :func:`index_filepath`).
+        Defaults to ``True``.
+
+    Returns
+    -------
+    index
+        One row per model, in file order.
+    """
+    from ._misc import _scan
+
+    filepath = Path(filepath)
+    size = filepath.stat().st_size
+    df = _scan(filepath, list(INDEX_COLUMNS)[:4], True)
+    if save:
+        _write_index(
+            index_filepath(filepath), df, size, prefix_checksum(filepath, size)
+        )
+    return df
+
+
+def fetch_index(filepath: Path) -> DataFrame:
+    """
+    Index of a HMMER3 ASCII file.
+
+    The sidecar index file is used when it is newer than the HMMER file and
+    records its size, or when the HMMER file has kept its size and checksum
+    (see :func:`prefix_checksum`). If an uncompressed HMMER file has only
+    grown since it was indexed, which is assumed when its indexed prefix has
+    the same checksum, only the appended models are scanned. Otherwise the
+    index is built again. An updated index is saved, if possible.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+
+    Returns
+    -------
+    index
+        One row per model, in file order.
+    """
+    filepath = Path(filepath)
+    idxpath = index_filepath(filepath)
+
+    if idxpath.exists():
+        stat = filepath.stat()
+        key, df = _read_index(idxpath)
+        fresh = idxpath.stat().st_mtime >= stat.st_mtime
+        if fresh and key is not None and key[0] == stat.st_size:
+            return df
+
+        if key is not None and stat.st_size >= key[0]:
+            digest = _digest(filepath, 0, key[0])
+            if digest.hexdigest() == key[1]:
+                if stat.st_size == key[0]:
+                    # Touched but unchanged: make the index newer again, so
+                    # that the file is not hashed on every call.
+                    _touch_index(idxpath, stat.st_mtime_ns)
+                    return df
+                if compression(filepath) is None:
+                    df = _extend_index(filepath, df, key[0])
+                    # The prefix digest goes on over the appended bytes only.
+                    digest = _digest(filepath, key[0], stat.st_size, digest.copy())
+                    _save_index(idxpath, df, stat.st_size, digest.hexdigest())
+                    return df
+
+    df = build_index(filepath, save=False)
+    size = filepath.stat().st_size
+    _save_index(idxpath, df, size, prefix_checksum(filepath, size))
+    return df
+
+
+def prefix_checksum(filepath: Path, size: int) -> str:
+    """
+    Checksum of the first ``size`` bytes of a file.
+
+    The whole prefix is hashed, block by block, so that any edit is noticed.
+    """
+    return _digest(filepath, 0, size).hexdigest()
+
+
+def _digest(filepath: Path, start: int, end: int, digest=None):
+    """
+    Hash of the bytes [start, end) of a file, fed to ``digest`` if given.
+    """
+    if digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(remaining, BLOCK_SIZE))
+            if len(block) == 0:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def _model_lookup(
+    names: List[str], accs: List[Optional[str]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Positions of the models by NAME, ACC and accession without version.
+
+    The first model wins on duplicated keys. Models without accession are
+    left out of the accession lookups.
+    """
+    lookup = {}
+    for field, keys in [
+        ("NAME", names),
+        ("ACC", accs),
+        ("ACC_NOVER", [acc and acc.split(".", 1)[0] for acc in accs]),
+    ]:
+        positions: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key:
+                positions.setdefault(key, i)
+        lookup[field] = positions
+    return lookup
+
+
+def _find_model(
+    lookup: Dict[str, Dict[str, int]],
+    name: Optional[str] = None,
+    acc: Optional[str] = None,
+) -> int:
+    """
+    Position of the model of a name or, failing that, of an accession.
+
+    An accession is matched exactly first, then without version. Raises
+    ``KeyError`` if no model matches.
+    """
+    if name is not None:
+        return lookup["NAME"][name]
+    try:
+        return lookup["ACC"][acc]
+    except KeyError:
+        return lookup["ACC_NOVER"][acc]
+
+
+def _extend_index(filepath: Path, df: DataFrame, indexed: int) -> DataFrame:
+    from ._misc import _scan
+
+    tail = _scan(filepath, list(INDEX_COLUMNS)[:4], True, indexed)
+    if len(tail) == 0:
+        return df
+    if len(df) == 0:
+        return tail
+    return concat([df, tail], ignore_index=True)
+
+
+def _read_index(idxpath: Path) -> Tuple[Optional[Tuple[int, str]], DataFrame]:
+    with open(idxpath, "r") as file:
+        line = file.readline()
+        key = None
+        if line.startswith(INDEX_MAGIC):
+            _, size, checksum = line.split()
+            key = (int(size), checksum)
+        else:
+            file.seek(0)
+        df = read_csv(
+            file, sep="\t", header=0, dtype=INDEX_COLUMNS, keep_default_na=False
+        )
+    # Missing accessions are written as empty values.
+    df["ACC"] = df["ACC"].where(df["ACC"] != "", None)
+    return key, df
+
+
+def _touch_index(idxpath: Path, mtime_ns: int):
+    mtime_ns = max(mtime_ns, time.time_ns())
+    try:
+        os.utime(idxpath, ns=(mtime_ns, mtime_ns))
+    except OSError:
+        pass
+
+
+def _save_index(idxpath: Path, df: DataFrame, size: int, checksum: str):
+    try:
+        _write_index(idxpath, df, size, checksum)
+    except OSError:
+        pass
+
+
+def _write_index(idxpath: Path, df: DataFrame, size: int, checksum: str):
+    tmppath = idxpath.with_name(idxpath.name + ".tmp")
+    with open(tmppath, "w") as file:
+        file.write(f"{INDEX_MAGIC} {size} {checksum}\n")
+        df.to_csv(file, sep="\t", index=False)
+    os.replace(tmppath, idxpath)
@@ -0,0 +1,299 @@
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple
+
+__all__ = [
+    "FileRange",
+    "MappedRecordReader",
+    "RecordReader",
+    "compression",
+    "open_binary",
+    "record_boundary",
+    "record_end",
+    "skip",
+    "split_ranges",
+]
+
+BLOCK_SIZE = 1024 * 1024
+
+MAGIC_NUMBERS = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+
+
+def compression(filepath: Path) -> Optional[str]:
+    """
+    Compression format of a file, detected by its magic number.
+
+    Returns
+    -------
+    format
+        ``"gzip"``, ``"bz2"``, ``"xz"``, ``"zstd"``, or ``None`` for an
+        uncompressed file.
+    """
+    with open(filepath, "rb") as file:
+        head = file.read(6)
+
+    for magic, fmt in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def open_binary(filepath: Path) -> BinaryIO:
+    """
+    Open a file for reading, decompressing it on the fly if needed.
+
+    Compression is detected by magic number. Decompression is streamed, so
+    memory usage does not depend on the file size. Zstandard requires the
+    ``zstandard`` package.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+
+    Returns
+    -------
+    stream
+        Binary stream of the uncompressed content.
+    """
+    fmt = compression(filepath)
+
+    if fmt == "gzip":
+        import gzip
+
+        return gzip.open(filepath, "rb")
+
+    if fmt == "bz2":
+        import bz2
+
+        return bz2.open(filepath, "rb")
+
+    if fmt == "xz":
+        import lzma
+
+        return lzma.open(filepath, "rb")
+
+    if fmt == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(
+                "Reading Zstandard files requires the zstandard package."
+            )
+
+        import io
+
+        raw = open(filepath, "rb")
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(stream, BLOCK_SIZE)
+
+    return open(filepath, "rb")
+
+
+class FileRange(NamedTuple):
+    """
+    Byte range [start, end) of a file.
+    """
+
+    path: Path
+    start: int
+    end: int
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as file:
+            file.seek(self.start)
+            return file.read(self.end - self.start)
+
+
+class RecordReader:
+    """
+    Split a binary stream into records ending with a ``//`` line.
+
+    Parameters
+    ----------
+    file
+        Binary stream.
+    offset
+        Stream position of the first record. Defaults to ``0``.
+    """
+
+    def __init__(self, file: BinaryIO, offset: int = 0):
+        self._file = file
+        self._buf = b""
+        self._pos = 0
+        # File offset of the start of the buffer.
+        self._offset = offset
+
+    def read(self) -> Optional[Tuple[int, bytes]]:
+        """
+        Next record and its file offset, or ``None`` at the end of the stream.
+        """
+        search = self._pos
+        while True:
+            i = self._buf.find(b"\n//", search)
+            if i != -1:
+                end = self._buf.find(b"\n", i + 1) + 1
+                if end > 0:
+                    break
+                # Unfinished terminator line, resume from it.
+                search = i
+            else:
+                # A terminator may start right before the buffer end.
+                search = max(len(self._buf) - 2, self._pos)
+
+            block = self._file.read(BLOCK_SIZE)
+            if not block:
+                end = len(self._buf)
+                if self._buf[self._pos :].strip() == b"":
+                    return None
+                break
+
+            search -= self._pos
+            self._offset += self._pos
+            self._buf = self._buf[self._pos :] + block
+            self._pos = 0
+
+        start = self._pos
+        self._pos = end
+        return self._offset + start, self._buf[start:end]
+
+
+class MappedRecordReader:
+    """
+    Split a memory-mapped file into records ending with a ``//`` line.
+
+    Records are returned as memoryview slices of the mapping.
+
+    Parameters
+    ----------
+    mm
+        Memory-mapped file, or ``None`` for an empty file.
+    """
+
+    def __init__(self, mm: Optional[mmap.mmap]):
+        self._mm = mm
+        self._pos = 0
+
+    def read(self) -> Optional[Tuple[int, memoryview]]:
+        """
+        Next record and its file offset, or ``None`` at the end of the file.
+        """
+        mm = self._mm
+        start = self._pos
+        if mm is None or start >= len(mm):
+            return None
+
+        end = record_end(mm, start)
+        if end == -1:
+            if mm[start:].strip() == b"":
+                return None
+            end = len(mm)
+
+        self._pos = end
+        return start, memoryview(mm)[start:end]
+
+
+def skip(stream: BinaryIO, size: int):
+    """
+    Move a stream forward by reading and discarding bytes.
+    """
+    while size > 0:
+        block = stream.read(min(size, BLOCK_SIZE))
+        if not block:
+            return
+        size -= len(block)
+
+
+def record_end(buf, start: int) -> int:
+    """
+    End of the record that starts at ``start``.
+
+    Parameters
+    ----------
+    buf
+        Bytes-like object supporting ``find``.
+    start
+        Record start.
+
+    Returns
+    -------
+    end
+        Position right after the record ``//`` line, or ``-1`` if that line
+        is not complete within the buffer.
+    """
+    i = buf.find(b"\n//", start)
+    if i == -1:
+        return -1
+    j = buf.find(b"\n", i + 1)
+    return -1 if j == -1 else j + 1
+
+
+def record_boundary(file: BinaryIO, offset: int) -> int:
+    """
+    Offset of the first record that starts at or after the given offset.
+
+    Records start at the beginning of the file or right after a ``//`` line.
+    The end of the file is returned if no record starts after the offset.
+
+    Parameters
+    ----------
+    file
+        Seekable binary stream.
+    offset
+        Byte offset.
+    """
+    if offset <= 0:
+        return 0
+
+    # Look a few bytes back so that a terminator line spanning the offset is found.
+    base = max(offset - 64, 0)
+    file.seek(base)
+    buf = b""
+    while True:
+        block = file.read(BLOCK_SIZE)
+        if not block:
+            return base + len(buf)
+        buf += block
+
+        i = buf.find(b"\n//")
+        while i != -1:
+            j = buf.find(b"\n", i + 1)
+            if j == -1:
+                break
+            if base + j + 1 >= offset:
+                return base + j + 1
+            i = buf.find(b"\n//", i + 1)
+
+        # Keep an unfinished terminator line, or just enough bytes to find one.
+        cut = i if i != -1 else max(len(buf) - 2, 0)
+        base += cut
+        buf = buf[cut:]
+
+
+def split_ranges(filepath: Path, n: int) -> List[Tuple[int, int]]:
+    """
+    Split a HMMER file into at most ``n`` byte ranges aligned to records.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    n
+        Number of ranges.
+
+    Returns
+    -------
+    ranges
+        Non-empty [start, end) ranges covering the whole file, in file order.
+    """
+    size = os.stat(filepath).st_size
+    with open(filepath, "rb") as file:
+        bounds = [record_boundary(file, size * i // n) for i in range(n)]
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if a < b]
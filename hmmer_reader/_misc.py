@@ -1,55 +1,439 @@
-import os
 from collections import OrderedDict
 from pathlib import Path
-from tempfile import TemporaryFile
+from typing import IO, Iterable, Iterator, List, Optional, Union
 
-from numpy import int32
-from pandas import DataFrame, read_csv
+import numpy as np
+from numpy import float64, int32, int64
+from pandas import DataFrame
 
+from ._io import BLOCK_SIZE, compression, open_binary, record_boundary, skip
 from ._reader import ParsingError
 
-__all__ = ["num_models", "fetch_metadata"]
+__all__ = ["num_models", "fetch_metadata", "fetch_metadata_many", "iter_metadata"]
 
+# Error codes of the native scanners.
+ERR_PARSER = 2
+ERR_MEMORY = 3
 
-def num_models(filepath: Path) -> int:
+# Metadata fields: header line key, position of the value on the line (None for
+# the whole line) and column type.
+METADATA_FIELDS = OrderedDict(
+    [
+        ("NAME", ("NAME", None, str)),
+        ("ACC", ("ACC", None, str)),
+        ("DESC", ("DESC", None, str)),
+        ("LENG", ("LENG", None, int32)),
+        ("MAXL", ("MAXL", None, int32)),
+        ("ALPH", ("ALPH", None, str)),
+        ("RF", ("RF", None, str)),
+        ("MM", ("MM", None, str)),
+        ("CONS", ("CONS", None, str)),
+        ("CS", ("CS", None, str)),
+        ("MAP", ("MAP", None, str)),
+        ("DATE", ("DATE", None, str)),
+        ("COM", ("COM", None, str)),
+        ("NSEQ", ("NSEQ", None, int64)),
+        ("EFFN", ("EFFN", None, float64)),
+        ("CKSUM", ("CKSUM", None, int64)),
+        ("BM", ("BM", None, str)),
+        ("SM", ("SM", None, str)),
+        ("GA_SEQ", ("GA", 0, float64)),
+        ("GA_DOM", ("GA", 1, float64)),
+        ("TC_SEQ", ("TC", 0, float64)),
+        ("TC_DOM", ("TC", 1, float64)),
+        ("NC_SEQ", ("NC", 0, float64)),
+        ("NC_DOM", ("NC", 1, float64)),
+        ("MSV_MU", ("STATS LOCAL MSV", 0, float64)),
+        ("MSV_LAMBDA", ("STATS LOCAL MSV", 1, float64)),
+        ("VITERBI_MU", ("STATS LOCAL VITERBI", 0, float64)),
+        ("VITERBI_LAMBDA", ("STATS LOCAL VITERBI", 1, float64)),
+        ("FORWARD_TAU", ("STATS LOCAL FORWARD", 0, float64)),
+        ("FORWARD_LAMBDA", ("STATS LOCAL FORWARD", 1, float64)),
+    ]
+)
+
+# Fields fetched by default, and those every model must have.
+DEFAULT_FIELDS = ["NAME", "ACC", "LENG", "ALPH"]
+REQUIRED_FIELDS = ["NAME", "LENG", "ALPH"]
+
+
+def num_models(
+    file: Union[str, Path, IO], start: int = 0, end: Optional[int] = None
+) -> int:
     """
-    Number of models in a HMMER3 ASCII file.
+    Number of models in a HMMER file.
+
+    Models are counted by their ``//`` terminator line, whatever the format
+    version. Compressed files are decompressed on the fly.
+
+    The range [start, end) is counted from the current position of a stream,
+    which is the beginning of the file for a file path. It is in bytes, of
+    decompressed content for a compressed file, except for text streams,
+    whose ranges are in characters.
+
+    Parameters
+    ----------
+    file
+        File path, or binary or text stream read from its current position.
+    start
+        Start of the range. Defaults to ``0``.
+    end
+        End of the range, ``None`` meaning the end of the file or stream.
+        Defaults to ``None``.
+
+    Returns
+    -------
+    count
+        Number of terminator lines starting within [start, end).
     """
-    from subprocess import check_output
+    from ._ffi import ffi, lib
 
-    filepath = Path(filepath)
-    output = check_output(f"grep 'HMMER3/f' {str(filepath)} | wc -l", shell=True)
-    return int(output.strip())
+    if isinstance(file, (str, Path)):
+        with open_binary(Path(file)) as stream:
+            return num_models(stream, start, end)
+
+    counter = ffi.new("struct record_counter *")
+    line_start = True
+    if start > 0:
+        skip(file, start - 1)
+        line_start = _encode(file.read(1)) == b"\n"
+    lib.record_counter_init(counter, line_start)
+
+    size = -1 if end is None else max(end - start, 0)
+    while size != 0:
+        block = _encode(file.read(BLOCK_SIZE if size < 0 else min(size, BLOCK_SIZE)))
+        if len(block) == 0:
+            break
+        lib.record_counter_feed(counter, block, len(block))
+        if size > 0:
+            size -= len(block)
+
+    if counter.pending:
+        # The range ends in the middle of a line starting with a slash.
+        block = _encode(file.read(1))
+        lib.record_counter_feed(counter, block, len(block))
+
+    return counter.count
+
+
+def fetch_metadata(
+    filepath: Path, fields: Optional[List[str]] = None, index: bool = False
+) -> DataFrame:
+    """
+    Fetch header fields of every model in a HMMER3 ASCII file.
+
+    Only the header lines are looked at, by the native scanner. Compressed
+    files are decompressed on the fly.
+
+    The available fields are NAME, ACC, DESC, LENG, MAXL, ALPH, RF, MM,
+    CONS, CS, MAP, DATE, COM, NSEQ, EFFN, CKSUM, BM and SM, the GA, TC and NC
+    cutoffs as GA_SEQ, GA_DOM, TC_SEQ, TC_DOM, NC_SEQ and NC_DOM, and the
+    STATS lines as MSV_MU, MSV_LAMBDA, VITERBI_MU, VITERBI_LAMBDA,
+    FORWARD_TAU and FORWARD_LAMBDA. Every model must have the requested
+    NAME, LENG and ALPH fields. Missing optional values, ACC included, are
+    ``None`` in text columns, ``NaN`` in float columns and ``-1`` in integer
+    columns. When a line is repeated, like COM, the last one wins.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    fields
+        Fields to fetch, in column order. Defaults to NAME, ACC, LENG and
+        ALPH.
+    index
+        Take the fields from the file index instead (see
+        :func:`hmmer_reader.fetch_index`), which is updated by scanning only
+        the appended models when the file has grown. Only NAME, ACC, LENG and
+        ALPH are available. Defaults to ``False``.
+
+    Returns
+    -------
+    metadata
+        One row per model, in file order.
+    """
+    if fields is None:
+        fields = DEFAULT_FIELDS
 
+    if index:
+        from ._index import fetch_index
 
-def fetch_metadata(filepath: Path) -> DataFrame:
+        for name in fields:
+            if name not in DEFAULT_FIELDS:
+                raise ValueError(f"Field {name} is not indexed.")
+        return fetch_index(filepath)[list(fields)]
+
+    return _scan(filepath, fields, False)
+
+
+def _encode(data) -> bytes:
+    return data.encode() if isinstance(data, str) else data
+
+
+def fetch_metadata_many(
+    filepaths: Iterable[Path],
+    fields: Optional[List[str]] = None,
+    threads: Optional[int] = None,
+) -> DataFrame:
+    """
+    Fetch header fields of every model in several HMMER3 ASCII files.
+
+    Files are scanned concurrently by a pool of threads, the native scanner
+    running without the GIL. See :func:`fetch_metadata` for the available
+    fields.
+
+    Parameters
+    ----------
+    filepaths
+        File paths.
+    fields
+        Fields to fetch, in column order. Defaults to NAME, ACC, LENG and
+        ALPH.
+    threads
+        Number of threads, ``None`` meaning the default of
+        :class:`concurrent.futures.ThreadPoolExecutor`. Defaults to ``None``.
+
+    Returns
+    -------
+    metadata
+        One row per model, in file order and then model order, the FILE
+        column giving the path of the file of each model.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from pandas import concat
+
+    filepaths = [Path(filepath) for filepath in filepaths]
+    if fields is None:
+        fields = DEFAULT_FIELDS
+    _scan_keys(fields)
+
+    def scan(filepath: Path) -> DataFrame:
+        try:
+            return _scan(filepath, fields, False)
+        except ParsingError as e:
+            raise ParsingError(f"{filepath}: {e}")
+
+    with ThreadPoolExecutor(threads) as executor:
+        frames = list(executor.map(scan, filepaths))
+
+    names = [str(filepath) for filepath, df in zip(filepaths, frames) if len(df) > 0]
+    frames = [df for df in frames if len(df) > 0]
+    if len(frames) == 0:
+        return DataFrame(columns=["FILE"] + list(fields), dtype=object)
+
+    df = concat(frames, ignore_index=True)
+    sizes = [len(frame) for frame in frames]
+    df.insert(0, "FILE", np.repeat(np.array(names, dtype=object), sizes))
+    return df
+
+
+def iter_metadata(
+    filepath: Path,
+    chunksize: int = 1024,
+    fields: Optional[List[str]] = None,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> Iterator[DataFrame]:
+    """
+    Iterate over header fields of the models of a HMMER3 ASCII file in chunks.
+
+    Chunks are produced as the file is scanned, so memory usage depends on
+    the chunk size rather than on the file size, and stopping early skips the
+    rest of the file. See :func:`fetch_metadata` for the available fields.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    chunksize
+        Number of models per chunk; the last chunk may be smaller. Defaults to
+        ``1024``.
+    fields
+        Fields to fetch, in column order. Defaults to NAME, ACC, LENG and
+        ALPH.
+    start
+        Models starting before this byte offset are skipped. Defaults to
+        ``0``.
+    end
+        Models starting at or after this byte offset are skipped, ``None``
+        meaning the end of the file. Byte ranges require an uncompressed file.
+        Defaults to ``None``.
+
+    Returns
+    -------
+    chunks
+        DataFrames of up to ``chunksize`` rows, in file order.
+    """
     from ._ffi import lib
 
+    if fields is None:
+        fields = DEFAULT_FIELDS
+    keys = _scan_keys(fields)
     filepath = Path(filepath)
 
-    metadata = OrderedDict(
-        [("NAME", str), ("ACC", str), ("LENG", int32), ("ALPH", str)]
-    )
+    with open_binary(filepath) as stream:
+        size = -1
+        if start > 0 or end is not None:
+            if compression(filepath) is not None:
+                raise ValueError("Byte ranges require an uncompressed file.")
+            start = record_boundary(stream, start)
+            if end is not None:
+                size = max(record_boundary(stream, end) - start, 0)
+            stream.seek(start)
+
+        scanner = _new_scanner(keys)
+        try:
+            pending = None
+            nbytes = 0
+            while size != 0:
+                block = stream.read(BLOCK_SIZE if size < 0 else min(size, BLOCK_SIZE))
+                if len(block) == 0:
+                    break
+                if size > 0:
+                    size -= len(block)
+                nbytes += len(block)
+
+                _check(scanner, lib.meta_scanner_feed(scanner, block, len(block)))
+                if lib.meta_scanner_nrows(scanner) == 0:
+                    continue
+
+                pending = _append(pending, _frame(scanner, fields, keys, False))
+                lib.meta_scanner_clear(scanner)
+                while len(pending) >= chunksize:
+                    yield pending.iloc[:chunksize].reset_index(drop=True)
+                    pending = pending.iloc[chunksize:]
+
+            if nbytes == 0:
+                return
+
+            _check(scanner, lib.meta_scanner_finish(scanner))
+            pending = _append(pending, _frame(scanner, fields, keys, False))
+            for i in range(0, len(pending), chunksize):
+                yield pending.iloc[i : i + chunksize].reset_index(drop=True)
+        finally:
+            lib.meta_scanner_del(scanner)
+
+
+def _append(frame: Optional[DataFrame], other: DataFrame) -> DataFrame:
+    from pandas import concat
+
+    if frame is None or len(frame) == 0:
+        return other
+    return concat([frame, other], ignore_index=True)
+
+
+def _scan(
+    filepath: Path, fields: List[str], offsets: bool, start: int = 0
+) -> DataFrame:
+    """
+    Scan a file from a record start, given for uncompressed files only.
+    """
+    from ._ffi import lib
+
+    columns = list(fields) + (["START", "END"] if offsets else [])
+    keys = _scan_keys(fields)
+
+    scanner = _new_scanner(keys)
+    try:
+        with open_binary(Path(filepath)) as stream:
+            if start > 0:
+                stream.seek(start)
+            block = stream.read(BLOCK_SIZE)
+            if len(block) == 0:
+                return DataFrame(columns=columns, dtype=object)
+
+            while len(block) > 0:
+                _check(scanner, lib.meta_scanner_feed(scanner, block, len(block)))
+                block = stream.read(BLOCK_SIZE)
+            _check(scanner, lib.meta_scanner_finish(scanner))
+
+        df = _frame(scanner, fields, keys, offsets)
+        if offsets and start > 0:
+            df["START"] += start
+            df["END"] += start
+        return df
+    finally:
+        lib.meta_scanner_del(scanner)
+
+
+def _scan_keys(fields: List[str]) -> List[str]:
+    for name in fields:
+        if name not in METADATA_FIELDS:
+            raise ValueError(f"Unknown metadata field {name}.")
+    return list(OrderedDict.fromkeys(METADATA_FIELDS[name][0] for name in fields))
+
+
+def _new_scanner(keys: List[str]):
+    from ._ffi import ffi, lib
+
+    ckeys = [ffi.new("char[]", key.encode()) for key in keys]
+    required = [key in REQUIRED_FIELDS for key in keys]
+    scanner = lib.meta_scanner_new(ckeys, required, len(keys))
+    if scanner == ffi.NULL:
+        raise MemoryError()
+    return scanner
+
+
+def _check(scanner, err: int):
+    from ._ffi import ffi, lib
+
+    if err == 0:
+        return
+
+    emsg = ffi.string(lib.meta_scanner_error(scanner)).decode()
+    if err == ERR_PARSER:
+        raise ParsingError(emsg)
+    if err == ERR_MEMORY:
+        raise MemoryError(emsg)
+    raise RuntimeError(emsg)
+
+
+def _frame(scanner, fields: List[str], keys: List[str], offsets: bool) -> DataFrame:
+    from ._ffi import ffi, lib
+
+    nrows = lib.meta_scanner_nrows(scanner)
+    size = ffi.new("size_t *")
+
+    values = {}
+    for i, key in enumerate(keys):
+        text = ffi.unpack(lib.meta_scanner_column(scanner, i, size), size[0])
+        values[key] = text.decode().split("\n")[:nrows]
+
+    data = OrderedDict()
+    for name in fields:
+        key, pos, dtype = METADATA_FIELDS[name]
+        data[name] = _column(name, values[key], pos, dtype)
+
+    if offsets:
+        for name, func in [
+            ("START", lib.meta_scanner_starts),
+            ("END", lib.meta_scanner_ends),
+        ]:
+            ptr = func(scanner)
+            buf = ffi.buffer(ptr, nrows * ffi.sizeof("long long")) if nrows > 0 else b""
+            data[name] = np.frombuffer(buf, dtype=int64).copy()
+
+    return DataFrame(data, columns=list(data.keys()))
+
 
-    if os.stat(filepath).st_size == 0:
-        return DataFrame(columns=metadata.keys(), dtype=object)
+def _column(name: str, values: List[str], pos: Optional[int], dtype) -> np.ndarray:
+    if pos is not None:
+        values = [_token(v, pos) for v in values]
 
-    with TemporaryFile() as file, TemporaryFile() as estream:
+    if dtype is str:
+        return np.array([v if v != "" else None for v in values], dtype=object)
 
-        err: int = lib.meta_read(bytes(filepath), file, estream)
-        if err != 0:
-            estream.seek(0)
-            emsg = estream.read().decode().strip()
-            if err == 2:
-                raise ParsingError(emsg)
-            raise RuntimeError(emsg)
+    missing = np.nan if np.issubdtype(dtype, np.floating) else -1
+    arr = np.full(len(values), missing, dtype=dtype)
+    present = [i for i, v in enumerate(values) if v != ""]
+    try:
+        arr[present] = np.array([values[i] for i in present]).astype(dtype)
+    except ValueError:
+        raise ParsingError(f"Invalid {name} value.")
+    return arr
 
-        file.seek(0)
 
-        return read_csv(
-            file,
-            sep="\t",
-            header=0,
-            names=list(metadata.keys()),
-            dtype=metadata,
-        )
+def _token(value: str, pos: int) -> str:
+    tokens = value.rstrip(";").split()
+    return tokens[pos] if pos < len(tokens) else ""
@@ -0,0 +1,134 @@
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from ._io import RecordReader, compression, open_binary, split_ranges
+from ._reader import HMMERModel, HMMERParser
+
+__all__ = ["parallel_read_models"]
+
+# Chunks per worker, so that a slow chunk does not leave the others idle.
+CHUNKS_PER_WORKER = 4
+
+# Size of the record batches sent to workers for compressed files.
+BATCH_SIZE = 8 * 1024 * 1024
+
+
+def parallel_read_models(
+    filepath: Path,
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    dtype=np.float64,
+) -> Iterator[HMMERModel]:
+    """
+    Read the models of a HMMER file using a pool of processes.
+
+    The file is split into byte ranges aligned to ``//`` record boundaries,
+    and each range is parsed by a worker process. Compressed files cannot be
+    split that way: they are decompressed by the calling process, which sends
+    batches of records to the workers.
+
+    Parameters
+    ----------
+    filepath
+        File path.
+    workers
+        Number of worker processes. Defaults to the number of CPUs.
+    ordered
+        Yield models in file order. Otherwise, models are yielded as soon as
+        their chunk has been parsed. Defaults to ``True``.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+
+    Returns
+    -------
+    models
+        Iterator over the models.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers > 1 and compression(filepath) is not None:
+        yield from _read_stream(filepath, workers, ordered, dtype)
+        return
+
+    ranges = split_ranges(filepath, workers * CHUNKS_PER_WORKER)
+    if workers == 1 or len(ranges) <= 1:
+        with HMMERParser(filepath, dtype) as parser:
+            yield from parser
+        return
+
+    with ProcessPoolExecutor(min(workers, len(ranges))) as executor:
+        futures = [
+            executor.submit(_read_range, str(filepath), start, end, dtype)
+            for start, end in ranges
+        ]
+        try:
+            for future in futures if ordered else as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _read_range(filepath: str, start: int, end: int, dtype) -> List[HMMERModel]:
+    with open(filepath, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    records = RecordReader(BytesIO(data), start)
+    return _parse_records([record for _, record in iter(records.read, None)], dtype)
+
+
+def _read_stream(filepath: Path, workers: int, ordered: bool, dtype):
+    with open_binary(filepath) as stream, ProcessPoolExecutor(workers) as executor:
+        # Bound the number of batches in flight to bound memory usage.
+        pending = deque()
+        try:
+            for batch in _batches(RecordReader(stream)):
+                pending.append(executor.submit(_parse_records, batch, dtype))
+                while len(pending) >= 2 * workers:
+                    yield from _pop_done(pending, ordered).result()
+
+            while len(pending) > 0:
+                yield from _pop_done(pending, ordered).result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _batches(records: RecordReader) -> Iterator[List[bytes]]:
+    batch = []
+    size = 0
+    for _, record in iter(records.read, None):
+        batch.append(record)
+        size += len(record)
+        if size >= BATCH_SIZE:
+            yield batch
+            batch = []
+            size = 0
+    if len(batch) > 0:
+        yield batch
+
+
+def _pop_done(pending: deque, ordered: bool):
+    if ordered:
+        return pending.popleft()
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    future = done.pop()
+    pending.remove(future)
+    return future
+
+
+def _parse_records(records: List[bytes], dtype) -> List[HMMERModel]:
+    return [HMMERModel._from_record(record, dtype) for record in records]
@@ -1,7 +1,24 @@
+import mmap
+import os
 import pathlib
+import sys
 from collections import OrderedDict
+from functools import lru_cache
 from math import inf
-from typing import IO, Iterator, List, Tuple, Union
+from time import perf_counter
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ._io import (
+    FileRange,
+    MappedRecordReader,
+    RecordReader,
+    compression,
+    open_binary,
+    skip,
+)
+from ._stats import ParseStats
 
 __all__ = ["ParsingError", "HMMERModel", "HMMERParser", "open_hmmer"]
 
@@ -14,118 +31,537 @@ class EmptyBuffer(Exception):
     pass
 
 
+TRANS_DEF = ["MM", "MI", "MD", "IM", "II", "DM", "DD"]
+
+# Metadata fields whose values are usually shared by the models of a file.
+SHARED_FIELDS = {"ALPH", "RF", "MM", "CONS", "CS", "MAP", "DATE", "BM", "SM"}
+
+# Distinct metadata key sequences, each one stored once.
+_META_KEYS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
 class HMMERModel:
     """
     HMMER model.
+
+    Parameters
+    ----------
+    file
+        Stream positioned at the start of a model.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    lazy
+        Parse only the header, metadata and alphabet straight away. The
+        matrices are parsed the first time ``M``, ``compo``, the matrices or
+        the node accessors are used. Defaults to ``False``.
     """
 
-    def __init__(self, file: IO[str]):
+    # No per-instance __dict__: a file can hold tens of thousands of models.
+    __slots__ = (
+        "_record",
+        "_header_parsed",
+        "_header",
+        "_meta_keys",
+        "_meta_values",
+        "_alphabet",
+        "_dtype",
+        "_compo_vector",
+        "_match_matrix",
+        "_insert_matrix",
+        "_trans_matrix",
+        "_derived",
+        "_stats",
+    )
+
+    def __init__(self, file: IO[str], dtype=np.float64, lazy: bool = False):
+        self._init(dtype)
+        self._read(file, lazy)
+
+    @classmethod
+    def _from_stream(
+        cls, file: IO[str], dtype, lazy: bool, stats: Optional[ParseStats]
+    ) -> Tuple["HMMERModel", bytes]:
+        """
+        Model read from a text stream, and its record.
+        """
+        hmm = cls.__new__(cls)
+        hmm._init(dtype)
+        hmm._stats = stats
+        return hmm, hmm._read(file, lazy)
+
+    def _read(self, file: IO[str], lazy: bool) -> bytes:
+        if self._stats is not None:
+            start = perf_counter()
+        record = _read_record(file)
+        if self._stats is not None:
+            self._stats.add("read", start)
+
+        if record.strip() == "":
+            raise EmptyBuffer()
+
+        data = record.encode()
+        if lazy:
+            self._parse_record(data, matrix=False)
+            self._record = data
+        else:
+            self._parse_record(data)
+        return data
+
+    @classmethod
+    def _from_record(
+        cls,
+        data,
+        dtype=np.float64,
+        parse: str = "all",
+        source=None,
+        stats: Optional[ParseStats] = None,
+    ) -> "HMMERModel":
+        """
+        Model from a bytes-like record.
+
+        ``parse`` tells which parts are parsed straight away: ``"all"``,
+        ``"header"`` or ``"none"``. The rest is parsed on first access from
+        ``source`` (a bytes-like object or a :class:`FileRange`), which
+        defaults to ``data``. Parse times are added to ``stats``, if given.
+        """
+        hmm = cls.__new__(cls)
+        hmm._init(dtype)
+        hmm._stats = stats
+        if parse == "all":
+            hmm._parse_record(data)
+            return hmm
+
+        if parse == "header":
+            hmm._parse_record(data, matrix=False)
+        hmm._record = data if source is None else source
+        return hmm
+
+    @classmethod
+    def _from_arrays(
+        cls, header: str, metadata, alphabet: str, compo, match, insert, trans
+    ) -> "HMMERModel":
+        """
+        Model from already parsed parts, the matrices setting its dtype.
+        """
+        hmm = cls.__new__(cls)
+        hmm._init(compo.dtype)
+        hmm._header = sys.intern(header)
+        hmm._set_metadata([k for k, _ in metadata], [v for _, v in metadata])
+        hmm._alphabet = sys.intern(alphabet)
+        hmm._header_parsed = True
+        hmm._compo_vector = compo
+        hmm._match_matrix = match
+        hmm._insert_matrix = insert
+        hmm._trans_matrix = trans
+        return hmm
+
+    def _init(self, dtype):
+        # Unparsed record, or None once the matrices have been parsed.
+        self._record = None
+        self._header_parsed = False
         self._header = ""
-        self._metadata: List[Tuple[str, str]] = []
-        self._alphabet: List[str] = []
+        # Metadata keys, shared by the models with the same ones, and values.
+        self._meta_keys: Tuple[str, ...] = ()
+        self._meta_values: Tuple[str, ...] = ()
+        self._alphabet = ""
+        self._dtype = np.dtype(dtype)
         # model bg residue comp
-        self._compo: OrderedDict = OrderedDict()
-        self._match: List[OrderedDict] = []
-        self._insert: List[OrderedDict] = []
-        self._trans: List[OrderedDict] = []
+        self._compo_vector = _empty((0,), self._dtype)
+        # (M+1, K) emissions and (M+1, 7) transitions, node 0 being the begin node
+        self._match_matrix = _empty((0, 0), self._dtype)
+        self._insert_matrix = _empty((0, 0), self._dtype)
+        self._trans_matrix = _empty((0, len(TRANS_DEF)), self._dtype)
+        # Derived matrices, see prob_matrix, log_odds_matrix and score_matrix.
+        self._derived: Optional[dict] = None
+        # Parse statistics of the parser, if enabled.
+        self._stats: Optional[ParseStats] = None
 
-        first_line = file.readline()
-        if first_line == "":
-            raise EmptyBuffer()
+    @property
+    def header(self):
+        self._load_header()
+        return self._header
 
-        self._header = strip(first_line)
+    @property
+    def metadata(self) -> List[Tuple[str, str]]:
+        self._load_header()
+        return list(zip(self._meta_keys, self._meta_values))
 
-        abc_line_found = False
-        line = ""
-        for i, line in enumerate(file):
+    @property
+    def name(self) -> Optional[str]:
+        """
+        NAME field.
+        """
+        return self._field("NAME")
 
-            line = line.strip()
-            if line.startswith("HMM "):
-                abc_line_found = True
-                break
+    @property
+    def acc(self) -> Optional[str]:
+        """
+        ACC field, ``None`` if missing.
+        """
+        return self._field("ACC")
 
-            try:
-                key, value = line.split(" ", 1)
-            except ValueError:
-                raise ParsingError(f"Could not parse line {i}: {line}")
-            key = key.strip()
-            value = value.strip()
-            self._metadata.append((key, value))
+    @property
+    def desc(self) -> Optional[str]:
+        """
+        DESC field, ``None`` if missing.
+        """
+        return self._field("DESC")
 
-        if not abc_line_found:
-            raise ParsingError("Alphabet line not found.")
+    @property
+    def leng(self) -> Optional[int]:
+        """
+        LENG field, the model length known without parsing the matrices.
+        """
+        value = self._field("LENG")
+        return None if value is None else int(value)
 
-        self._read_alphabet(line)
-        next(file)
-        self._parse_matrix(file)
+    @property
+    def nseq(self) -> Optional[int]:
+        """
+        NSEQ field, ``None`` if missing.
+        """
+        value = self._field("NSEQ")
+        return None if value is None else int(value)
 
     @property
-    def header(self):
-        return self._header
+    def ga(self) -> Optional[Tuple[float, float]]:
+        """
+        GA cutoffs (sequence, domain), ``None`` if missing.
+        """
+        return self._cutoffs("GA")
 
     @property
-    def metadata(self) -> List[Tuple[str, str]]:
-        return self._metadata
+    def tc(self) -> Optional[Tuple[float, float]]:
+        """
+        TC cutoffs (sequence, domain), ``None`` if missing.
+        """
+        return self._cutoffs("TC")
+
+    @property
+    def nc(self) -> Optional[Tuple[float, float]]:
+        """
+        NC cutoffs (sequence, domain), ``None`` if missing.
+        """
+        return self._cutoffs("NC")
+
+    def _field(self, key: str) -> Optional[str]:
+        self._load_header()
+        # The last line wins, as with fetch_metadata.
+        keys = self._meta_keys
+        for i in range(len(keys) - 1, -1, -1):
+            if keys[i] == key:
+                return self._meta_values[i]
+        return None
+
+    def _cutoffs(self, key: str) -> Optional[Tuple[float, float]]:
+        value = self._field(key)
+        if value is None:
+            return None
+        try:
+            seq, dom = value.rstrip(";").split()[:2]
+            return float(seq), float(dom)
+        except ValueError:
+            raise ParsingError(f"Invalid {key} value.")
 
     @property
     def compo(self) -> OrderedDict:
-        return self._compo
+        self._load()
+        return _get_node_probs(self._alphabet, self._compo_vector)
 
     @property
     def alphabet(self):
+        self._load_header()
         return self._alphabet
 
     @property
     def M(self):
-        return len(self._match) - 1
+        self._load()
+        return self._match_matrix.shape[0] - 1
+
+    @property
+    def compo_vector(self) -> np.ndarray:
+        """
+        Model background residue composition, shape (K,).
+        """
+        self._load()
+        return _readonly(self._compo_vector)
+
+    @property
+    def match_matrix(self) -> np.ndarray:
+        """
+        Match emissions in log space, shape (M+1, K).
+        """
+        self._load()
+        return _readonly(self._match_matrix)
+
+    @property
+    def insert_matrix(self) -> np.ndarray:
+        """
+        Insert emissions in log space, shape (M+1, K).
+        """
+        self._load()
+        return _readonly(self._insert_matrix)
+
+    @property
+    def trans_matrix(self) -> np.ndarray:
+        """
+        Transitions in log space, shape (M+1, 7), columns ordered as
+        MM, MI, MD, IM, II, DM, DD.
+        """
+        self._load()
+        return _readonly(self._trans_matrix)
 
     def match(self, i) -> OrderedDict:
-        return _get_node_probs(self._match[i])
+        self._load()
+        return _get_node_probs(self._alphabet, self._match_matrix[i])
 
     def insert(self, i) -> OrderedDict:
-        return _get_node_probs(self._insert[i])
+        self._load()
+        return _get_node_probs(self._alphabet, self._insert_matrix[i])
 
     def trans(self, i) -> OrderedDict:
-        return _get_node_probs(self._trans[i])
+        self._load()
+        return _get_node_probs(TRANS_DEF, self._trans_matrix[i])
 
-    def _read_alphabet(self, line):
-        line = strip(line)
-        self._alphabet = [v.strip() for v in line.split(" ")][1:]
-        self._alphabet = "".join(self._alphabet)
+    def prob_matrix(self, name: str = "match") -> np.ndarray:
+        """
+        Probabilities of a matrix, the exponential of its log-probabilities.
+
+        Computed on first use and kept until :meth:`clear_cache`.
 
-    def _parse_matrix(self, fp):
-        TRANS_DEF = ["MM", "MI", "MD", "IM", "II", "DM", "DD"]
-        abc = self._alphabet
+        Parameters
+        ----------
+        name
+            ``"compo"``, ``"match"``, ``"insert"`` or ``"trans"``. Defaults to
+            ``"match"``.
+        """
+        return self._derive(("prob", name), lambda: np.exp(self._matrix(name)))
+
+    def log_odds_matrix(self, name: str = "match", background=None) -> np.ndarray:
+        """
+        Emission log-odds scores in nats, shape (M+1, K).
+
+        Computed on first use for each background and kept until
+        :meth:`clear_cache`.
+
+        Parameters
+        ----------
+        name
+            ``"match"`` or ``"insert"``. Defaults to ``"match"``.
+        background
+            Background probabilities, as a sequence in alphabet order or a
+            mapping from symbols. Defaults to the model composition.
+        """
+        if name not in ("match", "insert"):
+            raise ValueError(f"No log-odds scores for {name} matrix.")
 
-        line = strip(fp.readline()).split(" ")
-        if line[0] != "COMPO":
-            raise ValueError("Expected COMPO token.")
-        line = line[1:]
-        self._compo = OrderedDict([(a, num(b)) for a, b in zip(abc, line)])
+        bg = self._background(background)
+        key = ("log_odds", name, None if bg is None else bg.tobytes())
 
-        self._match.append(OrderedDict([(a, -inf) for a in abc]))
-        self._match[0][abc[0]] = 0.0
+        def odds():
+            # Loads the composition of a lazy model along with the matrix.
+            matrix = self._matrix(name)
+            logbg = self._compo_vector if bg is None else np.log(bg)
+            return matrix - logbg.astype(self._dtype, copy=False)
 
-        line = strip(fp.readline()).split(" ")[: len(abc)]
-        self._insert.append(OrderedDict([(a, num(b)) for a, b in zip(abc, line)]))
+        return self._derive(key, odds)
 
-        line = strip(fp.readline()).split(" ")[: len(TRANS_DEF)]
-        self._trans.append(OrderedDict([(a, num(b)) for a, b in zip(TRANS_DEF, line)]))
+    def score_matrix(
+        self, name: str = "match", background=None, scale: float = 500.0, dtype=np.int16
+    ) -> np.ndarray:
+        """
+        Emission log-odds scores quantised to integers, shape (M+1, K).
+
+        Scores are in units of ``1/scale`` bits, rounded and clipped to the
+        integer type. Impossible emissions get its smallest value. Computed on
+        first use and kept until :meth:`clear_cache`.
+
+        Parameters
+        ----------
+        name
+            ``"match"`` or ``"insert"``. Defaults to ``"match"``.
+        background
+            See :meth:`log_odds_matrix`.
+        scale
+            Units per bit. Defaults to ``500``.
+        dtype
+            Integer type. Defaults to ``int16``.
+        """
+        dtype = np.dtype(dtype)
+        bg = self._background(background)
+        key = ("score", name, None if bg is None else bg.tobytes(), scale, dtype)
 
-        line = strip(fp.readline())
-        while line != "//":
-            line = line.split(" ")[1 : len(abc) + 1]
-            self._match.append(OrderedDict([(a, num(b)) for a, b in zip(abc, line)]))
+        def scores():
+            odds = self.log_odds_matrix(name, background)
+            info = np.iinfo(dtype)
+            scores = np.rint(odds * (scale / np.log(2)))
+            scores = np.clip(scores, info.min + 1, info.max)
+            scores[np.isneginf(odds)] = info.min
+            return scores.astype(dtype)
 
-            line = strip(fp.readline()).split(" ")[: len(abc)]
-            self._insert.append(OrderedDict([(a, num(b)) for a, b in zip(abc, line)]))
+        return self._derive(key, scores)
 
-            line = strip(fp.readline()).split(" ")[: len(TRANS_DEF)]
-            self._trans.append(
-                OrderedDict([(a, num(b)) for a, b in zip(TRANS_DEF, line)])
+    def clear_cache(self):
+        """
+        Drop the matrices cached by :meth:`prob_matrix`,
+        :meth:`log_odds_matrix` and :meth:`score_matrix`.
+        """
+        self._derived = None
+
+    def _derive(self, key, compute) -> np.ndarray:
+        if self._derived is None:
+            self._derived = {}
+        if key not in self._derived:
+            self._derived[key] = _readonly(compute())
+        return self._derived[key]
+
+    def _matrix(self, name: str) -> np.ndarray:
+        self._load()
+        matrices = {
+            "compo": self._compo_vector,
+            "match": self._match_matrix,
+            "insert": self._insert_matrix,
+            "trans": self._trans_matrix,
+        }
+        if name not in matrices:
+            raise ValueError(f"Unknown matrix {name}.")
+        return matrices[name]
+
+    def _background(self, background) -> Optional[np.ndarray]:
+        if background is None:
+            return None
+        if isinstance(background, dict):
+            background = [background[a] for a in self.alphabet]
+        bg = np.asarray(background, dtype=np.float64)
+        if bg.shape != (len(self.alphabet),):
+            raise ValueError("Background must have one probability per symbol.")
+        return bg
+
+    def _load_header(self):
+        if not self._header_parsed:
+            self._parse_record(self._record_data(), matrix=False)
+
+    def _load(self):
+        if self._record is not None:
+            header = not self._header_parsed
+            self._parse_record(self._record_data(), header=header)
+            self._record = None
+
+    def _record_data(self):
+        if self._stats is None:
+            return _record_data(self._record)
+
+        start = perf_counter()
+        data = _record_data(self._record)
+        self._stats.add("read", start)
+        return data
+
+    def __getstate__(self):
+        self._load()
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state["_derived"] = None
+        state["_stats"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _read_alphabet(self, line):
+        line = strip(line)
+        self._alphabet = sys.intern("".join(line.split(" ")[1:]))
+
+    def _parse_record(self, data, header: bool = True, matrix: bool = True):
+        from ._ffi import ffi, lib
+
+        stats = self._stats
+        if stats is not None:
+            start = perf_counter()
+
+        buf = ffi.from_buffer(data)
+        layout = ffi.new("struct model_layout *")
+        abc_line_found = lib.model_layout(buf, len(data), layout) == 0
+        if stats is not None:
+            start = stats.add("layout", start)
+
+        if header:
+            self._parse_header(data, layout, abc_line_found)
+            if stats is not None:
+                start = stats.add("header", start)
+
+        if matrix:
+            self._parse_matrix(
+                buf + layout.body_start,
+                len(data) - layout.body_start,
+                layout.body_lines,
             )
+            if stats is not None:
+                stats.add("matrix", start)
+
+    def _parse_header(self, data, layout, abc_line_found: bool):
+        self._header = sys.intern(strip(str(data[: layout.header_end], "utf-8")))
+
+        keys = []
+        values = []
+        lines = str(data[layout.header_end : layout.meta_end], "utf-8").splitlines()
+        for i, line in enumerate(lines):
+            line = line.strip()
+            try:
+                key, value = line.split(" ", 1)
+            except ValueError:
+                raise ParsingError(f"Could not parse line {i}: {line}")
+            keys.append(key.strip())
+            values.append(value.strip())
+        self._set_metadata(keys, values)
 
-            line = strip(fp.readline())
+        if not abc_line_found:
+            raise ParsingError("Alphabet line not found.")
+
+        self._read_alphabet(str(data[layout.meta_end : layout.alph_end], "utf-8"))
+        self._header_parsed = True
+
+    def _set_metadata(self, keys: List[str], values: List[str]):
+        keys = tuple(sys.intern(k) for k in keys)
+        self._meta_keys = _META_KEYS.setdefault(keys, keys)
+        self._meta_values = tuple(
+            sys.intern(v) if k in SHARED_FIELDS else v for k, v in zip(keys, values)
+        )
+
+    def _parse_matrix(self, buf, size: int, nlines: int):
+        from ._ffi import ffi, lib
+
+        K = len(self._alphabet)
+        T = len(TRANS_DEF)
+        # Three lines per node plus the COMPO, begin node and closing lines.
+        nrows = max(nlines // 3, 1)
+
+        compo = np.empty(K)
+        match = np.empty((nrows, K))
+        insert = np.empty((nrows, K))
+        trans = np.empty((nrows, T))
+        nnodes = ffi.new("size_t *")
+        line_num = ffi.new("size_t *")
+
+        err = lib.model_read(
+            buf,
+            size,
+            K,
+            nrows,
+            ffi.from_buffer("double[]", compo),
+            ffi.from_buffer("double[]", match),
+            ffi.from_buffer("double[]", insert),
+            ffi.from_buffer("double[]", trans),
+            nnodes,
+            line_num,
+        )
+        if err != 0:
+            raise ParsingError(f"Could not parse matrix line {line_num[0]}.")
+
+        n = nnodes[0]
+        self._compo_vector = compo.astype(self._dtype, copy=False)
+        self._match_matrix = _rows(match, n, self._dtype)
+        self._insert_matrix = _rows(insert, n, self._dtype)
+        self._trans_matrix = _rows(trans, n, self._dtype)
 
     def __str__(self):
         msg = "File\n"
@@ -136,7 +572,7 @@ class HMMERModel:
 
         msg += "Metadata\n"
         msg += "--------\n"
-        for k, v in self._metadata:
+        for k, v in zip(self._meta_keys, self._meta_values):
             msg += k + " " * (6 - len(k)) + f"{v}\n"
 
         return msg[:-1]
@@ -150,25 +586,184 @@ class HMMERParser:
     ----------
     file
         File path or stream.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    workers
+        Number of processes used to iterate over the models of a file path.
+        ``None`` means the number of CPUs. Defaults to ``1``.
+    memory_map
+        Map a file path into memory instead of reading it. Models then keep
+        a slice of the mapped file and parse it only when first accessed.
+        Ignored for compressed files. Defaults to ``False``.
+    lazy
+        Parse only the header, metadata and alphabet of each model until its
+        matrices are accessed. For an uncompressed file path, models keep the
+        byte range of their record instead of its content. Defaults to
+        ``False``.
+    cache
+        Read the models of a file path from a binary cache, parsing the file
+        and writing the cache only when it is missing or out of date. ``True``
+        keeps the cache next to the file; a path names the cache directory.
+        Defaults to ``False``.
+    stats
+        Collect parse statistics in :attr:`stats`. A callable also enables
+        them and is called as ``stats(hmm, parser.stats)`` after each model
+        is read. Models read by worker processes or from the cache are only
+        counted, their time going to the read phase. Defaults to ``False``.
+    where
+        Predicate selecting the models to read, called with each model once
+        its header, metadata and alphabet are parsed. The matrices of the
+        models it rejects are not parsed, and those of the models it selects
+        are parsed as usual. Models read by worker processes are parsed
+        whole and filtered afterwards; workers also ignore ``lazy`` and
+        ``memory_map``, and iterate from the first model of the file even
+        after :meth:`read_model`. Models fetched by :meth:`get` and
+        :meth:`get_by_name` are not filtered. Defaults to ``None``.
     """
 
-    def __init__(self, file: Union[str, pathlib.Path, IO[str]]):
+    def __init__(
+        self,
+        file: Union[str, pathlib.Path, IO[str]],
+        dtype=np.float64,
+        workers: Optional[int] = 1,
+        memory_map: bool = False,
+        lazy: bool = False,
+        cache: Union[bool, str, pathlib.Path] = False,
+        stats: Union[bool, Callable[[HMMERModel, ParseStats], None]] = False,
+        where: Optional[Callable[[HMMERModel], bool]] = None,
+    ):
         if isinstance(file, str):
             file = pathlib.Path(file)
 
+        self._path = None
+        self._compressed = False
+        self._mmap = None
+        self._records = None
+        self._cached = None
+        if cache is not False and not isinstance(file, pathlib.Path):
+            raise ValueError("Caching requires a file path.")
+
         if isinstance(file, pathlib.Path):
-            file = open(file, "r")
+            self._path = file
+            self._compressed = compression(file) is not None
+            if cache is not False:
+                from ._cache import cached_models
+
+                # The models come from the cache: the file is not opened.
+                file = None
+                self._cached = iter(cached_models(self._path, cache, dtype, workers))
+            elif memory_map and not self._compressed:
+                file = open_binary(file)
+                self._mmap = _map_file(file)
+                self._records = MappedRecordReader(self._mmap)
+            else:
+                file = open_binary(file)
+                self._records = RecordReader(file)
 
         self._file = file
+        self._dtype = dtype
+        self._workers = workers
+        self._lazy = lazy
+        self._rfile = None
+        self._lookup: Optional[Dict[str, Dict[str, int]]] = None
+        self._offsets: List[Tuple[int, int]] = []
+        self._stats = ParseStats() if stats else None
+        self._callback = stats if callable(stats) else None
+        self._where = where
+
+    @property
+    def stats(self) -> Optional[ParseStats]:
+        """
+        Parse statistics, or ``None`` if not enabled.
+        """
+        return self._stats
 
     def read_model(self) -> HMMERModel:
         """
         Get the next model.
         """
-        try:
-            return HMMERModel(self._file)
-        except EmptyBuffer:
+        while True:
+            if self._stats is None:
+                hmm = self._read_model()[0]
+                if hmm is not None:
+                    return hmm
+                continue
+
+            start = perf_counter()
+            hmm, data = self._read_model()
+            if hmm is not None:
+                self._count(hmm, data, start)
+                return hmm
+
+    def _read_model(self) -> Tuple[Optional[HMMERModel], Optional[bytes]]:
+        """
+        Next model, or ``None`` if rejected by ``where``, and its record.
+        """
+        if self._cached is not None:
+            if self._stats is None:
+                return self._select(next(self._cached)), None
+            start = perf_counter()
+            hmm = next(self._cached)
+            self._stats.add("read", start)
+            return self._select(hmm), None
+
+        if self._records is None:
+            lazy = self._lazy or self._where is not None
+            try:
+                hmm, data = HMMERModel._from_stream(
+                    self._file, self._dtype, lazy, self._stats
+                )
+            except EmptyBuffer:
+                raise StopIteration
+            return self._select(hmm, not self._lazy), data
+
+        if self._stats is not None:
+            start = perf_counter()
+        record = self._records.read()
+        if self._stats is not None:
+            self._stats.add("read", start)
+
+        if record is None:
             raise StopIteration
+        return self._model(*record, self._where is not None), record[1]
+
+    def _count(self, hmm: HMMERModel, data, start: float):
+        self._stats.add_model(data, perf_counter() - start)
+        if self._callback is not None:
+            self._callback(hmm, self._stats)
+
+    def _model(self, start: int, data, select: bool = False) -> Optional[HMMERModel]:
+        stats = self._stats
+        if self._mmap is not None:
+            parse = "header" if self._lazy or select else "none"
+            hmm = HMMERModel._from_record(data, self._dtype, parse, stats=stats)
+            return self._select(hmm) if select else hmm
+
+        if self._lazy and self._compressed:
+            hmm = HMMERModel._from_record(data, self._dtype, "header", stats=stats)
+            return self._select(hmm) if select else hmm
+
+        if self._lazy:
+            source = FileRange(self._path, start, start + len(data))
+            hmm = HMMERModel._from_record(data, self._dtype, "header", source, stats)
+            return self._select(hmm) if select else hmm
+
+        if not select:
+            return HMMERModel._from_record(data, self._dtype, stats=stats)
+
+        # Matrices parsed only once the model is selected.
+        hmm = HMMERModel._from_record(data, self._dtype, "header", stats=stats)
+        return self._select(hmm, True)
+
+    def _select(self, hmm: HMMERModel, load: bool = False) -> Optional[HMMERModel]:
+        """
+        The model if selected by ``where``, its matrices parsed if ``load``.
+        """
+        if self._where is not None and not self._where(hmm):
+            return None
+        if load:
+            hmm._load()
+        return hmm
 
     def read_models(self) -> List[HMMERModel]:
         """
@@ -176,13 +771,100 @@ class HMMERParser:
         """
         return list(self)
 
+    def get(self, acc: str) -> HMMERModel:
+        """
+        Get a model by its accession.
+
+        Only the model record is read, its location being taken from the
+        file index (see :func:`hmmer_reader.fetch_index`). An accession
+        without version, like ``PF02545``, is also accepted.
+
+        Parameters
+        ----------
+        acc
+            Model accession.
+        """
+        return self._get(acc=acc)
+
+    def get_by_name(self, name: str) -> HMMERModel:
+        """
+        Get a model by its name.
+
+        Parameters
+        ----------
+        name
+            Model name.
+        """
+        return self._get(name=name)
+
+    def _get(self, name: Optional[str] = None, acc: Optional[str] = None) -> HMMERModel:
+        from ._index import _find_model
+
+        if self._path is None:
+            raise ValueError("Random access requires a file path.")
+
+        if self._lookup is None:
+            self._lookup, self._offsets = _index_lookup(self._path)
+
+        start, end = self._offsets[_find_model(self._lookup, name, acc)]
+        if self._stats is not None:
+            began = perf_counter()
+
+        if self._mmap is not None:
+            data = memoryview(self._mmap)[start:end]
+        elif self._compressed:
+            # Decompressed offsets: the stream has to be read up to the record.
+            with open_binary(self._path) as stream:
+                skip(stream, start)
+                data = stream.read(end - start)
+        else:
+            if self._rfile is None:
+                self._rfile = open(self._path, "rb")
+            self._rfile.seek(start)
+            data = self._rfile.read(end - start)
+
+        if self._stats is None:
+            return self._model(start, data)
+
+        self._stats.add("read", began)
+        hmm = self._model(start, data)
+        self._count(hmm, data, began)
+        return hmm
+
     def close(self):
         """
         Close the associated stream.
         """
-        self._file.close()
+        if self._file is not None:
+            self._file.close()
+        if self._rfile is not None:
+            self._rfile.close()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Unparsed models still refer to it; it is unmapped once they go.
+                pass
 
     def __iter__(self) -> Iterator[HMMERModel]:
+        if self._workers != 1 and self._path is not None and self._cached is None:
+            from ._parallel import parallel_read_models
+
+            models = parallel_read_models(self._path, self._workers, True, self._dtype)
+            if self._where is not None:
+                models = filter(self._where, models)
+            if self._stats is None:
+                yield from models
+                return
+
+            start = perf_counter()
+            for hmm in models:
+                self._stats.add("read", start)
+                self._count(hmm, None, start)
+                yield hmm
+                start = perf_counter()
+            return
+
         while True:
             try:
                 yield self.read_model()
@@ -199,31 +881,122 @@ class HMMERParser:
         self.close()
 
 
-def _get_node_probs(state) -> OrderedDict:
-    return OrderedDict(list(state.items()))
+@lru_cache(maxsize=None)
+def _empty(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    Read-only empty array, shared by the unparsed models.
+    """
+    return _readonly(np.empty(shape, dtype))
+
+
+def _get_node_probs(symbols, row: np.ndarray) -> OrderedDict:
+    return OrderedDict(zip(symbols, row.tolist()))
+
 
+def _map_file(file: IO[bytes]) -> Optional[mmap.mmap]:
+    if os.fstat(file.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
 
-def open_hmmer(file: Union[str, pathlib.Path, IO[str]]) -> HMMERParser:
+
+def _index_lookup(filepath: pathlib.Path):
+    """
+    Model lookup of a file (see ``_model_lookup``) and record byte ranges.
+    """
+    from ._index import _model_lookup, fetch_index
+
+    df = fetch_index(filepath)
+    offsets = list(zip(df["START"].tolist(), df["END"].tolist()))
+    return _model_lookup(df["NAME"].tolist(), df["ACC"].tolist()), offsets
+
+
+def _record_data(record):
+    if isinstance(record, FileRange):
+        return record.read()
+    return record
+
+
+def _read_record(file: IO[str]) -> str:
+    lines = []
+    for line in iter(file.readline, ""):
+        lines.append(line)
+        if line.lstrip().startswith("//"):
+            break
+    return "".join(lines)
+
+
+def _rows(arr: np.ndarray, n: int, dtype) -> np.ndarray:
+    if arr.shape[0] == n:
+        return arr.astype(dtype, copy=False)
+    return arr[:n].astype(dtype)
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def open_hmmer(
+    file: Union[str, pathlib.Path, IO[str]],
+    dtype=np.float64,
+    workers: Optional[int] = 1,
+    memory_map: bool = False,
+    lazy: bool = False,
+    cache: Union[bool, str, pathlib.Path] = False,
+    stats: Union[bool, Callable[[HMMERModel, ParseStats], None]] = False,
+    where: Optional[Callable[[HMMERModel], bool]] = None,
+) -> HMMERParser:
     """
     Open a HMMER file.
 
+    Files compressed with gzip, bzip2, xz or Zstandard are detected by their
+    magic number and decompressed on the fly.
+
     Parameters
     ----------
     file
         File path or IO stream.
+    dtype
+        Floating-point type of the model matrices. Defaults to ``float64``.
+    workers
+        Number of processes used to iterate over the models of a file path.
+        ``None`` means the number of CPUs. Defaults to ``1``.
+    memory_map
+        Map a file path into memory instead of reading it. Ignored for
+        compressed files. Defaults to ``False``.
+    lazy
+        Parse only the header, metadata and alphabet of each model until its
+        matrices are accessed. Defaults to ``False``.
+    cache
+        Keep the parsed models of a file path in a binary cache, ``True``
+        placing it next to the file and a path naming the cache directory. It
+        is used while the file keeps its size and either its modification
+        time or its content hash. Defaults to ``False``.
+    stats
+        Collect parse statistics, available as ``parser.stats``. A callable
+        is also called as ``stats(hmm, parser.stats)`` after each model is
+        read. Defaults to ``False``.
+    where
+        Predicate selecting the models to read, called with each model once
+        its header, metadata and alphabet are parsed, like
+        ``lambda hmm: hmm.acc.startswith("PF0") and 50 <= hmm.leng <= 500``.
+        The matrices of the rejected models are not parsed, except by worker
+        processes, which parse the models whole and filter them afterwards.
+        Workers also ignore ``lazy`` and ``memory_map``, and iterate from the
+        first model of the file even after ``read_model``. Defaults to
+        ``None``.
 
     Returns
     -------
     parser
         HMMER parser.
     """
-    return HMMERParser(file)
+    return HMMERParser(file, dtype, workers, memory_map, lazy, cache, stats, where)
 
 
 def strip(s):
-    import re
-
-    return re.sub(" +", " ", s.strip())
+    return " ".join(s.split())
 
 
 def num(v):
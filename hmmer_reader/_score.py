@@ -0,0 +1,242 @@
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from ._reader import HMMERModel
+
+__all__ = ["encode_sequences", "ungapped_scores", "viterbi_scores"]
+
+TRANS_INDEX = {"MM": 0, "MI": 1, "MD": 2, "IM": 3, "II": 4, "DM": 5, "DD": 6}
+
+
+def encode_sequences(
+    sequences: Sequence[str], alphabet: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode sequences as symbol indices of an alphabet.
+
+    Symbols are case-insensitive. Symbols out of the alphabet, like ``X`` or
+    ``N``, are encoded as ``len(alphabet)`` and score zero against any state.
+
+    Parameters
+    ----------
+    sequences
+        Sequences.
+    alphabet
+        Alphabet, like ``hmm.alphabet``.
+
+    Returns
+    -------
+    codes
+        Symbol indices, shape (N, L) for N sequences of at most L symbols,
+        padded with ``len(alphabet)``.
+    lengths
+        Sequence lengths, shape (N,).
+    """
+    K = len(alphabet)
+    table = np.full(256, K, dtype=np.intp)
+    for i, a in enumerate(alphabet):
+        table[ord(a.upper())] = i
+        table[ord(a.lower())] = i
+
+    lengths = np.array([len(seq) for seq in sequences], dtype=np.intp)
+    codes = np.full((len(sequences), max(lengths, default=0)), K, dtype=np.intp)
+    for i, seq in enumerate(sequences):
+        raw = np.frombuffer(seq.encode("latin-1", "replace"), dtype=np.uint8)
+        codes[i, : len(raw)] = table[raw]
+    return codes, lengths
+
+
+def ungapped_scores(
+    hmm: HMMERModel, sequences: Sequence[str], background=None
+) -> np.ndarray:
+    """
+    Best ungapped local alignment score of each sequence, MSV style.
+
+    The score of a sequence is the highest sum of match log-odds over a
+    diagonal segment of the model and the sequence. Sequences are processed
+    together, one residue position at a time.
+
+    Parameters
+    ----------
+    hmm
+        Model.
+    sequences
+        Sequences.
+    background
+        See :meth:`hmmer_reader.HMMERModel.log_odds_matrix`.
+
+    Returns
+    -------
+    scores
+        Scores in nats, shape (N,). Empty sequences score ``-inf``.
+    """
+    codes, lengths = encode_sequences(sequences, hmm.alphabet)
+    emit = _emissions(hmm, "match", background)
+    N, M = len(sequences), hmm.M
+
+    best = np.full(N, -np.inf)
+    # Score of the best segment ending at each node, node 0 excluded.
+    seg = np.full((N, M), -np.inf)
+    for i in range(codes.shape[1]):
+        e = emit[codes[:, i], 1:]
+        prev = np.maximum(seg[:, :-1], 0.0)
+        seg[:, 0] = e[:, 0]
+        seg[:, 1:] = prev + e[:, 1:]
+        active = i < lengths
+        best[active] = np.maximum(best[active], seg[active].max(1))
+    return best
+
+
+def viterbi_scores(
+    hmm: HMMERModel, sequences: Sequence[str], background=None, path: bool = False
+):
+    """
+    Best local alignment score of each sequence, Viterbi style.
+
+    Alignments go through the match, insert and delete states of the model
+    with its transition log-probabilities and its emission log-odds. They may
+    start and end at any match state at no cost. HMMER flanking states and
+    length model are not included, so scores are not comparable to HMMER bit
+    scores. Sequences are processed together, one residue position at a time.
+
+    Parameters
+    ----------
+    hmm
+        Model.
+    sequences
+        Sequences.
+    background
+        See :meth:`hmmer_reader.HMMERModel.log_odds_matrix`.
+    path
+        Also return the best alignment of each sequence. Defaults to
+        ``False``.
+
+    Returns
+    -------
+    scores
+        Scores in nats, shape (N,). Empty sequences score ``-inf``.
+    paths
+        Only if ``path`` is ``True``. For each sequence, its alignment as a
+        list of ``(state, node, position)`` tuples, state being ``"M"``,
+        ``"I"`` or ``"D"`` and position the sequence index of the emitted
+        residue, ``-1`` for delete states.
+    """
+    codes, lengths = encode_sequences(sequences, hmm.alphabet)
+    match = _emissions(hmm, "match", background)
+    insert = _emissions(hmm, "insert", background)
+    trans = hmm.trans_matrix.astype(np.float64)
+    N, M, L = len(sequences), hmm.M, codes.shape[1]
+
+    # Transitions into node j (index j - 1) from node j - 1, nodes 1 to M.
+    t_mm, t_im, t_dm = (trans[:-1, TRANS_INDEX[t]] for t in ("MM", "IM", "DM"))
+    t_md, t_dd = trans[:-1, TRANS_INDEX["MD"]], trans[:-1, TRANS_INDEX["DD"]]
+    # Transitions within node j, nodes 1 to M.
+    t_mi, t_ii = trans[1:, TRANS_INDEX["MI"]], trans[1:, TRANS_INDEX["II"]]
+
+    vm = np.full((N, M), -np.inf)
+    vi = np.full((N, M), -np.inf)
+    vd = np.full((N, M), -np.inf)
+
+    best = np.full(N, -np.inf)
+    end = np.zeros((N, 2), dtype=np.intp)
+    if path:
+        ptr_m = np.zeros((L, N, M), dtype=np.int8)
+        ptr_i = np.zeros((L, N, M), dtype=np.int8)
+        ptr_d = np.zeros((L, N, M), dtype=np.int8)
+
+    for i in range(L):
+        em = match[codes[:, i], 1:]
+        ei = insert[codes[:, i], 1:]
+
+        # Match j from node j - 1: local entry, M, I or D. Node 0, the begin
+        # state, is replaced by local entries.
+        cand_m = np.full((4, N, M), -np.inf)
+        cand_m[0] = 0.0
+        np.add(vm[:, :-1], t_mm[1:], out=cand_m[1, :, 1:])
+        np.add(vi[:, :-1], t_im[1:], out=cand_m[2, :, 1:])
+        np.add(vd[:, :-1], t_dm[1:], out=cand_m[3, :, 1:])
+        cand_i = np.stack([vm + t_mi, vi + t_ii])
+
+        if path:
+            ptr_m[i] = cand_m.argmax(0)
+            ptr_i[i] = cand_i.argmax(0)
+
+        vm = cand_m.max(0)
+        vm += em
+        vi = cand_i.max(0)
+        vi += ei
+        vd, from_d = _delete_scan(vm, t_md, t_dd)
+        if path:
+            ptr_d[i] = from_d
+
+        active = i < lengths
+        row = vm.max(1)
+        better = active & (row > best)
+        best[better] = row[better]
+        end[better] = np.stack([np.full(better.sum(), i), vm[better].argmax(1)], 1)
+
+    if not path:
+        return best
+
+    paths = []
+    for n in range(N):
+        if best[n] == -np.inf:
+            paths.append([])
+            continue
+        paths.append(_traceback(ptr_m[:, n], ptr_i[:, n], ptr_d[:, n], *end[n]))
+    return best, paths
+
+
+def _emissions(hmm: HMMERModel, name: str, background) -> np.ndarray:
+    """
+    Log-odds emissions indexed by symbol then node, with a zero row for
+    symbols out of the alphabet.
+    """
+    odds = hmm.log_odds_matrix(name, background).astype(np.float64)
+    return np.vstack([odds.T, np.zeros((1, odds.shape[0]))])
+
+
+def _delete_scan(vm: np.ndarray, t_md: np.ndarray, t_dd: np.ndarray):
+    """
+    Delete scores ``D[j] = max(M[j-1] + t_md[j], D[j-1] + t_dd[j])`` of a row.
+
+    The recurrence is solved as a parallel max-plus prefix scan over the
+    nodes, and also tells whether each delete state comes from a delete state.
+    """
+    N, M = vm.shape
+    a = np.full((N, M), -np.inf)
+    np.add(vm[:, :-1], t_md[1:], out=a[:, 1:])
+    c = np.full((N, M), -np.inf)
+    c[:, 1:] = t_dd[1:]
+    a0 = a.copy()
+
+    s = 1
+    while s < M:
+        np.maximum(a[:, s:], a[:, :-s] + c[:, s:], out=a[:, s:])
+        c[:, s:] += c[:, :-s].copy()
+        s *= 2
+
+    return a, a > a0
+
+
+def _traceback(ptr_m, ptr_i, ptr_d, i: int, j: int) -> List[Tuple[str, int, int]]:
+    steps = []
+    state = "M"
+    while True:
+        if state == "M":
+            steps.append(("M", j + 1, i))
+            prev = ptr_m[i, j]
+            if prev == 0:
+                break
+            state = "MID"[prev - 1]
+            i, j = i - 1, j - 1
+        elif state == "I":
+            steps.append(("I", j + 1, i))
+            state = "MI"[ptr_i[i, j]]
+            i -= 1
+        else:
+            steps.append(("D", j + 1, -1))
+            state = "D" if ptr_d[i, j] else "M"
+            j -= 1
+    return steps[::-1]
@@ -0,0 +1,190 @@
+import mmap
+import os
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from ._cache import (
+    CACHE_DTYPE,
+    _align,
+    _build_cache,
+    _check_cache,
+    _file_key,
+    _model_sizes,
+    _read_header,
+    _write_cache,
+    cache_filepath,
+)
+from ._reader import TRANS_DEF, HMMERModel
+
+__all__ = ["SharedModelStore"]
+
+
+class SharedModelStore:
+    """
+    Models of a HMMER file shared by processes through a memory-mapped file.
+
+    The store is the binary cache file of the HMMER file (see the ``cache``
+    option of :func:`hmmer_reader.open_hmmer`), mapped read-only into memory.
+    Its models are views of the mapping: their matrices are neither copied
+    nor parsed, and the operating system keeps a single copy of them for all
+    the processes using the store. Pickling a store, to send it to worker
+    processes, only pickles its file path.
+
+    Use :meth:`create` to parse a HMMER file once into a store, and the
+    constructor to attach to an existing one.
+
+    Parameters
+    ----------
+    path
+        Store file path, as given by :attr:`path`.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = Path(path)
+        with open(self._path, "rb") as file:
+            header = _read_header(file)
+            if header is None:
+                raise ValueError("Not a model store file.")
+            start = _align(file.tell())
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._models = header["models"]
+        sizes = _model_sizes(header)
+        if len(self._mmap) - start != sizes.sum() * CACHE_DTYPE.itemsize:
+            self._mmap.close()
+            raise ValueError("Model store file is truncated.")
+
+        # Offset table: byte offset of the values of each model.
+        self._offsets = start + (np.cumsum(sizes) - sizes) * CACHE_DTYPE.itemsize
+        self._lookup: Optional[Dict[str, Dict[str, int]]] = None
+
+    @classmethod
+    def create(
+        cls,
+        filepath: Union[str, Path],
+        cache: Union[bool, str, Path] = True,
+        workers: Optional[int] = 1,
+    ) -> "SharedModelStore":
+        """
+        Store of the models of a HMMER file.
+
+        The HMMER file is parsed only if its binary cache is missing or out of
+        date, in which case the cache is written.
+
+        Parameters
+        ----------
+        filepath
+            HMMER file path.
+        cache
+            ``True`` to keep the store next to the HMMER file, or the store
+            directory. A directory in memory, like ``/dev/shm``, avoids disk
+            I/O. Defaults to ``True``.
+        workers
+            Number of processes used to parse the HMMER file. Defaults to
+            ``1``.
+
+        Returns
+        -------
+        store
+            Model store.
+        """
+        filepath = Path(filepath)
+        path = cache_filepath(filepath, None if cache is True else Path(cache))
+        key = _file_key(filepath)
+
+        if _check_cache(path, filepath, key) is None:
+            header, data = _build_cache(filepath, key, workers)
+            _write_cache(path, header, data)
+        return cls(path)
+
+    @property
+    def path(self) -> Path:
+        """
+        Store file path.
+        """
+        return self._path
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __getitem__(self, i: int) -> HMMERModel:
+        """
+        Read-only view of the model at index ``i``, in file order.
+        """
+        if i < 0:
+            i += len(self._models)
+        if not 0 <= i < len(self._models):
+            raise IndexError("Model index out of range.")
+
+        header, metadata, alphabet, M = self._models[i]
+        K = len(alphabet)
+        T = len(TRANS_DEF)
+        shapes = [(K,), (M + 1, K), (M + 1, K), (M + 1, T)]
+
+        offset = int(self._offsets[i])
+        arrays = []
+        for shape in shapes:
+            count = int(np.prod(shape))
+            arr = np.frombuffer(self._mmap, CACHE_DTYPE, count, offset)
+            arrays.append(arr.reshape(shape))
+            offset += count * CACHE_DTYPE.itemsize
+
+        return HMMERModel._from_arrays(header, metadata, alphabet, *arrays)
+
+    def get(self, acc: str) -> HMMERModel:
+        """
+        Get a model by its accession, with or without version.
+        """
+        from ._index import _find_model
+
+        return self[_find_model(self._index(), acc=acc)]
+
+    def get_by_name(self, name: str) -> HMMERModel:
+        """
+        Get a model by its name.
+        """
+        return self[self._index()["NAME"][name]]
+
+    def _index(self) -> Dict[str, Dict[str, int]]:
+        if self._lookup is None:
+            from ._index import _model_lookup
+
+            fields = [dict(metadata) for _, metadata, _, _ in self._models]
+            self._lookup = _model_lookup(
+                [f.get("NAME") for f in fields], [f.get("ACC") for f in fields]
+            )
+        return self._lookup
+
+    def __iter__(self) -> Iterator[HMMERModel]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        """
+        Unmap the store file, once no model view refers to it.
+        """
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Model views still refer to it, as in HMMERParser.close.
+            pass
+
+    def unlink(self):
+        """
+        Remove the store file. Attached processes keep their mapping.
+        """
+        os.unlink(self._path)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        return SharedModelStore, (str(self._path),)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        del exception_type
+        del exception_value
+        del traceback
+        self.close()
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from time import perf_counter
+from typing import Dict, List
+
+__all__ = ["ParseStats"]
+
+PHASES = ("read", "layout", "header", "matrix")
+
+
+class ParseStats:
+    """
+    Parse statistics of a HMMER parser.
+
+    Time is split into phases: ``"read"`` (I/O, decompression and splitting
+    the file into records), ``"layout"`` (locating the sections of a record),
+    ``"header"`` (decoding the header, metadata and alphabet lines) and
+    ``"matrix"`` (converting the numbers of the model matrices). Parsing
+    deferred by lazy or memory-mapped models is accounted for when it
+    happens.
+
+    Attributes
+    ----------
+    models
+        Number of models read.
+    bytes
+        Number of record bytes read.
+    lines
+        Number of record lines read.
+    seconds
+        Time spent in each phase, in seconds.
+    model_seconds
+        Time spent reading and parsing each model, in read order.
+    """
+
+    def __init__(self):
+        self.models = 0
+        self.bytes = 0
+        self.lines = 0
+        self.seconds: Dict[str, float] = OrderedDict((p, 0.0) for p in PHASES)
+        self.model_seconds: List[float] = []
+
+    def add(self, phase: str, start: float) -> float:
+        """
+        Add the time elapsed since ``start`` to a phase.
+
+        Returns
+        -------
+        now
+            Current :func:`time.perf_counter` value, the start of a next phase.
+        """
+        now = perf_counter()
+        self.seconds[phase] += now - start
+        return now
+
+    def add_model(self, data, seconds: float):
+        """
+        Count a model record and the time spent reading and parsing it.
+        """
+        self.models += 1
+        if data is not None:
+            self.bytes += len(data)
+            self.lines += bytes(data).count(b"\n")
+        self.model_seconds.append(seconds)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def as_dict(self) -> dict:
+        """
+        Counters and phase times as a dictionary.
+        """
+        stats = OrderedDict(models=self.models, bytes=self.bytes, lines=self.lines)
+        for phase, seconds in self.seconds.items():
+            stats[f"{phase}_seconds"] = seconds
+        stats["total_seconds"] = self.total_seconds
+        return stats
+
+    def __str__(self):
+        total = self.total_seconds
+        msg = f"Models       {self.models}\n"
+        msg += f"Bytes        {self.bytes}\n"
+        msg += f"Lines        {self.lines}\n"
+        for phase, seconds in self.seconds.items():
+            share = seconds / total * 100 if total > 0 else 0.0
+            msg += f"{phase.capitalize():<12} {seconds:.6f} s ({share:.1f}%)\n"
+        msg += f"Total        {total:.6f} s"
+        if total > 0:
+            msg += f"\nThroughput   {self.bytes / total / 1e6:.1f} MB/s, "
+            msg += f"{self.models / total:.1f} models/s"
+        if len(self.model_seconds) > 0:
+            msg += f"\nSlowest      {max(self.model_seconds):.6f} s per model"
+        return msg
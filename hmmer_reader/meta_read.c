@@ -1,244 +1,298 @@
-#include <errno.h>
 #include <stdbool.h>
 #include <stdio.h>
+#include <stdlib.h>
 #include <string.h>
 
-#ifndef MIN
-#define MIN(X, Y) ((X) < (Y) ? (X) : (Y))
-#endif
+#include "meta_read.h"
 
-#define ERR_FILE 1
 #define ERR_PARSER 2
+#define ERR_MEMORY 3
 
-enum token
-{
-    UNK = 0,
-    NAME = 1,
-    ACC = 2,
-    LENG = 3,
-    ALPH = 4,
-    END = 5,
-};
-
-static enum token const TOKEN_ENUMS[] = {NAME, ACC, LENG, ALPH, END};
-static char const*      TOKEN_STRINGS[] = {"NAME", "ACC", "LENG", "ALPH", "//"};
-static unsigned const   TOKEN_SIZES[] = {4, 3, 4, 4, 2};
-
-struct string
+/* Growable byte buffer, always NUL-terminated. */
+struct buffer
 {
     char*  data;
     size_t size;
+    size_t capacity;
 };
 
-static inline bool string_equal(struct string* str, char const* data, size_t size)
+static void buffer_init(struct buffer* buf)
 {
-    return strncmp(str->data, data, MIN(str->size, size)) == 0;
+    buf->data = NULL;
+    buf->size = 0;
+    buf->capacity = 0;
 }
 
-struct HMMFile
-{
-    FILE*          file;
-    FILE* restrict estream;
-    struct string  token;
-    size_t         line_num;
-    char           line[256 * 1024];
-};
-
-static inline void hmmfile_error(struct HMMFile const* hmmfile, char const* msg)
+static bool buffer_append(struct buffer* buf, void const* data, size_t size)
 {
-    fprintf(hmmfile->estream, "%s\n", msg);
+    size_t needed = buf->size + size + 1;
+    if (needed > buf->capacity) {
+        size_t capacity = buf->capacity ? buf->capacity : 256;
+        while (capacity < needed)
+            capacity *= 2;
+        char* tmp = realloc(buf->data, capacity);
+        if (!tmp)
+            return false;
+        buf->data = tmp;
+        buf->capacity = capacity;
+    }
+    memcpy(buf->data + buf->size, data, size);
+    buf->size += size;
+    buf->data[buf->size] = '\0';
+    return true;
 }
 
-static inline void hmmfile_parser_error(struct HMMFile const* hmmfile)
+static inline bool meta_is_space(char c)
 {
-    fprintf(hmmfile->estream, "could not parse line %zu\n", hmmfile->line_num);
+    return c == ' ' || c == '\t' || c == '\r' || c == '\n';
 }
 
-static inline int hmmfile_next_line(struct HMMFile* hmmfile)
+/* Header line key, like "NAME" or "STATS LOCAL MSV", and its values. */
+struct field
 {
-    hmmfile->token.data = hmmfile->line;
-    hmmfile->token.size = 0;
-    ++hmmfile->line_num;
-    return fgets(hmmfile->line, sizeof(hmmfile->line), hmmfile->file) != NULL;
-}
+    char*  key;
+    size_t key_size;
+    bool   required;
+    bool   found;
+    /* Value of the current record. */
+    struct buffer value;
+    /* Values of the collected records, each one followed by a newline. A
+     * missing optional value is an empty line. */
+    struct buffer column;
+};
 
-static int hmmfile_next_token(struct HMMFile* hmmfile, bool skip_space)
+struct meta_scanner
 {
+    /* Line split across fed blocks. */
+    struct buffer line;
+    struct field* fields;
+    unsigned      nfields;
+    struct buffer starts;
+    struct buffer ends;
+    size_t        nrows;
+    size_t        line_num;
+    long long     offset;
+    long long     start;
+    bool          ended;
+    int           err;
+    char          errmsg[128];
+};
 
-    while (*hmmfile->token.data == ' ' && *hmmfile->token.data != '\n')
-        ++hmmfile->token.data;
-
-    char const* stop = hmmfile->token.data;
-
-    while ((skip_space || *stop != ' ') && *stop != '\n')
-        ++stop;
+struct meta_scanner* meta_scanner_new(char const* const* keys, bool const* required,
+                                      unsigned nfields)
+{
+    struct meta_scanner* scanner = malloc(sizeof(*scanner));
+    if (!scanner)
+        return NULL;
+
+    scanner->fields = calloc(nfields, sizeof(*scanner->fields));
+    scanner->nfields = nfields;
+    if (!scanner->fields) {
+        free(scanner);
+        return NULL;
+    }
 
-    hmmfile->token.size = stop - hmmfile->token.data;
-    return hmmfile->token.size == 0;
+    /* Everything meta_scanner_del frees is set before any key allocation. */
+    buffer_init(&scanner->line);
+    buffer_init(&scanner->starts);
+    buffer_init(&scanner->ends);
+    scanner->nrows = 0;
+    scanner->line_num = 0;
+    scanner->offset = 0;
+    scanner->start = 0;
+    scanner->ended = false;
+    scanner->err = 0;
+    scanner->errmsg[0] = '\0';
+
+    for (unsigned i = 0; i < nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        field->key_size = strlen(keys[i]);
+        field->required = required[i];
+        field->found = false;
+        buffer_init(&field->value);
+        buffer_init(&field->column);
+        field->key = malloc(field->key_size + 1);
+        if (!field->key) {
+            meta_scanner_del(scanner);
+            return NULL;
+        }
+        memcpy(field->key, keys[i], field->key_size + 1);
+    }
+    return scanner;
 }
 
-static inline struct HMMFile hmmfile_open(char const* restrict path, FILE* restrict estream)
+void meta_scanner_del(struct meta_scanner* scanner)
 {
-    struct HMMFile hmmfile;
-    hmmfile.file = fopen(path, "r");
-    hmmfile.estream = estream;
-    hmmfile.token.data = NULL;
-    hmmfile.token.size = 0;
-    hmmfile.line_num = 0;
-    return hmmfile;
+    free(scanner->line.data);
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        free(scanner->fields[i].key);
+        free(scanner->fields[i].value.data);
+        free(scanner->fields[i].column.data);
+    }
+    free(scanner->fields);
+    free(scanner->starts.data);
+    free(scanner->ends.data);
+    free(scanner);
 }
 
-static void hmmfile_close(struct HMMFile* hmmfile) { fclose(hmmfile->file); }
-
-static int hmmfile_check_eof(struct HMMFile* hmmfile)
+static int scanner_error(struct meta_scanner* scanner, int err, char const* msg)
 {
-    if (!feof(hmmfile->file)) {
-        if (ferror(hmmfile->file)) {
-            fprintf(hmmfile->estream, "file error (%s)\n", strerror(errno));
-            return ERR_FILE;
-        } else {
-            hmmfile_error(hmmfile, "stream ended prematurely");
-            return ERR_FILE;
-        }
-    }
-    return 0;
+    if (err == ERR_PARSER && scanner->line_num > 0)
+        snprintf(scanner->errmsg, sizeof(scanner->errmsg), "%s at line %zu", msg,
+                 scanner->line_num);
+    else
+        snprintf(scanner->errmsg, sizeof(scanner->errmsg), "%s", msg);
+    return scanner->err = err;
 }
 
-static enum token hmmfile_token(struct HMMFile* hmmfile)
+static int scanner_commit(struct meta_scanner* scanner, long long end)
 {
-    for (unsigned i = 0; i < 5; ++i) {
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        if (scanner->fields[i].required && !scanner->fields[i].found)
+            return scanner_error(scanner, ERR_PARSER, "some metadata is missing");
+    }
 
-        if (string_equal(&hmmfile->token, TOKEN_STRINGS[i], TOKEN_SIZES[i])) {
-            return TOKEN_ENUMS[i];
-        }
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        if (!buffer_append(&field->column, field->value.data, field->value.size) ||
+            !buffer_append(&field->column, "\n", 1))
+            return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+        field->value.size = 0;
+        field->found = false;
     }
 
-    return UNK;
-}
+    if (!buffer_append(&scanner->starts, &scanner->start, sizeof(scanner->start)) ||
+        !buffer_append(&scanner->ends, &end, sizeof(end)))
+        return scanner_error(scanner, ERR_MEMORY, "not enough memory");
 
-#define META_BUFSIZE_NAME 1024
-#define META_BUFSIZE_ACC 16
-#define META_BUFSIZE_LENG 8
-#define META_BUFSIZE_ALPH 8
-#define META_BUFSIZE                                                                          \
-    (META_BUFSIZE_NAME + META_BUFSIZE_ACC + META_BUFSIZE_LENG + META_BUFSIZE_ALPH)
+    ++scanner->nrows;
+    scanner->start = end;
+    return 0;
+}
 
-struct meta
+/* Process a whole line, its newline included if any. */
+static int scanner_line(struct meta_scanner* scanner, char const* line, size_t size)
 {
-    struct string name;
-    struct string acc;
-    struct string leng;
-    struct string alph;
-    char          buffer[META_BUFSIZE];
-};
+    char const* end = line + size;
+    long long   line_end = scanner->offset + (long long)size;
+    ++scanner->line_num;
+
+    char const* tok = line;
+    while (tok < end && meta_is_space(*tok))
+        ++tok;
+
+    if (tok == end) {
+        /* Blank lines carry no information and do not start a record. */
+        if (scanner->start == scanner->offset)
+            scanner->start = line_end;
+        scanner->offset = line_end;
+        return 0;
+    }
 
-static inline void meta_print_header(struct meta const* meta, FILE* restrict ostream)
-{
-    fprintf(ostream, "NAME\tACC\tLENG\tALPH\n");
+    scanner->ended = end - tok >= 2 && tok[0] == '/' && tok[1] == '/';
+    if (scanner->ended) {
+        scanner->offset = line_end;
+        return scanner_commit(scanner, line_end);
+    }
+
+    for (unsigned i = 0; i < scanner->nfields; ++i) {
+        struct field* field = &scanner->fields[i];
+        if ((size_t)(end - tok) <= field->key_size ||
+            memcmp(tok, field->key, field->key_size) || !meta_is_space(tok[field->key_size]))
+            continue;
+
+        char const* val = tok + field->key_size;
+        while (val < end && meta_is_space(*val))
+            ++val;
+        char const* val_end = end;
+        while (val_end > val && meta_is_space(val_end[-1]))
+            --val_end;
+        if (val == val_end)
+            return scanner_error(scanner, ERR_PARSER, "could not parse line");
+
+        field->value.size = 0;
+        if (!buffer_append(&field->value, val, val_end - val))
+            return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+        field->found = true;
+    }
+
+    scanner->offset = line_end;
+    return 0;
 }
 
-static void meta_init(struct meta* meta)
+int meta_scanner_feed(struct meta_scanner* scanner, char const* data, size_t size)
 {
-    meta->name.data = meta->buffer;
-    meta->name.size = 0;
+    char const* end = data + size;
 
-    meta->acc.data = meta->name.data + META_BUFSIZE_NAME;
-    meta->acc.size = 0;
+    if (scanner->err)
+        return scanner->err;
 
-    meta->leng.data = meta->acc.data + META_BUFSIZE_ACC;
-    meta->leng.size = 0;
+    while (data < end) {
+        char const* eol = memchr(data, '\n', end - data);
+        if (!eol) {
+            if (!buffer_append(&scanner->line, data, end - data))
+                return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+            break;
+        }
 
-    meta->alph.data = meta->leng.data + META_BUFSIZE_LENG;
-    meta->alph.size = 0;
+        size_t n = eol + 1 - data;
+        if (scanner->line.size == 0) {
+            if (scanner_line(scanner, data, n))
+                return scanner->err;
+        } else {
+            if (!buffer_append(&scanner->line, data, n))
+                return scanner_error(scanner, ERR_MEMORY, "not enough memory");
+            if (scanner_line(scanner, scanner->line.data, scanner->line.size))
+                return scanner->err;
+            scanner->line.size = 0;
+        }
+        data += n;
+    }
+    return 0;
 }
 
-static void meta_reset(struct meta* meta)
+int meta_scanner_finish(struct meta_scanner* scanner)
 {
-    meta->name.size = 0;
-    meta->acc.size = 0;
-    meta->leng.size = 0;
-    meta->alph.size = 0;
-}
+    if (scanner->err)
+        return scanner->err;
 
-static void meta_set(struct meta* meta, enum token token, struct string token_string)
-{
-    /* TODO check overflow */
-    if (token == NAME) {
-        memcpy(meta->name.data, token_string.data, token_string.size);
-        meta->name.size = token_string.size;
-    } else if (token == ACC) {
-        memcpy(meta->acc.data, token_string.data, token_string.size);
-        meta->acc.size = token_string.size;
-    } else if (token == LENG) {
-        memcpy(meta->leng.data, token_string.data, token_string.size);
-        meta->leng.size = token_string.size;
-    } else if (token == ALPH) {
-        memcpy(meta->alph.data, token_string.data, token_string.size);
-        meta->alph.size = token_string.size;
+    if (scanner->line.size > 0) {
+        if (scanner_line(scanner, scanner->line.data, scanner->line.size))
+            return scanner->err;
+        scanner->line.size = 0;
     }
+
+    if (!scanner->ended)
+        return scanner_error(scanner, ERR_PARSER, "ending token is missing");
+    return 0;
 }
 
-static inline void meta_print(struct meta const* meta, FILE* restrict ostream)
+char const* meta_scanner_error(struct meta_scanner const* scanner) { return scanner->errmsg; }
+
+size_t meta_scanner_nrows(struct meta_scanner const* scanner) { return scanner->nrows; }
+
+char const* meta_scanner_column(struct meta_scanner const* scanner, unsigned field,
+                                size_t* size)
 {
-    fprintf(ostream, "%.*s\t%.*s\t%.*s\t%.*s\n", (int)meta->name.size, meta->name.data,
-            (int)meta->acc.size, meta->acc.data, (int)meta->leng.size, meta->leng.data,
-            (int)meta->alph.size, meta->alph.data);
+    *size = scanner->fields[field].column.size;
+    return scanner->fields[field].column.data;
 }
 
-static inline bool meta_allset(struct meta const* meta)
+long long const* meta_scanner_starts(struct meta_scanner const* scanner)
 {
-    return (meta->name.size > 0 && meta->acc.size > 0 && meta->leng.size > 0 &&
-            meta->alph.size > 0);
+    return (long long const*)scanner->starts.data;
 }
 
-int meta_read(char const* filepath, FILE* restrict ostream, FILE* restrict estream)
+long long const* meta_scanner_ends(struct meta_scanner const* scanner)
 {
-    struct HMMFile hmmfile = hmmfile_open(filepath, estream);
-    if (!hmmfile.file)
-        return ERR_FILE;
-
-    struct meta meta;
-    meta_init(&meta);
-    meta_print_header(&meta, ostream);
-
-    enum token token = UNK;
-    int        err = 0;
-
-    while (hmmfile_next_line(&hmmfile)) {
-        if (hmmfile_next_token(&hmmfile, false)) {
-            hmmfile_parser_error(&hmmfile);
-            goto err;
-        }
-        token = hmmfile_token(&hmmfile);
-        if (token >= NAME && token <= ALPH) {
-            hmmfile.token.data += hmmfile.token.size;
-            if (hmmfile_next_token(&hmmfile, true)) {
-                hmmfile_parser_error(&hmmfile);
-                err = ERR_PARSER;
-                goto err;
-            }
-            meta_set(&meta, token, hmmfile.token);
-        } else if (token == END) {
-            if (!meta_allset(&meta)) {
-                hmmfile_error(&hmmfile, "some metadata is missing");
-                err = ERR_PARSER;
-                goto err;
-            }
-            meta_print(&meta, ostream);
-            meta_reset(&meta);
-        }
-    }
-    if (token != END) {
-        hmmfile_error(&hmmfile, "ending token is missing");
-        err = ERR_PARSER;
-        goto err;
-    }
-
-    err = hmmfile_check_eof(&hmmfile);
-    hmmfile_close(&hmmfile);
-    return err;
+    return (long long const*)scanner->ends.data;
+}
 
-err:
-    hmmfile_close(&hmmfile);
-    return err;
+void meta_scanner_clear(struct meta_scanner* scanner)
+{
+    for (unsigned i = 0; i < scanner->nfields; ++i)
+        scanner->fields[i].column.size = 0;
+    scanner->starts.size = 0;
+    scanner->ends.size = 0;
+    scanner->nrows = 0;
 }
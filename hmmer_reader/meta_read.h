@@ -1 +1,14 @@
-int meta_read(char const* filepath, FILE* restrict ostream, FILE* restrict estream);
+struct meta_scanner;
+
+struct meta_scanner* meta_scanner_new(char const* const* keys, bool const* required,
+                                      unsigned nfields);
+int         meta_scanner_feed(struct meta_scanner* scanner, char const* data, size_t size);
+int         meta_scanner_finish(struct meta_scanner* scanner);
+char const* meta_scanner_error(struct meta_scanner const* scanner);
+size_t      meta_scanner_nrows(struct meta_scanner const* scanner);
+char const* meta_scanner_column(struct meta_scanner const* scanner, unsigned field,
+                                size_t* size);
+long long const* meta_scanner_starts(struct meta_scanner const* scanner);
+long long const* meta_scanner_ends(struct meta_scanner const* scanner);
+void             meta_scanner_clear(struct meta_scanner* scanner);
+void             meta_scanner_del(struct meta_scanner* scanner);
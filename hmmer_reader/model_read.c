@@ -0,0 +1,266 @@
+#include <math.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#include "model_read.h"
+
+#ifndef ERR_PARSER
+#define ERR_PARSER 2
+#endif
+
+#define MODEL_NTRANS 7
+
+struct cursor
+{
+    char const* pos;
+    char const* end;
+    char const* line;
+    char const* eol;
+    size_t      line_num;
+};
+
+static inline char const* line_end(char const* pos, char const* end)
+{
+    char const* eol = memchr(pos, '\n', end - pos);
+    return eol ? eol + 1 : end;
+}
+
+static inline bool is_space(char c) { return c == ' ' || c == '\t' || c == '\r'; }
+
+static inline char const* skip_spaces(char const* pos, char const* eol)
+{
+    while (pos < eol && is_space(*pos))
+        ++pos;
+    return pos;
+}
+
+static inline bool cursor_next_line(struct cursor* cur)
+{
+    if (cur->pos >= cur->end)
+        return false;
+    cur->line = cur->pos;
+    cur->eol = line_end(cur->pos, cur->end);
+    cur->pos = cur->eol;
+    ++cur->line_num;
+    return true;
+}
+
+static inline bool token_is(char const* tok, char const* eol, char const* str, size_t size)
+{
+    return (size_t)(eol - tok) >= size && memcmp(tok, str, size) == 0 &&
+           (tok + size == eol || is_space(tok[size]) || tok[size] == '\n');
+}
+
+static double const POW10[] = {1e0,  1e1,  1e2,  1e3,  1e4,  1e5,  1e6,  1e7,
+                               1e8,  1e9,  1e10, 1e11, 1e12, 1e13, 1e14, 1e15,
+                               1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22};
+
+/* Parse a decimal number within [pos, eol) without reading past eol. */
+static bool parse_double(char const* pos, char const* eol, double* value, char const** stop)
+{
+    char const* p = pos;
+    bool        neg = false;
+    uint64_t    mant = 0;
+    unsigned    ndigits = 0;
+    unsigned    nfrac = 0;
+
+    if (p < eol && (*p == '-' || *p == '+'))
+        neg = *p++ == '-';
+
+    while (p < eol && *p >= '0' && *p <= '9') {
+        mant = mant * 10 + (uint64_t)(*p++ - '0');
+        ++ndigits;
+    }
+    if (p < eol && *p == '.') {
+        ++p;
+        while (p < eol && *p >= '0' && *p <= '9') {
+            mant = mant * 10 + (uint64_t)(*p++ - '0');
+            ++ndigits;
+            ++nfrac;
+        }
+    }
+    if (ndigits == 0)
+        return false;
+
+    bool has_exp = p < eol && (*p == 'e' || *p == 'E');
+    if (!has_exp && ndigits <= 15 && nfrac <= 22) {
+        /* Both operands are exact, so the division is correctly rounded. */
+        double v = (double)mant / POW10[nfrac];
+        *value = neg ? -v : v;
+        *stop = p;
+        return true;
+    }
+
+    char   buf[64];
+    size_t n = 0;
+    while (pos + n < eol && n < sizeof(buf) - 1 && !is_space(pos[n]) && pos[n] != '\n')
+        ++n;
+    memcpy(buf, pos, n);
+    buf[n] = '\0';
+
+    char* end = NULL;
+    *value = strtod(buf, &end);
+    if (end == buf)
+        return false;
+    *stop = pos + (end - buf);
+    return true;
+}
+
+static bool read_number(char const** pos, char const* eol, double* value)
+{
+    char const* p = skip_spaces(*pos, eol);
+    if (p == eol || *p == '\n')
+        return false;
+
+    char const* stop = p + 1;
+    if (*p == '*') {
+        *value = -INFINITY;
+    } else if (parse_double(p, eol, value, &stop)) {
+        /* HMMER stores negated natural logarithms. */
+        *value = -*value;
+    } else {
+        return false;
+    }
+
+    if (stop < eol && !is_space(*stop) && *stop != '\n')
+        return false;
+
+    *pos = stop;
+    return true;
+}
+
+static bool read_numbers(char const** pos, char const* eol, unsigned n, double* values)
+{
+    for (unsigned i = 0; i < n; ++i) {
+        if (!read_number(pos, eol, values + i))
+            return false;
+    }
+    return true;
+}
+
+static bool skip_token(char const** pos, char const* eol)
+{
+    char const* p = skip_spaces(*pos, eol);
+    if (p == eol || *p == '\n')
+        return false;
+    while (p < eol && !is_space(*p) && *p != '\n')
+        ++p;
+    *pos = p;
+    return true;
+}
+
+static size_t count_lines(char const* pos, char const* end)
+{
+    size_t n = 0;
+    while ((pos = memchr(pos, '\n', end - pos)) != NULL) {
+        ++pos;
+        ++n;
+    }
+    return n;
+}
+
+int model_layout(char const* data, size_t size, struct model_layout* layout)
+{
+    char const* end = data + size;
+    char const* line = data;
+
+    /* Skip blank lines before the header. */
+    while (line < end && skip_spaces(line, end) < end && *skip_spaces(line, end) == '\n')
+        line = skip_spaces(line, end) + 1;
+    line = line_end(line, end);
+
+    layout->header_end = line - data;
+    layout->meta_end = size;
+    layout->alph_end = size;
+    layout->body_start = size;
+    layout->body_lines = 0;
+
+    while (line < end) {
+        char const* eol = line_end(line, end);
+        char const* tok = skip_spaces(line, eol);
+        if (token_is(tok, eol, "HMM", 3) && tok + 3 < eol && is_space(tok[3])) {
+            layout->meta_end = line - data;
+            layout->alph_end = eol - data;
+            /* The line after the alphabet names the transitions. */
+            layout->body_start = line_end(eol, end) - data;
+            layout->body_lines = count_lines(data + layout->body_start, end);
+            return 0;
+        }
+        line = eol;
+    }
+
+    return ERR_PARSER;
+}
+
+int model_read(char const* data, size_t size, unsigned K, size_t max_nodes, double* compo,
+               double* match, double* insert, double* trans, size_t* nnodes, size_t* line_num)
+{
+    struct cursor cur = {data, data + size, data, data, 0};
+    char const*   p = NULL;
+    size_t        k = 0;
+
+    *nnodes = 0;
+    /* No room for the begin node, or no symbol to emit. */
+    if (max_nodes == 0 || K == 0)
+        goto err;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = skip_spaces(cur.line, cur.eol);
+    if (!token_is(p, cur.eol, "COMPO", 5))
+        goto err;
+    p += 5;
+    if (!read_numbers(&p, cur.eol, K, compo))
+        goto err;
+
+    for (unsigned i = 0; i < K; ++i)
+        match[i] = -INFINITY;
+    match[0] = 0.0;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = cur.line;
+    if (!read_numbers(&p, cur.eol, K, insert))
+        goto err;
+
+    if (!cursor_next_line(&cur))
+        goto err;
+    p = cur.line;
+    if (!read_numbers(&p, cur.eol, MODEL_NTRANS, trans))
+        goto err;
+
+    while (cursor_next_line(&cur)) {
+        p = skip_spaces(cur.line, cur.eol);
+        if (token_is(p, cur.eol, "//", 2)) {
+            *nnodes = k + 1;
+            *line_num = cur.line_num;
+            return 0;
+        }
+
+        if (++k >= max_nodes)
+            goto err;
+
+        if (!skip_token(&p, cur.eol))
+            goto err;
+        if (!read_numbers(&p, cur.eol, K, match + k * K))
+            goto err;
+
+        if (!cursor_next_line(&cur))
+            goto err;
+        p = cur.line;
+        if (!read_numbers(&p, cur.eol, K, insert + k * K))
+            goto err;
+
+        if (!cursor_next_line(&cur))
+            goto err;
+        p = cur.line;
+        if (!read_numbers(&p, cur.eol, MODEL_NTRANS, trans + k * MODEL_NTRANS))
+            goto err;
+    }
+
+err:
+    *line_num = cur.line_num;
+    return ERR_PARSER;
+}
@@ -0,0 +1,13 @@
+struct model_layout
+{
+    size_t header_end;
+    size_t meta_end;
+    size_t alph_end;
+    size_t body_start;
+    size_t body_lines;
+};
+
+int model_layout(char const* data, size_t size, struct model_layout* layout);
+int model_read(char const* data, size_t size, unsigned K, size_t max_nodes, double* compo,
+               double* match, double* insert, double* trans, size_t* nnodes,
+               size_t* line_num);
@@ -0,0 +1,43 @@
+#include <stdbool.h>
+#include <stddef.h>
+#include <string.h>
+
+#include "record_count.h"
+
+void record_counter_init(struct record_counter* counter, bool line_start)
+{
+    counter->count = 0;
+    counter->line_start = line_start;
+    counter->pending = false;
+}
+
+/* Count the lines starting with "//". Slashes are rare in HMMER files, so
+ * looking for them is much faster than going through every line. */
+void record_counter_feed(struct record_counter* counter, char const* data, size_t size)
+{
+    if (size == 0)
+        return;
+
+    if (counter->pending && data[0] == '/')
+        ++counter->count;
+    counter->pending = false;
+
+    char const* end = data + size;
+    char const* pos = data;
+    while ((pos = memchr(pos, '/', end - pos)) != NULL) {
+        bool line_start = pos == data ? counter->line_start : pos[-1] == '\n';
+        if (line_start) {
+            if (pos + 1 == end) {
+                counter->pending = true;
+                break;
+            }
+            if (pos[1] == '/') {
+                ++counter->count;
+                ++pos;
+            }
+        }
+        ++pos;
+    }
+
+    counter->line_start = end[-1] == '\n';
+}
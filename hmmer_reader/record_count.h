@@ -0,0 +1,9 @@
+struct record_counter
+{
+    unsigned long long count;
+    bool               line_start;
+    bool               pending;
+};
+
+void record_counter_init(struct record_counter* counter, bool line_start);
+void record_counter_feed(struct record_counter* counter, char const* data, size_t size);
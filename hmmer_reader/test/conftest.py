@@ -0,0 +1,48 @@
+import gzip
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
+
+import importlib_resources as pkg_resources
+import pytest
+
+import hmmer_reader
+
+
+@pytest.fixture
+def write_db(tmp_path: Path) -> Callable[..., Path]:
+    """
+    Function writing data files, decompressed and concatenated, to a HMMER file.
+    """
+
+    def write(
+        files: Union[str, Sequence[str]] = "three-profs.hmm.gz",
+        copies: int = 1,
+        filename: str = "db.hmm",
+        directory: Optional[Path] = None,
+    ) -> Path:
+        content = b""
+        for name in [files] if isinstance(files, str) else files:
+            buffer = pkg_resources.open_binary(hmmer_reader.data, name)
+            content += gzip.decompress(buffer.read())
+            buffer.close()
+
+        filepath = (tmp_path if directory is None else directory) / filename
+        filepath.write_bytes(content * copies)
+        return filepath
+
+    return write
+
+
+@pytest.fixture
+def no_parsing(monkeypatch) -> Callable[[], None]:
+    """
+    Function making the test fail if a HMMER file is parsed for the cache.
+    """
+
+    def parse(*args, **kwargs):
+        raise AssertionError("The HMMER file should not be parsed.")
+
+    def forbid():
+        monkeypatch.setattr(hmmer_reader._cache, "open_hmmer", parse)
+
+    return forbid
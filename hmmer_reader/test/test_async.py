@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import importlib_resources as pkg_resources
+import numpy as np
+import pytest
+
+import hmmer_reader
+from hmmer_reader import ParsingError, open_hmmer, open_hmmer_async
+
+
+def test_async_iter(write_db):
+    filepath = write_db(copies=5)
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    async def read(prefetch, executor):
+        models = []
+        async with open_hmmer_async(
+            filepath, prefetch=prefetch, executor=executor
+        ) as p:
+            async for hmm in p:
+                models.append(hmm)
+            with pytest.raises(StopAsyncIteration):
+                await p.read_model()
+        return models
+
+    with ThreadPoolExecutor(4) as executor:
+        for prefetch in [1, 3, 20]:
+            for ex in [None, executor]:
+                models = asyncio.run(read(prefetch, ex))
+                assert [m.metadata for m in models] == [m.metadata for m in hmms]
+                for a, b in zip(models, hmms):
+                    assert np.array_equal(a.match_matrix, b.match_matrix)
+
+
+def test_async_get(write_db):
+    filepath = write_db()
+
+    async def run():
+        async with open_hmmer_async(filepath, lazy=True) as parser:
+            tasks = [parser.get("PF09847.9"), parser.get_by_name("1-cysPrx_C")]
+            tasks.append(parser.read_model())
+            return await asyncio.gather(*tasks)
+
+    a, b, c = asyncio.run(run())
+    assert a.M == 449
+    assert b.M == 40
+    assert dict(c.metadata)["ACC"] == "PF10417.9"
+
+
+def test_async_invalid_file():
+    async def run(buffer):
+        async with open_hmmer_async(buffer) as parser:
+            return [hmm async for hmm in parser]
+
+    buffer = pkg_resources.open_text(hmmer_reader.data, "A0ALD9.fasta")
+    with pytest.raises(ParsingError):
+        asyncio.run(run(buffer))
+    buffer.close()
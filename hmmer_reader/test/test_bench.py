@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from hmmer_reader import (
+    bench,
+    cli_bench,
+    fetch_metadata,
+    num_models,
+    open_hmmer,
+    synthetic_hmm,
+)
+
+
+@pytest.mark.parametrize("alphabet,K", [("amino", 20), ("DNA", 4)])
+def test_synthetic_hmm(tmp_path: Path, alphabet: str, K: int):
+    filepath = synthetic_hmm(tmp_path / "synth.hmm", 3, 25, alphabet)
+
+    assert num_models(filepath) == 3
+    with open_hmmer(filepath) as hmmfile:
+        hmms = list(hmmfile)
+
+    for i, hmm in enumerate(hmms):
+        assert dict(hmm.metadata)["NAME"] == f"SYNTH{i}"
+        assert hmm.M == 25
+        assert len(hmm.alphabet) == K
+        assert np.allclose(hmm.prob_matrix("match")[1:].sum(1), 1.0, atol=1e-3)
+        assert np.allclose(hmm.prob_matrix("insert").sum(1), 1.0, atol=1e-3)
+        trans = np.exp(hmm.trans_matrix)
+        assert np.allclose(trans[:, :3].sum(1), 1.0, atol=1e-3)
+        assert trans[0, 6] == 0.0
+
+    df = fetch_metadata(filepath, ["ACC", "LENG", "ALPH", "GA_SEQ"])
+    assert list(df["ACC"]) == ["SY0.1", "SY1.1", "SY2.1"]
+    assert list(df["ALPH"]) == [alphabet] * 3
+    assert list(df["GA_SEQ"]) == [25.0] * 3
+
+    assert synthetic_hmm(tmp_path / "synth2.hmm", 3, 25, alphabet).read_bytes() == (
+        filepath.read_bytes()
+    )
+
+
+def test_bench(tmp_path: Path):
+    cases = ["parse", "num_models"]
+    results = bench(nmodels=5, M=10, cases=cases, repeat=1, save=tmp_path / "b.json")
+
+    assert [r["name"] for r in results] == cases
+    for r in results:
+        assert r["seconds"] > 0
+        assert r["models_s"] == pytest.approx(5 / r["seconds"])
+        assert "ratio" not in r
+
+    saved = json.loads((tmp_path / "b.json").read_text())
+    assert saved["params"] == {"nmodels": 5, "M": 10, "alphabet": "amino"}
+
+    results = bench(
+        nmodels=5, M=10, cases=cases, repeat=1, baseline=tmp_path / "b.json"
+    )
+    assert all(r["ratio"] > 0 for r in results)
+
+    with pytest.raises(ValueError):
+        bench(nmodels=6, M=10, cases=cases, baseline=tmp_path / "b.json")
+
+    with pytest.raises(ValueError):
+        bench(cases=["unknown"])
+
+
+def test_cli_bench(tmp_path: Path):
+    filepath = synthetic_hmm(tmp_path / "synth.hmm", 4, 10)
+
+    runner = CliRunner()
+    args = ["--file", str(filepath), "--case", "cli_select", "--repeat", "1"]
+    r = runner.invoke(cli_bench, args + ["--save", str(tmp_path / "b.json")])
+    assert r.exit_code == 0
+    assert r.stdout.splitlines()[1].startswith("cli_select")
+    # The index is built next to a copy of the file.
+    assert not (tmp_path / "synth.hmm.idx").exists()
+
+    r = runner.invoke(
+        cli_bench, args + ["--baseline", str(tmp_path / "b.json"), "--max-ratio", "0"]
+    )
+    assert r.exit_code == 1
+    assert "Slower than the baseline: cli_select." in r.output
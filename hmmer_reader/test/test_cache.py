@@ -0,0 +1,96 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hmmer_reader import open_hmmer
+from hmmer_reader._cache import cache_filepath
+
+
+def no_hashing(filepath: Path):
+    raise AssertionError("The HMMER file should not be hashed.")
+
+
+def no_opening(filepath: Path):
+    raise AssertionError("The HMMER file should not be opened.")
+
+
+def assert_same(hmms, cached):
+    assert len(hmms) == len(cached)
+    for a, b in zip(hmms, cached):
+        assert a.header == b.header
+        assert a.metadata == b.metadata
+        assert a.alphabet == b.alphabet
+        assert a.M == b.M
+        assert a.compo == b.compo
+        assert np.array_equal(a.match_matrix, b.match_matrix)
+        assert np.array_equal(a.insert_matrix, b.insert_matrix)
+        assert np.array_equal(a.trans_matrix, b.trans_matrix)
+        assert a.trans(3) == b.trans(3)
+
+
+def test_cache(monkeypatch, write_db, no_parsing):
+    filepath = write_db("three-profs.hmm.gz")
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    with open_hmmer(filepath, cache=True) as hmmfile:
+        assert_same(hmms, hmmfile.read_models())
+    assert cache_filepath(filepath).exists()
+
+    no_parsing()
+    with open_hmmer(filepath, cache=True) as hmmfile:
+        assert_same(hmms, hmmfile.read_models())
+
+    # Same content, new modification time: the content hash still matches.
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with open_hmmer(filepath, cache=True, dtype=np.float32) as hmmfile:
+        cached = hmmfile.read_models()
+    assert cached[0].match_matrix.dtype == np.float32
+    assert np.allclose(cached[2].match_matrix, hmms[2].match_matrix)
+
+    # The new modification time is recorded: the file is not hashed again.
+    with monkeypatch.context() as m:
+        m.setattr("hmmer_reader._cache._file_hash", no_hashing)
+        with open_hmmer(filepath, cache=True) as hmmfile:
+            assert_same(hmms, hmmfile.read_models())
+
+    # Same size, different content: the cache is stale.
+    content = filepath.read_bytes().replace(b"PF10417.9", b"PF10417.8")
+    filepath.write_bytes(content)
+    with pytest.raises(AssertionError):
+        open_hmmer(filepath, cache=True)
+
+    monkeypatch.undo()
+    with open_hmmer(filepath, cache=True) as hmmfile:
+        assert dict(hmmfile.read_model().metadata)["ACC"] == "PF10417.8"
+
+
+def test_cache_dir(tmp_path: Path, monkeypatch, write_db):
+    filepath = write_db("PF02545.hmm.gz")
+    cache_dir = tmp_path / "cache"
+
+    with open_hmmer(filepath, cache=cache_dir) as hmmfile:
+        hmm = hmmfile.read_model()
+    assert cache_filepath(filepath, cache_dir).parent == cache_dir
+    assert cache_filepath(filepath, cache_dir).exists()
+    assert not cache_filepath(filepath).exists()
+
+    with open_hmmer(filepath, cache=cache_dir) as hmmfile:
+        assert hmmfile.read_model().match(1) == hmm.match(1)
+
+    # The HMMER file is not opened when the cache is used.
+    with monkeypatch.context() as m:
+        m.setattr("hmmer_reader._reader.open_binary", no_opening)
+        with open_hmmer(filepath, cache=cache_dir) as hmmfile:
+            assert hmmfile.read_model().match(1) == hmm.match(1)
+
+    # A corrupt cache is ignored and written again.
+    cache_filepath(filepath, cache_dir).write_bytes(b"HMMRCACHE")
+    with open_hmmer(filepath, cache=cache_dir) as hmmfile:
+        assert hmmfile.read_model().match(1) == hmm.match(1)
+
+    with pytest.raises(ValueError):
+        open_hmmer(filepath.open(), cache=True)
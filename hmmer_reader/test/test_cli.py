@@ -106,6 +106,122 @@ def test_cli_out_of_range():
         assert r.exit_code == 1
 
 
+def test_cli_select():
+
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    text = gzip.decompress(buffer.read()).decode()
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+
+        def invoke(cmd):
+            return runner.invoke(hmmer_reader.cli, cmd)
+
+        with open("three-profs.hmm", "w") as f:
+            f.write(text)
+
+        r = invoke(["three-profs.hmm", "--length"])
+        assert r.stdout.split() == ["40", "235", "449"]
+
+        r = invoke(["three-profs.hmm", "--alphabet", "--name", "120_Rick_ant"])
+        assert r.stdout.strip() == "ACDEFGHIKLMNPQRSTVWY"
+
+        r = invoke(["three-profs.hmm", "--length", "--acc", "PF09847"])
+        assert r.stdout.strip() == "449"
+
+        r = invoke(["three-profs.hmm", "--name", "12TM_1"])
+        assert "NAME  12TM_1" in r.stdout
+        assert "1-cysPrx_C" not in r.stdout
+
+        r = invoke(["three-profs.hmm", "--match", "0", "--acc", "PF12574.8"])
+        tbl = parse_table(r.stdout)
+        assert len(tbl) == 20
+        assert tbl["A"] == 1.0
+
+        r = invoke(["three-profs.hmm", "--match", "236", "--acc", "PF12574.8"])
+        assert r.exit_code == 1
+
+        r = invoke(["three-profs.hmm", "--length", "--name", "unknown"])
+        assert r.exit_code == 1
+        assert "not found" in r.output
+
+        r = invoke(["three-profs.hmm", "--name", "12TM_1", "--acc", "PF09847.9"])
+        assert r.exit_code == 1
+
+        r = invoke(["three-profs.hmm", "--match", "1", "--stats"])
+        assert r.exit_code == 0
+        assert "Models       3" in r.stderr
+        assert "Matrix" in r.stderr
+
+        r = invoke(["three-profs.hmm", "--length", "--stats"])
+        assert r.exit_code == 2
+        assert "--stats" in r.output
+
+
+def test_cli_acc_versions(tmp_path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    text = gzip.decompress(buffer.read()).decode()
+    buffer.close()
+
+    # A versioned accession comes before the same accession without version.
+    filepath = tmp_path / "versions.hmm"
+    text = text.replace("PF10417.9", "PF09847.8").replace("PF09847.9", "PF09847")
+    filepath.write_text(text)
+
+    runner = CliRunner()
+
+    def invoke(cmd):
+        return runner.invoke(hmmer_reader.cli, [str(filepath)] + cmd)
+
+    # An exact match wins over the version-less one, as in HMMERParser.get.
+    r = invoke(["--acc", "PF09847", "--length"])
+    assert r.stdout.strip() == "449"
+
+    r = invoke(["--acc", "PF09847", "--match", "449"])
+    assert r.exit_code == 0
+    assert len(parse_table(r.stdout)) == 20
+
+    r = invoke(["--acc", "PF09847.8", "--length"])
+    assert r.stdout.strip() == "40"
+
+
+def test_cli_no_acc(tmp_path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "2OG-FeII_Oxy_3-nt.hmm.gz")
+    filepath = tmp_path / "nt.hmm"
+    filepath.write_bytes(gzip.decompress(buffer.read()))
+    buffer.close()
+
+    runner = CliRunner()
+
+    def invoke(cmd):
+        return runner.invoke(hmmer_reader.cli, [str(filepath)] + cmd)
+
+    r = invoke(["--length"])
+    assert r.exit_code == 0
+    assert r.stdout.strip() == "315"
+
+    r = invoke(["--alphabet"])
+    assert r.stdout.strip() == "ACGT"
+
+    r = invoke(["--name", "2OG-FeII_Oxy_3", "--match", "1"])
+    assert r.exit_code == 0
+    assert len(parse_table(r.stdout)) == 4
+
+    r = invoke(["--acc", "PF13640", "--length"])
+    assert r.exit_code == 1
+    assert "not found" in r.output
+
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "corrupted2.hmm.gz")
+    filepath = tmp_path / "corrupted.hmm"
+    filepath.write_bytes(gzip.decompress(buffer.read()))
+    buffer.close()
+
+    r = invoke(["--length"])
+    assert r.exit_code == 1
+    assert "Error: " in r.output
+    assert "metadata is missing" in r.output
+
+
 def parse_table(txt, sep=" "):
     txt = txt.strip()
     tbl = {}
@@ -0,0 +1,169 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import hmmer_reader
+from hmmer_reader import cli_export, dump_table, export_models, open_hmmer
+
+DB_FILES = ["three-profs.hmm.gz", "PF02545.hmm.gz", "2OG-FeII_Oxy_3-nt.hmm.gz"]
+
+
+def test_export_npz(tmp_path: Path, write_db):
+    filepath = write_db(DB_FILES)
+    export_models(filepath, tmp_path / "out", "npz", batch_size=2)
+
+    models = np.load(tmp_path / "out" / "models.npz")
+    nodes = np.load(tmp_path / "out" / "nodes.npz")
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = list(hmmfile)
+
+    assert list(models["MODEL"]) == list(range(len(hmms)))
+    assert list(models["NAME"]) == [dict(h.metadata)["NAME"] for h in hmms]
+    assert list(models["M"]) == [h.M for h in hmms]
+    assert nodes["NODE"].shape[0] == sum(h.M + 1 for h in hmms)
+
+    for i, hmm in enumerate(hmms):
+        start, end = models["NODE_START"][i], models["NODE_END"][i]
+        assert all(nodes["MODEL"][start:end] == i)
+        assert list(nodes["NODE"][start:end]) == list(range(hmm.M + 1))
+        assert np.array_equal(nodes["MM"][start:end], hmm.trans_matrix[:, 0])
+        first, last = nodes["OFFSET"][start], nodes["OFFSET"][end]
+        match = nodes["MATCH"][first:last].reshape(hmm.M + 1, -1)
+        assert np.array_equal(match, hmm.match_matrix)
+        insert = nodes["INSERT"][first:last].reshape(hmm.M + 1, -1)
+        assert np.array_equal(insert, hmm.insert_matrix)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_arrow(tmp_path: Path, format: str, write_db):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    filepath = write_db(DB_FILES)
+    export_models(filepath, tmp_path / "out", format, batch_size=2)
+
+    if format == "parquet":
+        models = pq.read_table(tmp_path / "out" / "models.parquet")
+        nodes = pq.read_table(tmp_path / "out" / "nodes.parquet")
+    else:
+        models = pa.ipc.open_file(tmp_path / "out" / "models.arrow").read_all()
+        nodes = pa.ipc.open_file(tmp_path / "out" / "nodes.arrow").read_all()
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = list(hmmfile)
+
+    assert models.num_rows == len(hmms)
+    assert models.column("ACC").to_pylist()[0] == "PF10417.9"
+    assert nodes.num_rows == sum(h.M + 1 for h in hmms)
+
+    start = models.column("NODE_START").to_pylist()[-1]
+    hmm = hmms[-1]
+    match = nodes.column("MATCH").to_pylist()[start:]
+    assert np.array_equal(np.array(match), hmm.match_matrix)
+    dd = nodes.column("DD").to_numpy()[start:]
+    assert np.array_equal(dd, hmm.trans_matrix[:, 6])
+
+
+def test_cli_export(tmp_path: Path, write_db):
+    filepath = write_db(DB_FILES)
+    runner = CliRunner()
+    r = runner.invoke(
+        cli_export, [str(filepath), str(tmp_path / "out"), "--format", "npz"]
+    )
+    assert r.exit_code == 0, r.output
+    models = np.load(tmp_path / "out" / "models.npz")
+    assert models["NAME"].shape[0] == 5
+
+
+def test_dump_table(tmp_path: Path, write_db):
+    filepath = write_db(DB_FILES)
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = {dict(h.metadata)["NAME"]: h for h in hmmfile}
+    names = ["1-cysPrx_C", "12TM_1", "Maf"]
+    M = [hmms[name].M for name in names]
+
+    dump_table(filepath, tmp_path / "match.tsv", names=names[:2], accs=["PF02545"])
+    df = pd.read_csv(tmp_path / "match.tsv", sep="\t")
+    assert list(df.columns[:4]) == ["NAME", "ACC", "NODE", "A"]
+    assert len(df) == sum(m + 1 for m in M)
+    rows = df[df["NAME"] == "12TM_1"]
+    assert list(rows["NODE"]) == list(range(M[1] + 1))
+    values = rows.iloc[:, 3:].to_numpy()
+    assert np.allclose(values, np.exp(hmms["12TM_1"].match_matrix))
+
+    dump_table(filepath, tmp_path / "trans.csv", "trans", "csv", accs=["PF10417.9"])
+    df = pd.read_csv(tmp_path / "trans.csv")
+    assert list(df.columns[3:]) == ["MM", "MI", "MD", "IM", "II", "DM", "DD"]
+    assert np.allclose(df.iloc[:, 3:].to_numpy(), np.exp(hmms[names[0]].trans_matrix))
+
+    dump_table(
+        filepath, tmp_path / "insert.npy", "insert", "npy", names, log_space=True
+    )
+    arr = np.load(tmp_path / "insert.npy")
+    assert np.array_equal(arr, np.concatenate([hmms[n].insert_matrix for n in names]))
+
+    dump_table(filepath, tmp_path / "trans.npy", "trans", "npy", batch_size=2)
+    arr = np.load(tmp_path / "trans.npy")
+    assert arr.shape == (sum(h.M + 1 for h in hmms.values()), 7)
+
+    dump_table(filepath, tmp_path / "meta.tsv", "metadata", accs=["PF12574"])
+    df = pd.read_csv(tmp_path / "meta.tsv", sep="\t")
+    assert list(df["NAME"]) == ["120_Rick_ant"]
+    assert list(df["LENG"]) == [235]
+
+    dump_table(filepath, tmp_path / "dna.tsv", names=["2OG-FeII_Oxy_3"])
+    df = pd.read_csv(tmp_path / "dna.tsv", sep="\t")
+    assert list(df.columns) == ["NAME", "ACC", "NODE", "A", "C", "G", "T"]
+    assert df["ACC"].isna().all()
+    assert len(df) == hmms["2OG-FeII_Oxy_3"].M + 1
+
+    dump_table(filepath, tmp_path / "meta.csv", "metadata", "csv", ["2OG-FeII_Oxy_3"])
+    df = pd.read_csv(tmp_path / "meta.csv")
+    assert df["ACC"].isna().all()
+    assert list(df["LENG"]) == [315]
+
+    with pytest.raises(ValueError):
+        dump_table(filepath, tmp_path / "all.tsv")
+
+    with pytest.raises(KeyError):
+        dump_table(filepath, tmp_path / "none.tsv", names=["unknown"])
+
+
+def test_dump_table_parquet(tmp_path: Path, write_db):
+    pq = pytest.importorskip("pyarrow.parquet")
+    filepath = write_db(DB_FILES)
+
+    dump_table(filepath, tmp_path / "trans.parquet", "trans", "parquet", batch_size=2)
+    table = pq.read_table(tmp_path / "trans.parquet")
+    with open_hmmer(filepath) as hmmfile:
+        assert table.num_rows == sum(h.M + 1 for h in hmmfile)
+
+    filepath = write_db(DB_FILES[:2])
+    dump_table(filepath, tmp_path / "meta.parquet", "metadata", "parquet")
+    assert pq.read_table(tmp_path / "meta.parquet").num_rows == 4
+
+
+def test_cli_dump(write_db):
+    filepath = write_db(DB_FILES[:2])
+
+    runner = CliRunner()
+    r = runner.invoke(hmmer_reader.cli_dump, [str(filepath), "--acc", "PF02545"])
+    assert r.exit_code == 0
+    lines = r.stdout.splitlines()
+    assert lines[0].split("\t")[:4] == ["NAME", "ACC", "NODE", "A"]
+    assert len(lines) == 168
+
+    r = runner.invoke(hmmer_reader.cli_dump, [str(filepath), "--table", "trans"])
+    assert r.exit_code == 0
+
+    r = runner.invoke(hmmer_reader.cli_dump, [str(filepath), "--format", "npy"])
+    assert r.exit_code == 1
+
+    r = runner.invoke(hmmer_reader.cli_dump, [str(filepath), "--acc", "PF00000"])
+    assert r.exit_code == 1
+    assert "not found" in r.output
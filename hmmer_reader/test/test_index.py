@@ -0,0 +1,197 @@
+import os
+from pathlib import Path
+
+import importlib_resources as pkg_resources
+import pytest
+from numpy import dtype
+
+import hmmer_reader
+from hmmer_reader import build_index, fetch_index, fetch_metadata, open_hmmer
+
+
+def test_index_build(tmp_path: Path, write_db):
+    filepath = write_db("three-profs.hmm.gz")
+
+    df = build_index(filepath)
+    assert (tmp_path / "db.hmm.idx").exists()
+    assert tuple(df.columns) == ("NAME", "ACC", "LENG", "ALPH", "START", "END")
+    assert df["ACC"].tolist() == ["PF10417.9", "PF12574.8", "PF09847.9"]
+    assert df["LENG"].tolist() == [40, 235, 449]
+    assert df["START"].dtype is dtype("int64")
+
+    content = filepath.read_bytes()
+    assert df["START"].values[0] == 0
+    assert df["END"].values[-1] == len(content)
+    assert df["START"].values[1:].tolist() == df["END"].values[:-1].tolist()
+    for start, end in zip(df["START"], df["END"]):
+        assert content[start:end].startswith(b"HMMER3/f")
+        assert content[start:end].endswith(b"//\n")
+
+    df2 = fetch_index(filepath)
+    assert df2.equals(df)
+
+
+def test_index_stale(write_db):
+    filepath = write_db("three-profs.hmm.gz")
+    build_index(filepath)
+
+    single = write_db("PF02545.hmm.gz", filename="single.hmm")
+    os.replace(single, filepath)
+    os.utime(filepath, (1e10, 1e10))
+
+    df = fetch_index(filepath)
+    assert df["NAME"].tolist() == ["Maf"]
+
+    # Replaced by an older file, as with cp -p: the size tells it apart.
+    three = write_db("three-profs.hmm.gz", filename="three.hmm")
+    os.utime(three, (1.0, 1.0))
+    os.replace(three, filepath)
+    assert fetch_index(filepath)["NAME"].tolist()[-1] == "12TM_1"
+
+
+def test_index_get(write_db):
+    filepath = write_db("three-profs.hmm.gz")
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    with open_hmmer(filepath) as hmmfile:
+        hmm = hmmfile.get("PF12574.8")
+        assert hmm.M == 235
+        assert hmm.metadata == hmms[1].metadata
+        assert (hmm.match_matrix == hmms[1].match_matrix).all()
+
+        hmm = hmmfile.get_by_name("12TM_1")
+        assert hmm.M == 449
+        assert (hmm.trans_matrix == hmms[2].trans_matrix).all()
+
+        assert hmmfile.get("PF10417").M == 40
+
+        with pytest.raises(KeyError):
+            hmmfile.get("PF00001.1")
+
+        with pytest.raises(KeyError):
+            hmmfile.get_by_name("Maf")
+
+        # Random access does not disturb iteration.
+        assert hmmfile.read_model().M == 40
+
+
+def test_index_get_stream():
+    buffer = pkg_resources.open_text(hmmer_reader.data, "A0ALD9.fasta")
+    hmmfile = open_hmmer(buffer)
+
+    with pytest.raises(ValueError):
+        hmmfile.get("PF02545.14")
+
+    buffer.close()
+
+
+def test_index_append(monkeypatch, write_db):
+    filepath = write_db("three-profs.hmm.gz")
+    content = filepath.read_bytes()
+    build_index(filepath)
+
+    single = write_db("PF02545.hmm.gz", filename="single.hmm").read_bytes()
+    with open(filepath, "ab") as file:
+        file.write(single)
+    os.utime(filepath, (1e10, 1e10))
+
+    scanned = []
+    scan = hmmer_reader._misc._scan
+
+    def spy(filepath, fields, offsets, start=0):
+        scanned.append(start)
+        return scan(filepath, fields, offsets, start)
+
+    hashed = []
+    digest = hmmer_reader._index._digest
+
+    def hash_spy(filepath, start, end, *args):
+        hashed.append((start, end))
+        return digest(filepath, start, end, *args)
+
+    monkeypatch.setattr(hmmer_reader._misc, "_scan", spy)
+    monkeypatch.setattr(hmmer_reader._index, "_digest", hash_spy)
+
+    df = fetch_index(filepath)
+    assert scanned == [len(content)]
+    # Each byte is hashed once: the indexed prefix, then the appended models.
+    size = len(content) + len(single)
+    assert hashed == [(0, len(content)), (len(content), size)]
+    assert df["NAME"].tolist() == ["1-cysPrx_C", "120_Rick_ant", "12TM_1", "Maf"]
+    assert df["START"].tolist()[-1] == len(content)
+    assert df["END"].tolist()[-1] == len(content) + len(single)
+    assert df.equals(build_index(filepath, save=False))
+
+    # The index is up to date: nothing is scanned.
+    scanned.clear()
+    meta = fetch_metadata(filepath, ["NAME", "LENG"], index=True)
+    assert scanned == []
+    assert meta["LENG"].tolist() == [40, 235, 449, 166]
+
+    # Touched but unchanged: the file is hashed only once.
+    os.utime(filepath, (1.5e10, 1.5e10))
+    hashed.clear()
+    for _ in range(3):
+        assert fetch_index(filepath).equals(df)
+    assert hashed == [(0, size)]
+    assert scanned == []
+
+    # The prefix changed: the whole file is scanned again.
+    filepath.write_bytes(content.replace(b"PF10417.9", b"PF10417.8") + single * 2)
+    os.utime(filepath, (2e10, 2e10))
+    df = fetch_index(filepath)
+    assert scanned == [0]
+    assert (
+        df["ACC"].tolist()
+        == ["PF10417.8", "PF12574.8", "PF09847.9"] + ["PF02545.14"] * 2
+    )
+
+    with pytest.raises(ValueError):
+        fetch_metadata(filepath, ["NAME", "DESC"], index=True)
+
+
+def test_index_edit_and_append(tmp_path: Path, write_db):
+    filepath = hmmer_reader.synthetic_hmm(tmp_path / "synth.hmm", 400, 20)
+    content = filepath.read_bytes()
+    build_index(filepath)
+
+    # A same-length edit past the first megabyte, then an append.
+    assert content.index(b"SYNTH200\n") > 1024 * 1024
+    single = write_db("PF02545.hmm.gz", filename="single.hmm").read_bytes()
+    filepath.write_bytes(content.replace(b"SYNTH200\n", b"RENAM200\n") + single)
+    os.utime(filepath, (1e10, 1e10))
+
+    df = fetch_index(filepath)
+    assert df.equals(build_index(filepath, save=False))
+    assert "SYNTH200" not in df["NAME"].tolist()
+
+    with open_hmmer(filepath) as hmmfile:
+        assert hmmfile.get_by_name("RENAM200").name == "RENAM200"
+        assert hmmfile.get_by_name("Maf").M == 166
+        with pytest.raises(KeyError):
+            hmmfile.get_by_name("SYNTH200")
+
+    meta = fetch_metadata(filepath, ["NAME", "LENG"], index=True)
+    assert meta.equals(fetch_metadata(filepath, ["NAME", "LENG"]))
+
+
+def test_index_no_acc(tmp_path: Path, write_db):
+    three = write_db("three-profs.hmm.gz", filename="three.hmm").read_bytes()
+    dna = write_db("2OG-FeII_Oxy_3-nt.hmm.gz", filename="dna.hmm").read_bytes()
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(dna + three)
+
+    df = build_index(filepath)
+    assert df["ACC"].tolist() == [None, "PF10417.9", "PF12574.8", "PF09847.9"]
+    os.utime(filepath, (1e10, 1e10))
+    assert fetch_index(filepath).equals(df)
+    assert fetch_metadata(filepath, index=True).equals(fetch_metadata(filepath))
+
+    with open_hmmer(filepath) as hmmfile:
+        hmm = hmmfile.get_by_name("2OG-FeII_Oxy_3")
+        assert hmm.acc is None
+        assert hmmfile.get("PF12574").name == "120_Rick_ant"
+        with pytest.raises(KeyError):
+            hmmfile.get("")
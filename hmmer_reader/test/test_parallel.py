@@ -0,0 +1,65 @@
+import gzip
+from pathlib import Path
+
+from hmmer_reader import open_hmmer, parallel_read_models
+from hmmer_reader._io import split_ranges
+
+DB_FILES = ["three-profs.hmm.gz", "PF02545.hmm.gz", "2OG-FeII_Oxy_3-nt.hmm.gz"]
+
+
+def test_parallel_split_ranges(write_db):
+    filepath = write_db(DB_FILES, 3)
+    content = filepath.read_bytes()
+
+    for n in [1, 2, 7, 100]:
+        ranges = split_ranges(filepath, n)
+        assert len(ranges) <= n
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(content)
+        for (_, end), (start, _) in zip(ranges[:-1], ranges[1:]):
+            assert end == start
+        for start, end in ranges:
+            assert content[start:end].startswith(b"HMMER3/f")
+            assert content[start:end].endswith(b"//\n")
+
+
+def test_parallel_read_models(write_db):
+    filepath = write_db(DB_FILES, 3)
+
+    with open_hmmer(filepath) as hmmfile:
+        expected = [(hmm.M, hmm.insert_matrix.sum()) for hmm in hmmfile]
+    assert len(expected) == 15
+
+    hmms = list(parallel_read_models(filepath, workers=2))
+    assert [(hmm.M, hmm.insert_matrix.sum()) for hmm in hmms] == expected
+
+    hmms = list(parallel_read_models(filepath, workers=2, ordered=False))
+    assert sorted([(hmm.M, hmm.insert_matrix.sum()) for hmm in hmms]) == sorted(
+        expected
+    )
+
+    with open_hmmer(filepath, workers=3) as hmmfile:
+        hmms = hmmfile.read_models()
+    assert [(hmm.M, hmm.insert_matrix.sum()) for hmm in hmms] == expected
+    assert hmms[4].alphabet == "ACGT"
+
+
+def test_parallel_read_models_gzip(tmp_path: Path, monkeypatch, write_db):
+    import hmmer_reader._parallel
+
+    filepath = write_db(DB_FILES, 3)
+    gzpath = tmp_path / "db.hmm.gz"
+    gzpath.write_bytes(gzip.compress(filepath.read_bytes()))
+
+    with open_hmmer(filepath) as hmmfile:
+        expected = [(hmm.M, hmm.insert_matrix.sum()) for hmm in hmmfile]
+
+    monkeypatch.setattr(hmmer_reader._parallel, "BATCH_SIZE", 100000)
+
+    hmms = list(parallel_read_models(gzpath, workers=2))
+    assert [(hmm.M, hmm.insert_matrix.sum()) for hmm in hmms] == expected
+
+    hmms = list(parallel_read_models(gzpath, workers=2, ordered=False))
+    assert sorted([(hmm.M, hmm.insert_matrix.sum()) for hmm in hmms]) == sorted(
+        expected
+    )
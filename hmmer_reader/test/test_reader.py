@@ -1,14 +1,25 @@
 import gzip
 import os
+import pickle
+import tracemalloc
 from io import StringIO
 from pathlib import Path
 
 import importlib_resources as pkg_resources
+import numpy as np
+import pandas
 import pytest
-from numpy import dtype
+from numpy import dtype, isnan
 
 import hmmer_reader
-from hmmer_reader import ParsingError, fetch_metadata, open_hmmer
+from hmmer_reader import (
+    ParsingError,
+    fetch_metadata,
+    fetch_metadata_many,
+    iter_metadata,
+    num_models,
+    open_hmmer,
+)
 
 
 def test_hmmer_reader():
@@ -180,7 +191,7 @@ def test_hmmer_reader_fetch_metadata_corrupted2(tmp_path: Path):
     with open("db.hmm", "w") as file:
         file.write(content)
 
-    with pytest.raises(ParsingError):
+    with pytest.raises(ParsingError, match="metadata is missing at line 522"):
         fetch_metadata(tmp_path / "db.hmm")
 
 
@@ -194,3 +205,517 @@ def test_hmmer_reader_fetch_metadata_corrupted3(tmp_path: Path):
 
     with pytest.raises(ParsingError):
         fetch_metadata(tmp_path / "db.hmm")
+
+
+def test_hmmer_reader_matrices():
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "PF02545.hmm.gz")
+
+    content = gzip.decompress(buffer.read()).decode()
+    hmmfile = open_hmmer(StringIO(content))
+
+    hmm = hmmfile.read_model()
+    assert hmm.match_matrix.shape == (167, 20)
+    assert hmm.insert_matrix.shape == (167, 20)
+    assert hmm.trans_matrix.shape == (167, 7)
+    assert hmm.compo_vector.shape == (20,)
+    assert hmm.match_matrix.dtype == dtype("float64")
+
+    V = hmm.alphabet.index("V")
+    assert abs(hmm.match_matrix[2, V] - -2.0152) < 1e-6
+    assert abs(hmm.insert_matrix[2, V] - -2.98518) < 1e-6
+    assert abs(hmm.trans_matrix[83, 6] - -0.94424) < 1e-6
+    assert hmm.match(2)["V"] == hmm.match_matrix[2, V]
+    assert hmm.match_matrix[0, 0] == 0.0
+    assert hmm.match_matrix[0, 1] == -float("inf")
+
+    with pytest.raises(ValueError):
+        hmm.match_matrix[1, 1] = 0.0
+
+    with pytest.raises(IndexError):
+        hmm.match(167)
+
+    buffer.close()
+
+
+def test_hmmer_reader_float32():
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+
+    content = gzip.decompress(buffer.read()).decode()
+    hmmfile = open_hmmer(StringIO(content), dtype="float32")
+
+    hmms = hmmfile.read_models()
+    assert [hmm.M for hmm in hmms] == [40, 235, 449]
+    for hmm in hmms:
+        assert hmm.match_matrix.dtype == dtype("float32")
+        assert hmm.trans_matrix.dtype == dtype("float32")
+        assert hmm.compo_vector.dtype == dtype("float32")
+
+    buffer.close()
+
+
+def test_hmmer_reader_matrix_values():
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "PF02545.hmm.gz")
+
+    content = gzip.decompress(buffer.read()).decode()
+    hmm = open_hmmer(StringIO(content)).read_model()
+
+    assert hmm.trans(166)["MD"] == -float("inf")
+    assert hmm.trans(166)["DD"] == -float("inf")
+    assert hmm.trans(166)["DM"] == 0.0
+    assert hmm.trans(166)["MM"] == -0.00944
+    assert hmm.trans(0)["DM"] == 0.0
+    assert abs(hmm.insert(0)["A"] - -2.68618) < 1e-12
+
+    lines = content.splitlines(True)
+    lines[-3] = lines[-3].replace("2.68618", "2.6x618", 1)
+    with pytest.raises(ParsingError):
+        open_hmmer(StringIO("".join(lines))).read_model()
+
+    lines = content.splitlines(True)[:-2]
+    with pytest.raises(ParsingError):
+        open_hmmer(StringIO("".join(lines))).read_model()
+
+    # Empty alphabet.
+    lines = content.splitlines(True)
+    lines = ["HMM \n" if line.startswith("HMM ") else line for line in lines]
+    with pytest.raises(ParsingError):
+        open_hmmer(StringIO("".join(lines))).read_model()
+
+    buffer.close()
+
+
+def test_hmmer_reader_memory_map(tmp_path: Path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read())
+    buffer.close()
+
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(content + b"\n")
+
+    with open_hmmer(filepath) as hmmfile:
+        expected = hmmfile.read_models()
+
+    with open_hmmer(filepath, memory_map=True) as hmmfile:
+        hmms = hmmfile.read_models()
+        assert all(isinstance(hmm._record, memoryview) for hmm in hmms)
+
+        for hmm, exp in zip(hmms, expected):
+            assert hmm.header == exp.header
+            assert hmm.metadata == exp.metadata
+            assert (hmm.insert_matrix == exp.insert_matrix).all()
+            assert hmm._record is None
+        assert len(hmms) == 3
+
+        hmm = hmmfile.get_by_name("120_Rick_ant")
+        assert hmm.M == 235
+
+    # Models that were not parsed before closing keep the mapping alive.
+    assert hmm.alphabet == "ACDEFGHIKLMNPQRSTVWY"
+
+    filepath.write_bytes(b"")
+    with open_hmmer(filepath, memory_map=True) as hmmfile:
+        assert hmmfile.read_models() == []
+
+
+def test_hmmer_reader_lazy(tmp_path: Path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read())
+    buffer.close()
+
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(content)
+
+    with open_hmmer(filepath) as hmmfile:
+        expected = hmmfile.read_models()
+
+    for stream in [False, True]:
+        for memory_map in [False, True]:
+            file = StringIO(content.decode()) if stream else filepath
+            with open_hmmer(file, memory_map=memory_map, lazy=True) as hmmfile:
+                hmms = hmmfile.read_models()
+
+                for hmm, exp in zip(hmms, expected):
+                    assert hmm._header_parsed
+                    assert hmm._record is not None
+                    assert hmm.metadata == exp.metadata
+                    assert hmm.alphabet == exp.alphabet
+                    assert hmm._record is not None
+
+                    assert hmm.M == exp.M
+                    assert hmm._record is None
+                    assert (hmm.trans_matrix == exp.trans_matrix).all()
+                    assert hmm.compo == exp.compo
+                assert len(hmms) == 3
+
+    with open_hmmer(filepath, lazy=True) as hmmfile:
+        hmm = hmmfile.read_model()
+        assert hmm._record == (filepath, 0, 19830)
+        assert hmm.match(1) == expected[0].match(1)
+
+
+@pytest.mark.parametrize("fmt", ["gzip", "bz2", "xz", "zstd"])
+def test_hmmer_reader_compressed(tmp_path: Path, fmt: str):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read())
+    buffer.close()
+
+    if fmt == "gzip":
+        data = gzip.compress(content)
+    elif fmt == "bz2":
+        data = __import__("bz2").compress(content)
+    elif fmt == "xz":
+        data = __import__("lzma").compress(content)
+    else:
+        data = pytest.importorskip("zstandard").ZstdCompressor().compress(content)
+
+    filepath = tmp_path / "db.hmm.z"
+    filepath.write_bytes(data)
+    plain = tmp_path / "db.hmm"
+    plain.write_bytes(content)
+
+    with open_hmmer(plain) as hmmfile:
+        expected = hmmfile.read_models()
+
+    for lazy in [False, True]:
+        with open_hmmer(filepath, memory_map=True, lazy=lazy) as hmmfile:
+            hmms = hmmfile.read_models()
+        assert [hmm.metadata for hmm in hmms] == [hmm.metadata for hmm in expected]
+        for hmm, exp in zip(hmms, expected):
+            assert (hmm.match_matrix[1:] == exp.match_matrix[1:]).all()
+
+    df = fetch_metadata(filepath)
+    assert df.equals(fetch_metadata(plain))
+    assert df["LENG"].tolist() == [40, 235, 449]
+
+    with open_hmmer(filepath) as hmmfile:
+        assert hmmfile.get_by_name("120_Rick_ant").M == 235
+        assert hmmfile.get("PF09847.9").M == 449
+
+
+def test_hmmer_reader_fetch_metadata_gzip():
+    with pkg_resources.as_file(
+        pkg_resources.files(hmmer_reader.data) / "PF02545.hmm.gz"
+    ) as filepath:
+        df = fetch_metadata(filepath)
+
+    assert df["NAME"].tolist() == ["Maf"]
+    assert df["LENG"].dtype is dtype("int32")
+
+
+def test_hmmer_reader_num_models(tmp_path: Path):
+    with pkg_resources.as_file(
+        pkg_resources.files(hmmer_reader.data) / "three-profs.hmm.gz"
+    ) as filepath:
+        assert num_models(filepath) == 3
+        content = gzip.decompress(filepath.read_bytes())
+
+    filepath = tmp_path / "db with spaces.hmm"
+    filepath.write_bytes(content * 2)
+    assert num_models(filepath) == 6
+    assert num_models(str(filepath)) == 6
+    assert num_models(filepath.open("rb")) == 6
+    assert num_models(StringIO(content.decode())) == 3
+    assert num_models(tmp_path / "db with spaces.hmm", 0, 0) == 0
+
+    ends = [i + 1 for i in range(len(content)) if content[i : i + 3] == b"\n//"]
+    for start in [0, 1, ends[0] - 1, ends[0], ends[0] + 1, ends[1] + 2]:
+        for end in [start, ends[0], ends[0] + 1, ends[0] + 2, len(content)]:
+            count = len([i for i in ends if start <= i < end])
+            assert num_models(filepath, start, end) == count
+
+
+def test_hmmer_reader_fetch_metadata_fields():
+    with pkg_resources.as_file(
+        pkg_resources.files(hmmer_reader.data) / "three-profs.hmm.gz"
+    ) as filepath:
+        fields = ["NAME", "DESC", "NSEQ", "EFFN", "CKSUM", "GA_SEQ", "TC_DOM"]
+        df = fetch_metadata(filepath, fields + ["MSV_MU", "FORWARD_LAMBDA", "MAXL"])
+
+    assert tuple(df.columns[: len(fields)]) == tuple(fields)
+    assert df["DESC"].tolist()[0] == "C-terminal domain of 1-Cys peroxiredoxin"
+    assert df["NSEQ"].tolist() == [46, 4, 7]
+    assert df["NSEQ"].dtype is dtype("int64")
+    assert df["CKSUM"].tolist()[0] == 4280830619
+    assert df["EFFN"].tolist()[0] == 19.774048
+    assert df["GA_SEQ"].tolist()[0] == 21.1
+    assert df["TC_DOM"].tolist()[2] == 33.2
+    assert df["MSV_MU"].tolist()[0] == -7.4476
+    assert df["FORWARD_LAMBDA"].tolist()[2] == 0.69858
+    assert df["MAXL"].tolist() == [-1, -1, -1]
+
+    with pkg_resources.as_file(
+        pkg_resources.files(hmmer_reader.data) / "2OG-FeII_Oxy_3-nt.hmm.gz"
+    ) as filepath:
+        df = fetch_metadata(filepath, ["NAME", "DESC", "GA_DOM", "MAXL"])
+        assert df["DESC"].tolist() == [None]
+        assert isnan(df["GA_DOM"].values[0])
+        assert df["MAXL"].tolist() == [460]
+
+        df = fetch_metadata(filepath)
+        assert df["NAME"].tolist() == ["2OG-FeII_Oxy_3"]
+        assert df["ACC"].tolist() == [None]
+
+        with pytest.raises(ValueError):
+            fetch_metadata(filepath, ["NAME", "UNKNOWN"])
+
+
+def test_hmmer_reader_iter_metadata(tmp_path: Path):
+    with pkg_resources.as_file(
+        pkg_resources.files(hmmer_reader.data) / "three-profs.hmm.gz"
+    ) as filepath:
+        chunks = list(iter_metadata(filepath, 2, ["NAME", "LENG"]))
+        content = gzip.decompress(filepath.read_bytes())
+
+    assert [len(c) for c in chunks] == [2, 1]
+    assert chunks[1]["NAME"].tolist() == ["12TM_1"]
+    assert chunks[1]["LENG"].dtype is dtype("int32")
+
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(content * 500)
+    df = fetch_metadata(filepath)
+    chunks = list(iter_metadata(filepath, 64))
+    assert [len(c) for c in chunks] == [64] * 23 + [28]
+    assert chunks[-1].index.tolist() == list(range(28))
+    for i, chunk in enumerate(chunks):
+        assert chunk.equals(df.iloc[i * 64 : (i + 1) * 64].reset_index(drop=True))
+
+    it = iter_metadata(filepath, 10)
+    assert len(next(it)) == 10
+    it.close()
+
+    half = len(content) * 250 + 10
+    first = pandas.concat(iter_metadata(filepath, 1000, end=half))
+    second = pandas.concat(iter_metadata(filepath, 1000, start=half))
+    assert len(first) == 751 and len(second) == 749
+    assert pandas.concat([first, second], ignore_index=True).equals(df)
+    assert list(iter_metadata(filepath, start=half, end=half + 5)) == []
+
+
+def test_hmmer_reader_fetch_metadata_many(tmp_path: Path):
+    filepaths = []
+    for i, name in enumerate(["three-profs.hmm.gz", "PF02545.hmm.gz"] * 3):
+        buffer = pkg_resources.open_binary(hmmer_reader.data, name)
+        filepaths.append(tmp_path / f"{i}.hmm")
+        filepaths[-1].write_bytes(gzip.decompress(buffer.read()))
+        buffer.close()
+    filepaths.append(tmp_path / "empty.hmm")
+    filepaths[-1].write_bytes(b"")
+
+    df = fetch_metadata_many(filepaths, ["NAME", "LENG", "NSEQ"], threads=3)
+    assert tuple(df.columns) == ("FILE", "NAME", "LENG", "NSEQ")
+    assert len(df) == 12
+    assert df["FILE"].tolist()[:4] == [str(filepaths[0])] * 3 + [str(filepaths[1])]
+    assert df["LENG"].tolist()[:4] == [40, 235, 449, 166]
+    assert df["LENG"].dtype is dtype("int32")
+
+    expected = pandas.concat([fetch_metadata(f) for f in filepaths[:-1]])
+    df = fetch_metadata_many(filepaths)
+    assert df["ACC"].tolist() == expected["ACC"].tolist()
+
+    assert fetch_metadata_many([filepaths[-1]]).shape == (0, 5)
+
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "corrupted2.hmm.gz")
+    filepaths.append(tmp_path / "corrupted.hmm")
+    filepaths[-1].write_bytes(gzip.decompress(buffer.read()))
+    buffer.close()
+    with pytest.raises(ParsingError, match="corrupted.hmm"):
+        fetch_metadata_many(filepaths)
+
+
+def test_hmmer_reader_derived_matrices(write_db):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "PF02545.hmm.gz")
+    hmm = open_hmmer(StringIO(gzip.decompress(buffer.read()).decode())).read_model()
+    buffer.close()
+
+    probs = hmm.prob_matrix()
+    assert probs is hmm.prob_matrix("match")
+    assert abs(probs[1, 0] - 0.063306327140559060) < 1e-12
+    assert probs[0, 1] == 0.0
+    assert not probs.flags.writeable
+    assert np.allclose(hmm.prob_matrix("trans").sum(1)[1:-1], 3.0)
+    assert np.allclose(hmm.prob_matrix("compo").sum(), 1.0)
+
+    odds = hmm.log_odds_matrix()
+    assert np.allclose(odds[1], hmm.match_matrix[1] - hmm.compo_vector)
+    assert hmm.log_odds_matrix() is odds
+
+    uniform = {a: 0.05 for a in hmm.alphabet}
+    odds = hmm.log_odds_matrix("insert", uniform)
+    assert np.allclose(odds[5], hmm.insert_matrix[5] - np.log(0.05))
+    assert hmm.log_odds_matrix("insert", [0.05] * 20) is odds
+
+    scores = hmm.score_matrix()
+    assert scores.dtype == np.int16
+    assert scores[0, 1] == np.iinfo(np.int16).min
+    expected = np.rint(hmm.log_odds_matrix()[1] * 500 / np.log(2))
+    assert np.array_equal(scores[1], expected)
+    assert hmm.score_matrix(scale=3, dtype=np.int8).dtype == np.int8
+
+    hmm.clear_cache()
+    assert hmm.prob_matrix() is not probs
+    assert np.array_equal(hmm.prob_matrix(), probs)
+
+    with pytest.raises(ValueError):
+        hmm.log_odds_matrix("trans")
+    with pytest.raises(ValueError):
+        hmm.log_odds_matrix(background=[0.5, 0.5])
+
+    # Unparsed models load their composition along with the matrices.
+    filepath = write_db("PF02545.hmm.gz")
+    for kwargs in [{"lazy": True}, {"memory_map": True}]:
+        with open_hmmer(filepath, **kwargs) as hmmfile:
+            unparsed = hmmfile.read_model()
+            assert np.array_equal(unparsed.log_odds_matrix(), hmm.log_odds_matrix())
+
+        with open_hmmer(filepath, **kwargs) as hmmfile:
+            unparsed = hmmfile.read_model()
+            assert np.array_equal(unparsed.score_matrix(), scores)
+
+
+def test_hmmer_reader_stats(tmp_path: Path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read())
+    buffer.close()
+
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(content)
+
+    with open_hmmer(filepath) as hmmfile:
+        assert hmmfile.stats is None
+        assert hmmfile.read_model()._stats is None
+
+    for file in [filepath, StringIO(content.decode())]:
+        with open_hmmer(file, stats=True) as hmmfile:
+            hmms = hmmfile.read_models()
+            stats = hmmfile.stats
+
+        assert stats.models == 3
+        assert stats.bytes == len(content)
+        assert stats.lines == content.count(b"\n")
+        assert len(stats.model_seconds) == 3
+        assert all(stats.seconds[p] > 0 for p in ["read", "layout", "header", "matrix"])
+        assert stats.as_dict()["total_seconds"] == pytest.approx(stats.total_seconds)
+        assert "Models       3" in str(stats)
+        assert hmms[2].M == 449
+
+    seen = []
+    with open_hmmer(filepath, lazy=True, stats=lambda h, s: seen.append(s.models)) as f:
+        hmm = f.get_by_name("12TM_1")
+        assert f.stats.seconds["matrix"] == 0.0
+        assert hmm.M == 449
+        assert f.stats.seconds["matrix"] > 0
+    assert seen == [1]
+
+    with open_hmmer(filepath, workers=2, stats=True) as hmmfile:
+        assert len(hmmfile.read_models()) == 3
+        assert hmmfile.stats.models == 3
+
+
+def test_hmmer_reader_accessors():
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read()).decode()
+    buffer.close()
+
+    with open_hmmer(StringIO(content), lazy=True) as hmmfile:
+        hmm = hmmfile.read_model()
+
+    assert hmm.name == "1-cysPrx_C"
+    assert hmm.acc == "PF10417.9"
+    assert hmm.desc == "C-terminal domain of 1-Cys peroxiredoxin"
+    assert hmm.leng == 40
+    assert hmm.nseq == 46
+    assert hmm.ga == (21.1, 21.1)
+    assert hmm.tc == (21.1, 21.1)
+    assert hmm.nc == (21.0, 21.0)
+    assert hmm._record is not None
+
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "2OG-FeII_Oxy_3-nt.hmm.gz")
+    content = gzip.decompress(buffer.read()).decode()
+    buffer.close()
+
+    with open_hmmer(StringIO(content)) as hmmfile:
+        hmm = hmmfile.read_model()
+
+    assert hmm.acc is None
+    assert hmm.ga is None
+    assert hmm.leng == hmm.M
+
+
+def test_hmmer_reader_footprint(tmp_path: Path):
+    filepath = hmmer_reader.synthetic_hmm(tmp_path / "synth.hmm", 200, 20)
+
+    tracemalloc.start()
+    with open_hmmer(filepath, dtype=np.float32) as hmmfile:
+        hmms = hmmfile.read_models()
+    # Drop the read buffer.
+    del hmmfile
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    matrices = ["compo_vector", "match_matrix", "insert_matrix", "trans_matrix"]
+    nbytes = sum(getattr(hmm, m).nbytes for hmm in hmms for m in matrices)
+    overhead = (size - nbytes) / len(hmms)
+    # About 1.7 kB on CPython 3.11: metadata values, Python and NumPy objects.
+    assert overhead < 4000
+
+    assert not hasattr(hmms[0], "__dict__")
+    assert hmms[0].match_matrix.dtype == np.float32
+    assert hmms[0].header is hmms[1].header
+    assert hmms[0]._meta_keys is hmms[1]._meta_keys
+    assert hmms[0].metadata[4] == ("ALPH", "amino")
+    assert hmms[0].metadata[4][1] is hmms[1].metadata[4][1]
+
+    restored = pickle.loads(pickle.dumps(hmms[0]))
+    assert restored.metadata == hmms[0].metadata
+    assert (restored.match_matrix == hmms[0].match_matrix).all()
+
+
+def test_hmmer_reader_where(tmp_path: Path):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, "three-profs.hmm.gz")
+    content = gzip.decompress(buffer.read())
+    buffer.close()
+
+    filepath = tmp_path / "db.hmm"
+    filepath.write_bytes(content)
+    gzpath = tmp_path / "db.hmm.gz"
+    gzpath.write_bytes(gzip.compress(content))
+
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    unparsed = []
+
+    def where(hmm):
+        unparsed.append(hmm._record is not None)
+        return 100 <= hmm.leng <= 500
+
+    for kwargs in [{}, {"memory_map": True}, {"lazy": True}, {"workers": 2}]:
+        unparsed.clear()
+        with open_hmmer(filepath, where=where, **kwargs) as hmmfile:
+            selected = hmmfile.read_models()
+
+        # Worker processes parse whole models, filtered afterwards.
+        assert unparsed == [kwargs.get("workers") is None] * 3
+
+        assert [hmm.name for hmm in selected] == ["120_Rick_ant", "12TM_1"]
+        assert np.array_equal(selected[1].match_matrix, hmms[2].match_matrix)
+        assert selected[1].metadata == hmms[2].metadata
+
+    for file in [gzpath, StringIO(content.decode())]:
+        with open_hmmer(file, where=lambda hmm: hmm.acc.startswith("PF10")) as f:
+            selected = f.read_models()
+        assert [hmm.name for hmm in selected] == ["1-cysPrx_C"]
+        assert selected[0]._record is None
+        assert np.array_equal(selected[0].trans_matrix, hmms[0].trans_matrix)
+
+    with open_hmmer(filepath, where=lambda hmm: False, stats=True) as hmmfile:
+        assert hmmfile.read_models() == []
+        assert hmmfile.stats.models == 0
+        assert hmmfile.stats.seconds["matrix"] == 0.0
+        # Random access is not filtered.
+        assert hmmfile.get_by_name("12TM_1").M == 449
+
+    cache = tmp_path / "cache"
+    for _ in range(2):
+        with open_hmmer(filepath, cache=cache, where=lambda h: h.leng < 100) as f:
+            assert [hmm.name for hmm in f] == ["1-cysPrx_C"]
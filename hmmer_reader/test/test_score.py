@@ -0,0 +1,159 @@
+import gzip
+from io import StringIO
+
+import importlib_resources as pkg_resources
+import numpy as np
+import pytest
+
+import hmmer_reader
+from hmmer_reader import encode_sequences, open_hmmer, ungapped_scores, viterbi_scores
+
+
+def read_fasta(name: str) -> str:
+    with pkg_resources.open_text(hmmer_reader.data, name) as file:
+        return "".join(line.strip() for line in file if not line.startswith(">"))
+
+
+def read_model(name: str):
+    buffer = pkg_resources.open_binary(hmmer_reader.data, name)
+    content = gzip.decompress(buffer.read()).decode()
+    buffer.close()
+    return open_hmmer(StringIO(content)).read_model()
+
+
+def consensus(hmm) -> str:
+    return "".join(hmm.alphabet[k] for k in hmm.match_matrix[1:].argmax(1))
+
+
+def ungapped_reference(hmm, seq: str) -> float:
+    odds = hmm.log_odds_matrix()
+    codes = [hmm.alphabet.index(a) for a in seq]
+    best = -np.inf
+    for d in range(-len(seq), hmm.M):
+        run = 0.0
+        for i, k in enumerate(codes):
+            j = i + d + 1
+            if 1 <= j <= hmm.M:
+                run = max(run, 0.0) + odds[j, k] if run > -np.inf else odds[j, k]
+                best = max(best, run)
+            else:
+                run = -np.inf
+    return best
+
+
+def viterbi_reference(hmm, seq: str) -> float:
+    match, insert = hmm.log_odds_matrix(), hmm.log_odds_matrix("insert")
+    t = dict(zip(["MM", "MI", "MD", "IM", "II", "DM", "DD"], hmm.trans_matrix.T))
+    M, inf = hmm.M, -np.inf
+    vm = [[inf] * (M + 1) for _ in range(len(seq) + 1)]
+    vi = [[inf] * (M + 1) for _ in range(len(seq) + 1)]
+    vd = [[inf] * (M + 1) for _ in range(len(seq) + 1)]
+    best = inf
+    for i in range(1, len(seq) + 1):
+        k = hmm.alphabet.index(seq[i - 1])
+        for j in range(1, M + 1):
+            prev = [0.0]
+            if j > 1:
+                prev.append(vm[i - 1][j - 1] + t["MM"][j - 1])
+                prev.append(vi[i - 1][j - 1] + t["IM"][j - 1])
+                prev.append(vd[i - 1][j - 1] + t["DM"][j - 1])
+            vm[i][j] = max(prev) + match[j, k]
+            vi[i][j] = max(vm[i - 1][j] + t["MI"][j], vi[i - 1][j] + t["II"][j])
+            vi[i][j] += insert[j, k]
+            if j > 1:
+                vd[i][j] = max(
+                    vm[i][j - 1] + t["MD"][j - 1], vd[i][j - 1] + t["DD"][j - 1]
+                )
+            best = max(best, vm[i][j])
+    return best
+
+
+def path_score(hmm, seq: str, path) -> float:
+    match, insert = hmm.log_odds_matrix(), hmm.log_odds_matrix("insert")
+    trans = dict(zip(["MM", "MI", "MD", "IM", "II", "DM", "DD"], hmm.trans_matrix.T))
+    score = 0.0
+    for (s0, j0, _), (s1, j1, _) in zip(path[:-1], path[1:]):
+        node = j0 if s1 in "MD" else j1
+        assert j1 == j0 + (s1 != "I")
+        score += trans[s0 + s1][node]
+    for state, j, i in path:
+        k = hmm.alphabet.index(seq[i]) if i >= 0 else None
+        score += {"M": match, "I": insert}[state][j, k] if state != "D" else 0.0
+    return score
+
+
+def test_score_encode():
+    codes, lengths = encode_sequences(["ACgt", "", "AXT"], "ACGT")
+    assert lengths.tolist() == [4, 0, 3]
+    assert codes.tolist() == [[0, 1, 2, 3], [4, 4, 4, 4], [0, 4, 3, 4]]
+
+
+def test_score_ungapped():
+    hmm = read_model("PF02545.hmm.gz")
+    enolase = read_fasta("A0ALD9.fasta")
+    cons = consensus(hmm)
+
+    rng = np.random.default_rng(0)
+    seqs = [enolase, cons, cons[40:90], "", enolase[100:130] + cons[10:30]]
+    seqs += ["".join(rng.choice(list(hmm.alphabet), n)) for n in [5, 17, 60]]
+    scores = ungapped_scores(hmm, seqs)
+
+    assert scores[3] == -np.inf
+    assert scores[1] > 100 and scores[1] > scores[2] > scores[0]
+    for seq, score in zip(seqs, scores):
+        if seq:
+            assert score == pytest.approx(ungapped_reference(hmm, seq))
+
+
+def test_score_viterbi():
+    hmm = read_model("PF02545.hmm.gz")
+    enolase = read_fasta("A0ALD9.fasta")
+    cons = consensus(hmm)
+    gapped = cons[20:60] + cons[70:120]
+    inserted = cons[20:60] + "WWWW" + cons[60:120]
+
+    seqs = [enolase, cons, gapped, inserted, ""]
+    scores, paths = viterbi_scores(hmm, seqs, path=True)
+    assert np.array_equal(scores, viterbi_scores(hmm, seqs))
+
+    assert scores[4] == -np.inf and paths[4] == []
+    assert scores[1] > scores[2] > scores[0]
+    assert any(s == "D" for s, _, _ in paths[2])
+    assert any(s == "I" for s, _, _ in paths[3])
+
+    for seq, score, path in zip(seqs[:4], scores, paths):
+        assert path[0][0] == "M" and path[-1][0] == "M"
+        emitted = [i for s, _, i in path if s != "D"]
+        assert emitted == list(range(emitted[0], emitted[-1] + 1))
+        assert path_score(hmm, seq, path) == pytest.approx(score)
+
+
+def test_score_viterbi_reference():
+    hmm = read_model("three-profs.hmm.gz")
+    cons = consensus(hmm)
+    rng = np.random.default_rng(1)
+    seqs = [cons, cons[:10] + cons[14:], cons[:20] + "GGG" + cons[20:], "W"]
+    seqs += ["".join(rng.choice(list(hmm.alphabet), n)) for n in [8, 30, 55]]
+    for seq, score in zip(seqs, viterbi_scores(hmm, seqs)):
+        assert score == pytest.approx(viterbi_reference(hmm, seq))
+
+
+def test_score_background():
+    hmm = read_model("three-profs.hmm.gz")
+    seqs = [consensus(hmm), "MKV"]
+    uniform = [1 / len(hmm.alphabet)] * len(hmm.alphabet)
+    scores = viterbi_scores(hmm, seqs, uniform)
+    assert scores[0] > 0
+    assert not np.array_equal(scores, viterbi_scores(hmm, seqs))
+
+
+def test_score_lazy(write_db):
+    eager = read_model("PF02545.hmm.gz")
+    cons = consensus(eager)
+    seqs = [read_fasta("A0ALD9.fasta"), cons, cons[20:60] + "WWWW" + cons[60:120]]
+
+    with open_hmmer(write_db("PF02545.hmm.gz"), lazy=True) as hmmfile:
+        hmm = hmmfile.get("PF02545")
+        assert np.array_equal(ungapped_scores(hmm, seqs), ungapped_scores(eager, seqs))
+        hmm = hmmfile.get("PF02545")
+        assert np.array_equal(viterbi_scores(hmm, seqs), viterbi_scores(eager, seqs))
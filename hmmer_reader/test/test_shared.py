@@ -0,0 +1,88 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from hmmer_reader import SharedModelStore, open_hmmer
+
+
+def model_summary(store: SharedModelStore, i: int):
+    hmm = store[i]
+    return hmm.name, hmm.M, hmm.match(1), hmm.match_matrix.flags.owndata
+
+
+def test_shared_store(tmp_path: Path, write_db, no_parsing):
+    filepath = write_db()
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    store = SharedModelStore.create(filepath, tmp_path / "store")
+    assert store.path.parent == tmp_path / "store"
+    assert len(store) == 3
+
+    for hmm, view in zip(hmms, store):
+        assert view.metadata == hmm.metadata
+        assert view.alphabet == hmm.alphabet
+        assert view.M == hmm.M
+        assert view.compo == hmm.compo
+        assert view.trans(2) == hmm.trans(2)
+        assert np.array_equal(view.match_matrix, hmm.match_matrix)
+        assert np.array_equal(view.insert_matrix, hmm.insert_matrix)
+        assert not view.match_matrix.flags.writeable
+
+    first, second = store[1], store[1]
+    assert not first.match_matrix.flags.owndata
+    assert np.shares_memory(first.match_matrix, second.match_matrix)
+
+    assert store.get("PF12574").name == "120_Rick_ant"
+    assert store.get("PF12574.8").name == "120_Rick_ant"
+    assert store.get_by_name("12TM_1").acc == "PF09847.9"
+    assert store[-1].name == "12TM_1"
+    with pytest.raises(IndexError):
+        store[3]
+    with pytest.raises(KeyError):
+        store.get_by_name("unknown")
+
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.path == store.path
+    assert len(pickle.dumps(store)) < 200
+
+    no_parsing()
+    again = SharedModelStore.create(filepath, tmp_path / "store")
+    assert again[0].name == "1-cysPrx_C"
+
+    again.close()
+    copy.close()
+    store.close()
+
+
+def test_shared_store_workers(write_db):
+    filepath = write_db()
+    with open_hmmer(filepath) as hmmfile:
+        hmms = hmmfile.read_models()
+
+    with SharedModelStore.create(filepath) as store:
+        with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as executor:
+            results = list(executor.map(model_summary, [store] * 3, range(3)))
+
+    for hmm, (name, M, match, owndata) in zip(hmms, results):
+        assert name == hmm.name
+        assert M == hmm.M
+        assert match == hmm.match(1)
+        assert not owndata
+
+
+def test_shared_store_invalid(write_db):
+    filepath = write_db()
+    with pytest.raises(ValueError):
+        SharedModelStore(filepath)
+
+    store = SharedModelStore.create(filepath)
+    store.close()
+    content = store.path.read_bytes()
+    store.path.write_bytes(content[:-8])
+    with pytest.raises(ValueError):
+        SharedModelStore(store.path)
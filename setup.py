@@ -4,6 +4,13 @@ from setuptools import setup
 
 if __name__ == "__main__":
     setup(
-        entry_points={"console_scripts": ["hmmer-show = hmmer_reader:cli"]},
+        entry_points={
+            "console_scripts": [
+                "hmmer-show = hmmer_reader:cli",
+                "hmmer-bench = hmmer_reader:cli_bench",
+                "hmmer-dump = hmmer_reader:cli_dump",
+                "hmmer-export = hmmer_reader:cli_export",
+            ]
+        },
         cffi_modules="build_ext.py:ffibuilder",
     )